@@ -0,0 +1,81 @@
+"""Measures the throughput of the failure path under sustained error rates.
+
+Usage:
+    pip install -e ".[fast-json]"
+    python benchmarks/error_resolution.py [iterations]
+
+Every request of a run is answered with the same error response, e.g. a 429 storm, which
+throw_failed_responses raises as the error class mapped for it. Error mappings are either
+shared by every request or created for every request, the way generated request builders
+do.
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+from opentelemetry import trace
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+DEFAULT_ITERATIONS = 20000
+STATUS_CODES = (429, 503, 404)
+
+
+class ServiceError(APIError):
+    """The error returned by the service."""
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node):
+        return ServiceError()
+
+    def get_field_deserializers(self):
+        return {}
+
+
+SHARED_ERROR_MAP = {"429": ServiceError, "4XX": ServiceError, "5XX": ServiceError}
+
+
+async def _run(adapter, response, error_maps, iterations: int) -> None:
+    span = trace.get_tracer(__name__).start_span("error_resolution")
+    for _ in range(iterations):
+        try:
+            await adapter.throw_failed_responses(response, error_maps(), span, span)
+        except ServiceError:
+            pass
+    span.end()
+
+
+async def main(iterations: int) -> None:
+    adapter = HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(), parse_node_factory=JsonParseNodeFactory()
+    )
+    scenarios = {
+        "shared": lambda: SHARED_ERROR_MAP,
+        "per request": lambda: {
+            "429": ServiceError,
+            "4XX": ServiceError,
+            "5XX": ServiceError
+        },
+    }
+    print(f"{'status':>6} {'error map':<12} {'errors/s':>12} {'us/error':>10}")
+    for status_code in STATUS_CODES:
+        response = httpx.Response(
+            status_code, headers={"Content-Type": "application/json"}, content=b"{}"
+        )
+        for name, error_maps in scenarios.items():
+            await _run(adapter, response, error_maps, 100)
+            started = time.perf_counter()
+            await _run(adapter, response, error_maps, iterations)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{status_code:>6} {name:<12} {iterations / elapsed:>12.1f} "
+                f"{elapsed / iterations * 1e6:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS))
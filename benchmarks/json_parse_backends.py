@@ -0,0 +1,135 @@
+"""Compares the throughput of send_collection_async with each JSON parse node backend.
+
+Usage:
+    pip install -e ".[fast-json]"
+    python benchmarks/json_parse_backends.py [iterations]
+
+Every payload in benchmarks/payloads is served through a mock transport and deserialized end
+to end into a collection of users, once per iteration, with the default JSON parse node
+factory and with FastJsonParseNodeFactory for each installed backend.
+"""
+import asyncio
+import pathlib
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import (
+    Parsable,
+    ParseNode,
+    ParseNodeFactory,
+    SerializationWriter,
+)
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+
+from kiota_http.fast_json_parse_node_factory import FastJsonParseNodeFactory
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+PAYLOADS_DIR = pathlib.Path(__file__).parent / "payloads"
+DEFAULT_ITERATIONS = 50
+
+
+class User(Parsable):
+    """The subset of the Graph user properties found in the recorded payloads."""
+
+    def __init__(self) -> None:
+        self.id: Optional[str] = None
+        self.display_name: Optional[str] = None
+        self.mail: Optional[str] = None
+        self.job_title: Optional[str] = None
+        self.business_phones: Optional[list] = None
+        self.account_enabled: Optional[bool] = None
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node: ParseNode) -> "User":
+        return User()
+
+    def get_field_deserializers(self) -> Dict[str, Callable[[ParseNode], None]]:
+        return {
+            "id":
+            lambda n: setattr(self, "id", n.get_str_value()),
+            "displayName":
+            lambda n: setattr(self, "display_name", n.get_str_value()),
+            "mail":
+            lambda n: setattr(self, "mail", n.get_str_value()),
+            "jobTitle":
+            lambda n: setattr(self, "job_title", n.get_str_value()),
+            "businessPhones":
+            lambda n: setattr(self, "business_phones", n.get_collection_of_primitive_values(str)),
+            "accountEnabled":
+            lambda n: setattr(self, "account_enabled", n.get_bool_value()),
+        }
+
+    def serialize(self, writer: SerializationWriter) -> None:
+        raise NotImplementedError()
+
+
+class JsonOnlyParseNodeFactory(ParseNodeFactory):
+    """Default JSON factory, registered on its own to leave the global registry untouched."""
+
+    def __init__(self) -> None:
+        self._factory = JsonParseNodeFactory()
+
+    def get_valid_content_type(self) -> str:
+        return self._factory.get_valid_content_type()
+
+    def get_root_parse_node(self, content_type: str, content: bytes) -> ParseNode:
+        return self._factory.get_root_parse_node(content_type.split(";")[0], content)
+
+
+def _adapter(payload: bytes, parse_node_factory: ParseNodeFactory) -> HttpxRequestAdapter:
+
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, content=payload)
+
+    return HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        parse_node_factory=parse_node_factory,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def _request_info() -> RequestInformation:
+    request_info = RequestInformation(Method.GET, path_parameters={})
+    request_info.url = "https://graph.microsoft.com/v1.0/users"
+    return request_info
+
+
+async def _run(adapter: HttpxRequestAdapter, iterations: int) -> Any:
+    users = None
+    for _ in range(iterations):
+        users = await adapter.send_collection_async(_request_info(), User, {})
+    return users
+
+
+async def main(iterations: int) -> None:
+    factories: Dict[str, ParseNodeFactory] = {"default": JsonOnlyParseNodeFactory()}
+    for backend in ("orjson", "simdjson", "json"):
+        try:
+            factories[backend] = FastJsonParseNodeFactory(JsonOnlyParseNodeFactory(), backend)
+        except ImportError:
+            print(f"Skipping {backend}, it is not installed")
+
+    print(f"{'payload':<20} {'backend':<10} {'requests/s':>12} {'MB/s':>10}")
+    for path in sorted(PAYLOADS_DIR.glob("*.json")):
+        payload = path.read_bytes()
+        for name, factory in factories.items():
+            adapter = _adapter(payload, factory)
+            await _run(adapter, 1)
+            started = time.perf_counter()
+            users = await _run(adapter, iterations)
+            elapsed = time.perf_counter() - started
+            assert users and users[0].display_name
+            throughput = iterations / elapsed
+            print(
+                f"{path.name:<20} {name:<10} {throughput:>12.1f} "
+                f"{throughput * len(payload) / 1024 / 1024:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS))
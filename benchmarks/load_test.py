@@ -0,0 +1,243 @@
+"""Measures the latency percentiles, throughput and event loop lag of the adapter under load.
+
+Usage:
+    pip install -e .
+    python benchmarks/load_test.py [--levels 1,10,100,1000,5000] [--duration SECONDS]
+        [--latency MS] [--throttle-rate RATIO] [--retry-after SECONDS] [--max-connections N]
+
+For each concurrency level, as many coroutines send requests through the request adapter and the
+default middleware for the duration of the level. Requests go over TCP to a local HTTP/1.1 server
+running its own event loop in a separate thread, which waits for the injected latency before
+answering and throttles the given ratio of requests with a 429 response and a Retry-After header,
+so that they go through the retry handler.
+
+Each level reports the requests completed and failed, requests per second, the 50th, 95th and
+99th percentile and maximum latency of the requests, and the 99th percentile and maximum lag of
+the event loop, measured as the delay of a task waking up every LAG_INTERVAL seconds. Anything
+blocking the event loop, e.g. a blocking sleep in a handler or contention on a lock shared by
+concurrent requests, shows up as lag and as latency growing faster than the concurrency.
+"""
+import argparse
+import asyncio
+import math
+import random
+import threading
+import time
+from typing import List, Tuple
+
+import httpx
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.kiota_client_factory import DEFAULT_REQUEST_TIMEOUT, KiotaClientFactory
+
+DEFAULT_LEVELS = "1,10,100,1000,5000"
+DEFAULT_DURATION = 5.0
+DEFAULT_LATENCY_MS = 10.0
+DEFAULT_THROTTLE_RATE = 0.01
+# Retry-After values are whole seconds
+DEFAULT_RETRY_AFTER = 1
+# Matches the httpx default, above which requests wait for a pooled connection
+DEFAULT_MAX_CONNECTIONS = 100
+# Seconds between two wake ups of the task measuring the event loop lag
+LAG_INTERVAL = 0.01
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class LoadServer():
+    """A keep-alive HTTP/1.1 server answering every request with an empty response after a
+    latency, running its own event loop in a daemon thread."""
+
+    def __init__(self, latency: float, throttle_rate: float, retry_after: int) -> None:
+        """Creates an instance of LoadServer
+
+        Args:
+            latency (float): The seconds waited before answering a request.
+            throttle_rate (float): The ratio of requests answered with a 429 response.
+            retry_after (int): The Retry-After seconds of the 429 responses.
+        """
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.port = 0
+        self._random = random.Random(0)
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "LoadServer":
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def __exit__(self, *args) -> None:
+        asyncio.run_coroutine_threadsafe(self._close_connections(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    @property
+    def url(self) -> str:
+        """The base url of the server."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._serve, "127.0.0.1", 0, backlog=4096)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+        server.close()
+        self._loop.close()
+
+    async def _close_connections(self) -> None:
+        connections = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for connection in connections:
+            connection.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        await reader.readexactly(int(value))
+                await asyncio.sleep(self.latency)
+                if self._random.random() < self.throttle_rate:
+                    status = f"429 Too Many Requests\r\nRetry-After: {self.retry_after}"
+                else:
+                    status = "204 No Content"
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+        # Connections are cancelled when the server stops
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def _adapter(client: httpx.AsyncClient, url: str) -> HttpxRequestAdapter:
+    return HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=KiotaClientFactory.create_with_default_middleware(client),
+        base_url=url,
+    )
+
+
+def _request_info() -> RequestInformation:
+    request_info = RequestInformation(Method.GET, "{+baseurl}/users/{user%2Did}", {})
+    request_info.path_parameters["user%2Did"] = "48d31887"
+    return request_info
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    if not sorted_values:
+        return math.nan
+    return sorted_values[max(0, math.ceil(percentile * len(sorted_values)) - 1)]
+
+
+async def _send_until(
+    adapter: HttpxRequestAdapter, deadline: float, latencies: List[float], errors: List[Exception]
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            await adapter.send_no_response_content_async(_request_info(), {})
+        except Exception as error:  # pylint: disable=broad-except
+            errors.append(error)
+        else:
+            latencies.append(time.perf_counter() - started)
+
+
+async def _measure_lag(lags: List[float], stopped: asyncio.Event) -> None:
+    while not stopped.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - started - LAG_INTERVAL)
+
+
+async def _run_level(adapter: HttpxRequestAdapter, concurrency: int,
+                     duration: float) -> Tuple[List[float], List[Exception], List[float], float]:
+    latencies: List[float] = []
+    errors: List[Exception] = []
+    lags: List[float] = []
+    stopped = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_lag(lags, stopped))
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_send_until(adapter, deadline, latencies, errors) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+    stopped.set()
+    await lag_task
+    return sorted(latencies), errors, sorted(lags), elapsed
+
+
+def _print_level(
+    concurrency: int, latencies: List[float], errors: List[Exception], lags: List[float],
+    elapsed: float
+) -> None:
+    percentiles = [_percentile(latencies, p) * 1e3 for p in PERCENTILES]
+    maximum = latencies[-1] * 1e3 if latencies else math.nan
+    lag_max = lags[-1] * 1e3 if lags else math.nan
+    print(
+        f"{concurrency:>11} {len(latencies):>9} {len(errors):>7} "
+        f"{len(latencies) / elapsed:>11.0f} " +
+        " ".join(f"{value:>8.1f}" for value in (*percentiles, maximum)) +
+        f" {_percentile(lags, 0.99) * 1e3:>11.1f} {lag_max:>11.1f}"
+    )
+    if errors:
+        print(f"{'':>11} first error: {errors[0]!r}")
+
+
+async def main(
+    levels: List[int],
+    duration: float,
+    latency: float,
+    throttle_rate: float,
+    retry_after: int,
+    max_connections: int,
+) -> None:
+    client = httpx.AsyncClient(
+        timeout=httpx.Timeout(DEFAULT_REQUEST_TIMEOUT),
+        limits=httpx.Limits(max_connections=max_connections),
+    )
+    # The client is closed before the server, which would otherwise drop pooled connections
+    with LoadServer(latency, throttle_rate, retry_after) as load_server:
+        async with client:
+            adapter = _adapter(client, load_server.url)
+            await _run_level(adapter, 1, 0.2)
+            print(
+                f"{'concurrency':>11} {'requests':>9} {'errors':>7} {'requests/s':>11} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+                f"{'lag p99 ms':>11} {'lag max ms':>11}"
+            )
+            for concurrency in levels:
+                _print_level(concurrency, *await _run_level(adapter, concurrency, duration))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", default=DEFAULT_LEVELS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY_MS)
+    parser.add_argument("--throttle-rate", type=float, default=DEFAULT_THROTTLE_RATE)
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_RETRY_AFTER)
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS)
+    arguments = parser.parse_args()
+    asyncio.run(
+        main(
+            [int(level) for level in arguments.levels.split(",")],
+            arguments.duration,
+            arguments.latency / 1e3,
+            arguments.throttle_rate,
+            arguments.retry_after,
+            arguments.max_connections,
+        )
+    )
@@ -0,0 +1,70 @@
+"""Compares decoding query parameter names with the single-pass decoder of
+ParametersNameDecodingHandler and the replace-based decoder it superseded.
+
+Usage:
+    pip install -e .
+    python benchmarks/parameters_name_decoding.py [iterations]
+
+The queries have long $select, $expand and $filter parameters and an increasing number of
+encoded parameter names.
+"""
+import sys
+import timeit
+from typing import List
+
+from kiota_http.middleware import ParametersNameDecodingHandler
+
+DEFAULT_ITERATIONS = 2000
+CHARACTERS_TO_DECODE = [".", "-", "~", "$"]
+SELECT = "%2C".join(f"property{index}" for index in range(60))
+EXPAND = "%2C".join(f"navigation{index}%28%24select%3Did%29" for index in range(20))
+FILTER = "%20and%20".join(f"startswith%28field{index}%2C%27a%27%29" for index in range(30))
+
+
+def replace_decoder(original: str, characters_to_decode: List[str]) -> str:
+    """The decoder replacing every encoded parameter name across the whole query string, which
+    also decodes values containing an encoded parameter name, e.g. %24select in $expand."""
+    symbols_to_replace = [
+        (f"%{ord(x):X}", x) for x in characters_to_decode if f"%{ord(x):X}" in original
+    ]
+    encoded_parameter_values = [part.split('=')[0] for part in original.split('&') if '%' in part]
+    for parameter in encoded_parameter_values:
+        for symbol_to_replace in symbols_to_replace:
+            if symbol_to_replace[0] in parameter:
+                new_parameter = parameter.replace(symbol_to_replace[0], symbol_to_replace[1])
+                original = original.replace(parameter, new_parameter)
+    return original
+
+
+def _query(custom_parameters: int) -> str:
+    parameters = [
+        f"%24select={SELECT}",
+        f"%24expand={EXPAND}",
+        f"%24filter={FILTER}",
+        "%24top=100",
+        "%24count=true",
+    ]
+    parameters.extend(f"custom%2Dparameter%2E{index}=value" for index in range(custom_parameters))
+    return "&".join(parameters)
+
+
+def main(iterations: int) -> None:
+    handler = ParametersNameDecodingHandler()
+    print(f"{'query length':>12} {'replace us':>12} {'single-pass us':>16}")
+    for custom_parameters in (0, 10, 100):
+        query = _query(custom_parameters)
+        replace_seconds = timeit.timeit(
+            lambda: replace_decoder(query, CHARACTERS_TO_DECODE), number=iterations
+        )
+        single_pass_seconds = timeit.timeit(
+            lambda: handler.decode_uri_encoded_string(query, CHARACTERS_TO_DECODE),
+            number=iterations
+        )
+        print(
+            f"{len(query):>12} {replace_seconds / iterations * 1e6:>12.2f} "
+            f"{single_pass_seconds / iterations * 1e6:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS)
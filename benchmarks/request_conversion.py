@@ -0,0 +1,67 @@
+"""Measures the cost of converting request information into httpx requests.
+
+Usage:
+    pip install -e .
+    python benchmarks/request_conversion.py [iterations]
+
+Graph-style request information, with path and query parameters and no request options, is
+converted into an httpx request once per iteration. The URL expansion is measured on its own
+against expanding the URL template every time.
+"""
+import sys
+import time
+import timeit
+
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from opentelemetry import trace
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.uri_template import get_request_url
+
+DEFAULT_ITERATIONS = 20000
+URL_TEMPLATE = (
+    "{+baseurl}/users/{user%2Did}/messages{?%24top,%24skip,%24select,%24filter,%24orderby}"
+)
+
+
+def _request_info() -> RequestInformation:
+    request_info = RequestInformation(Method.GET, URL_TEMPLATE, {"user%2Did": "48d31887"})
+    request_info.path_parameters["baseurl"] = "https://graph.microsoft.com/v1.0"
+    request_info.query_parameters.update(
+        {
+            "%24top": 50,
+            "%24select": ["subject", "from", "receivedDateTime"],
+            "%24filter": "importance eq 'high'",
+        }
+    )
+    request_info.headers.try_add("Accept", "application/json")
+    return request_info
+
+
+def main(iterations: int) -> None:
+    adapter = HttpxRequestAdapter(AnonymousAuthenticationProvider())
+    span = trace.get_tracer(__name__).start_span("request_conversion")
+    request_infos = [_request_info() for _ in range(iterations)]
+
+    started = time.perf_counter()
+    for request_info in request_infos:
+        adapter.get_request_from_request_information(request_info, span, span)
+    elapsed = time.perf_counter() - started
+    span.end()
+
+    request_info = _request_info()
+    scenarios = {
+        "RequestInformation.url": lambda: request_info.url,
+        "get_request_url": lambda: get_request_url(request_info),
+    }
+    print(f"{'scenario':<40} {'us/request':>10}")
+    print(f"{'get_request_from_request_information':<40} {elapsed / iterations * 1e6:>10.2f}")
+    for name, operation in scenarios.items():
+        seconds = timeit.timeit(operation, number=iterations)
+        print(f"{name:<40} {seconds / iterations * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS)
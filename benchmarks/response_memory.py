@@ -0,0 +1,88 @@
+"""Measures the peak memory allocated while receiving response bodies of increasing size.
+
+Usage:
+    pip install -e .
+    python benchmarks/response_memory.py [size in MB ...]
+
+The payload is served from memory allocated before tracing starts, so the reported peak is
+what the request adapter and httpx allocate to receive it. A buffered download should peak
+close to the payload size, a streamed download close to the chunk size.
+"""
+import asyncio
+import os
+import sys
+import tracemalloc
+
+import httpx
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+DEFAULT_SIZES_MB = (1, 10, 100)
+MB = 1024 * 1024
+
+
+class PayloadStream(httpx.AsyncByteStream):
+    """Serves slices of a preallocated payload."""
+
+    def __init__(self, payload: bytes) -> None:
+        self._payload = memoryview(payload)
+
+    async def __aiter__(self):
+        for start in range(0, len(self._payload), 64 * 1024):
+            yield self._payload[start:start + 64 * 1024]
+
+
+def _adapter(payload: bytes) -> HttpxRequestAdapter:
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(len(payload))
+            },
+            stream=PayloadStream(payload),
+        )
+
+    return HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def _request_info() -> RequestInformation:
+    request_info = RequestInformation(Method.GET, path_parameters={})
+    request_info.url = "https://example.com/content"
+    return request_info
+
+
+async def _measure(operation) -> int:
+    tracemalloc.start()
+    try:
+        await operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def main(sizes_mb) -> None:
+    print(f"{'size':>8} {'scenario':<24} {'peak':>12} {'peak/size':>10}")
+    for size_mb in sizes_mb:
+        payload = os.urandom(size_mb * MB)
+        adapter = _adapter(payload)
+        scenarios = {
+            "send_primitive_async":
+            lambda: adapter.send_primitive_async(_request_info(), "bytes", {}),
+            "send_to_file_async":
+            lambda: adapter.send_to_file_async(_request_info(), os.devnull, {}),
+        }
+        for name, operation in scenarios.items():
+            peak = await _measure(operation)
+            print(f"{size_mb:>6}MB {name:<24} {peak / MB:>10.2f}MB {peak / len(payload):>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES_MB))
@@ -0,0 +1,95 @@
+"""Measures the spans exported and the CPU time per request for each span mode.
+
+Usage:
+    pip install -e .
+    python benchmarks/span_budget.py [iterations]
+
+Requests are sent through the default middleware to a mock transport with an SDK tracer
+provider exporting to memory, once with a span per handler and step, once with the spans
+collapsed into the request span, and once under a parent that was not sampled.
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.kiota_client_factory import KiotaClientFactory
+from kiota_http.observability_options import ObservabilityOptions
+
+DEFAULT_ITERATIONS = 2000
+# Context of a remote parent that was not sampled
+UNSAMPLED_CONTEXT = trace.set_span_in_context(
+    trace.NonRecordingSpan(
+        trace.SpanContext(
+            trace_id=0x4bf92f3577b34da6a3ce929d0e0e4736,
+            span_id=0x00f067aa0ba902b7,
+            is_remote=True,
+            trace_flags=trace.TraceFlags(trace.TraceFlags.DEFAULT),
+        )
+    )
+)
+
+
+def _adapter(collapse_spans: bool) -> HttpxRequestAdapter:
+    client = KiotaClientFactory.create_with_default_middleware(
+        httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+    )
+    return HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=client,
+        base_url="https://graph.microsoft.com/v1.0",
+        observability_options=ObservabilityOptions(collapse_spans=collapse_spans),
+    )
+
+
+def _request_info() -> RequestInformation:
+    request_info = RequestInformation(Method.GET, "{+baseurl}/users/{user%2Did}", {})
+    request_info.path_parameters["user%2Did"] = "48d31887"
+    return request_info
+
+
+async def _run(adapter: HttpxRequestAdapter, iterations: int) -> None:
+    for _ in range(iterations):
+        await adapter.send_no_response_content_async(_request_info(), {})
+
+
+async def main(iterations: int) -> None:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    modes = {
+        "span per handler": (False, None),
+        "collapsed": (True, None),
+        "unsampled parent": (False, UNSAMPLED_CONTEXT),
+    }
+    print(f"{'mode':<20} {'spans/request':>14} {'cpu us/request':>15}")
+    for name, (collapse_spans, context) in modes.items():
+        adapter = _adapter(collapse_spans)
+        token = trace.context_api.attach(context) if context else None
+        try:
+            await _run(adapter, 10)
+            exporter.clear()
+            started = time.process_time()
+            await _run(adapter, iterations)
+            elapsed = time.process_time() - started
+        finally:
+            if token:
+                trace.context_api.detach(token)
+        spans = len(exporter.get_finished_spans())
+        exporter.clear()
+        print(f"{name:<20} {spans / iterations:>14.1f} {elapsed / iterations * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS))
@@ -0,0 +1,217 @@
+"""Measures the throughput, CPU time and memory of the request adapter and each middleware.
+
+Usage:
+    pip install -e ".[fast-json]"
+    python benchmarks/suite.py [iterations] [--save-baseline] [--max-regression RATIO]
+
+Every scenario sends requests to an in-process mock transport, so that only the time spent in
+kiota-http and httpx is measured:
+- send_async and send_collection_async deserialize a user and a page of users recorded in
+  benchmarks/payloads,
+- each default middleware sends requests on its own, next to the transport alone,
+- the default pipeline sends requests through the request adapter and every middleware.
+
+Each scenario reports requests per second, the CPU time per request, and the peak memory
+allocated while sending a request, measured in a separate pass under tracemalloc. Results are
+compared with benchmarks/baseline.json, and the run fails when the CPU time per request of a
+scenario, relative to the one of the "transport only" scenario, grows by more than the maximum
+regression, so that the speed and load of the machine mostly cancel out. Baselines are not
+committed: record one with --save-baseline before making changes.
+"""
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import Parsable, ParseNode, SerializationWriter
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.kiota_client_factory import KiotaClientFactory
+from kiota_http.middleware import BaseMiddleware
+
+BENCHMARKS_DIR = pathlib.Path(__file__).parent
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+DEFAULT_ITERATIONS = 2000
+# Requests measured under tracemalloc, which slows them down too much to measure them all
+MEMORY_ITERATIONS = 200
+# Growth of the relative CPU time per request over the baseline failing the run, above the
+# noise of repeated runs
+DEFAULT_MAX_REGRESSION = 0.3
+# The scenario the CPU time of the other scenarios is relative to
+REFERENCE_SCENARIO = "transport only"
+BASE_URL = "https://graph.microsoft.com/v1.0"
+# Users deserialized per send_collection_async request
+PAGE_SIZE = 25
+
+Operation = Callable[[], Awaitable[Any]]
+
+
+class User(Parsable):
+    """The subset of the Graph user properties found in the recorded payloads."""
+
+    def __init__(self) -> None:
+        self.id: Optional[str] = None
+        self.display_name: Optional[str] = None
+        self.mail: Optional[str] = None
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node: ParseNode) -> "User":
+        return User()
+
+    def get_field_deserializers(self) -> Dict[str, Callable[[ParseNode], None]]:
+        return {
+            "id": lambda n: setattr(self, "id", n.get_str_value()),
+            "displayName": lambda n: setattr(self, "display_name", n.get_str_value()),
+            "mail": lambda n: setattr(self, "mail", n.get_str_value()),
+        }
+
+    def serialize(self, writer: SerializationWriter) -> None:
+        raise NotImplementedError()
+
+
+def _json_transport(payload: bytes) -> httpx.MockTransport:
+    return httpx.MockTransport(
+        lambda request: httpx.
+        Response(200, headers={"Content-Type": "application/json"}, content=payload)
+    )
+
+
+def _adapter(transport: httpx.AsyncBaseTransport, default_middleware: bool) -> HttpxRequestAdapter:
+    client = httpx.AsyncClient(transport=transport)
+    if default_middleware:
+        client = KiotaClientFactory.create_with_default_middleware(client)
+    return HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        parse_node_factory=JsonParseNodeFactory(),
+        http_client=client,
+        base_url=BASE_URL,
+    )
+
+
+def _request_info(url_template: str) -> RequestInformation:
+    request_info = RequestInformation(Method.GET, url_template, {"user%2Did": "48d31887"})
+    request_info.query_parameters["%24select"] = ["id", "displayName", "mail"]
+    request_info.headers.try_add("Accept", "application/json")
+    return request_info
+
+
+def _request() -> httpx.Request:
+    request = httpx.Request("GET", f"{BASE_URL}/users/48d31887?%24select=id,displayName")
+    request.options = {}  # type: ignore
+    return request
+
+
+def _get_scenarios() -> Dict[str, Operation]:
+    recorded_users = json.loads((BENCHMARKS_DIR / "payloads" / "users.json").read_bytes())
+    users = json.dumps(recorded_users[:PAGE_SIZE]).encode()
+    user = json.dumps(recorded_users[0]).encode()
+    user_template = "{+baseurl}/users/{user%2Did}{?%24select}"
+    users_template = "{+baseurl}/users{?%24select}"
+    user_adapter = _adapter(_json_transport(user), False)
+    users_adapter = _adapter(_json_transport(users), False)
+    pipeline_adapter = _adapter(httpx.MockTransport(lambda request: httpx.Response(204)), True)
+    empty_transport = httpx.MockTransport(lambda request: httpx.Response(204))
+
+    scenarios: Dict[str, Operation] = {
+        "send_async":
+        lambda: user_adapter.send_async(_request_info(user_template), User, {}),
+        "send_collection_async":
+        lambda: users_adapter.send_collection_async(_request_info(users_template), User, {}),
+        "transport only":
+        lambda: empty_transport.handle_async_request(_request()),
+    }
+    for middleware in KiotaClientFactory.get_default_middleware(None):
+        scenarios[type(middleware).__name__] = _middleware_operation(middleware, empty_transport)
+    scenarios["default pipeline"] = lambda: pipeline_adapter.send_no_response_content_async(
+        _request_info(user_template), {}
+    )
+    return scenarios
+
+
+def _middleware_operation(middleware: BaseMiddleware, transport: httpx.MockTransport) -> Operation:
+    return lambda: middleware.send(_request(), transport)
+
+
+async def _measure(operation: Operation, iterations: int) -> Dict[str, float]:
+    for _ in range(10):
+        await operation()
+    started_wall, started_cpu = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        await operation()
+    wall, cpu = time.perf_counter() - started_wall, time.process_time() - started_cpu
+
+    peak = 0
+    tracemalloc.start()
+    for _ in range(min(iterations, MEMORY_ITERATIONS)):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await operation()
+        peak += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return {
+        "requests_per_second": iterations / wall,
+        "cpu_us_per_request": cpu / iterations * 1e6,
+        "peak_kib_per_request": peak / min(iterations, MEMORY_ITERATIONS) / 1024,
+    }
+
+
+def _compare(results: Dict[str, Dict[str, float]], max_regression: float) -> bool:
+    if not BASELINE_PATH.exists():
+        print(f"\nNo baseline at {BASELINE_PATH}, record one with --save-baseline")
+        return True
+    baseline = json.loads(BASELINE_PATH.read_text())
+    reference_cpu = results[REFERENCE_SCENARIO]["cpu_us_per_request"]
+    baseline_reference_cpu = baseline[REFERENCE_SCENARIO]["cpu_us_per_request"]
+    passed = True
+    print(f"\n{'scenario':<32} {'relative cpu':>13} {'baseline':>9} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline or name == REFERENCE_SCENARIO:
+            continue
+        relative_cpu = result["cpu_us_per_request"] / reference_cpu
+        baseline_relative_cpu = baseline[name]["cpu_us_per_request"] / baseline_reference_cpu
+        change = relative_cpu / baseline_relative_cpu - 1
+        regressed = change > max_regression
+        passed = passed and not regressed
+        print(
+            f"{name:<32} {relative_cpu:>13.2f} {baseline_relative_cpu:>9.2f} {change:>+8.1%}"
+            f"{'  REGRESSED' if regressed else ''}"
+        )
+    return passed
+
+
+async def main(iterations: int, save_baseline: bool, max_regression: float) -> bool:
+    results = {}
+    print(f"{'scenario':<32} {'requests/s':>12} {'cpu us':>10} {'peak KiB':>10}")
+    for name, operation in _get_scenarios().items():
+        result = await _measure(operation, iterations)
+        results[name] = result
+        print(
+            f"{name:<32} {result['requests_per_second']:>12.0f} "
+            f"{result['cpu_us_per_request']:>10.1f} {result['peak_kib_per_request']:>10.1f}"
+        )
+    if save_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return True
+    return _compare(results, max_regression)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("iterations", nargs="?", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION)
+    arguments = parser.parse_args()
+    if not asyncio.run(
+        main(arguments.iterations, arguments.save_baseline, arguments.max_regression)
+    ):
+        sys.exit(1)
@@ -0,0 +1,83 @@
+"""Compares expanding Graph-style URI templates with StdUriTemplate and with the compiled
+templates cached by expand_uri_template.
+
+Usage:
+    pip install -e .
+    python benchmarks/uri_template_expansion.py [expansions]
+
+The expansions are spread evenly over the templates, each expanded with the path and query
+parameters a request builder would set.
+"""
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from stduritemplate import StdUriTemplate
+
+from kiota_http.uri_template import expand_uri_template
+
+DEFAULT_EXPANSIONS = 100000
+BASE_URL = "https://graph.microsoft.com/v1.0"
+
+CASES: List[Tuple[str, Dict[str, Any]]] = [
+    (
+        "{+baseurl}/users{?%24top,%24skip,%24search,%24filter,%24count,%24orderby,%24select,"
+        "%24expand}",
+        {
+            "baseurl": BASE_URL,
+            "%24top": 100,
+            "%24select": ["id", "displayName", "mail"],
+            "%24filter": "accountEnabled eq true",
+        },
+    ),
+    (
+        "{+baseurl}/users/{user%2Did}/messages/{message%2Did}{?%24select,%24expand}",
+        {
+            "baseurl": BASE_URL,
+            "user%2Did": "48d31887-5fad-4d73-a9f5-3c356e68a038",
+            "message%2Did": "AAMkAGVmMDEzMTM4LTZmYWUtNDdkNC1hMDZiLTU1OGY5OTZhYmY4OABGAAAAAAAi",
+        },
+    ),
+    (
+        "{+baseurl}/groups/{group%2Did}/members{?%24count,%24orderby,%24search}",
+        {
+            "baseurl": BASE_URL,
+            "group%2Did": "02bd9fd6-8f93-4758-87c3-1fb73740a315",
+            "%24count": True,
+            "%24search": "\"displayName:Megan\"",
+        },
+    ),
+    (
+        "{+baseurl}/drives/{drive%2Did}/items/{driveItem%2Did}/content{?format}",
+        {
+            "baseurl": BASE_URL,
+            "drive%2Did": "b!-RIj2DuyvEyV1T4NlOaMHk8XkS_I8MdFlUCq1BlcjgmhRfAj3-Z8RY2VpuvV_tpd",
+            "driveItem%2Did": "01BYE5RZ6QN3ZWBTUFOFD3GSPGOHDJD36K",
+        },
+    ),
+]
+
+
+def _measure(expand: Callable[[str, Dict[str, Any]], str], expansions: int) -> float:
+    started = time.perf_counter()
+    for _ in range(expansions // len(CASES)):
+        for template, values in CASES:
+            expand(template, values)
+    return time.perf_counter() - started
+
+
+def main(expansions: int) -> None:
+    for template, values in CASES:
+        assert expand_uri_template(template, values) == StdUriTemplate.expand(template, values)
+
+    print(f"{'expander':<20} {'expansions/s':>14} {'us/expansion':>14}")
+    for name, expand in (
+        ("StdUriTemplate", StdUriTemplate.expand),
+        ("expand_uri_template", expand_uri_template),
+    ):
+        elapsed = _measure(expand, expansions)
+        print(f"{name:<20} {expansions / elapsed:>14.1f} {elapsed / expansions * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EXPANSIONS)
@@ -0,0 +1,56 @@
+"""Compares rewriting urls with UrlRewriteEngine and with sequential string replacements.
+
+Usage:
+    pip install -e .
+    python benchmarks/url_rewrite.py [iterations]
+
+Each rule set holds tenant segment rules, one per tenant, and the urls are rewritten with
+the sequential replacement loop UrlReplaceHandler used before and with the compiled engine.
+"""
+import sys
+import timeit
+from typing import Dict
+
+from kiota_http.url_rewrite_engine import UrlRewriteEngine
+
+DEFAULT_ITERATIONS = 20000
+URLS = [
+    "https://graph.microsoft.com/v1.0/tenants/tenant-0017/users/48d31887/messages?$top=10",
+    "https://graph.microsoft.com/v1.0/tenants/tenant-0003/groups?$select=id,displayName",
+    "https://graph.microsoft.com/v1.0/me/drive/root/children",
+]
+
+
+def replace_loop(url: str, replacement_pairs: Dict[str, str]) -> str:
+    """The sequential replacements UrlReplaceHandler used before the compiled engine."""
+    for key, value in replacement_pairs.items():
+        url = url.replace(key, value, 1)
+    return url
+
+
+def main(iterations: int) -> None:
+    print(f"{'rules':>6} {'loop us':>10} {'engine us':>10}")
+    for rules in (1, 10, 50, 200):
+        replacement_pairs = {
+            f"/tenants/tenant-{index:04d}/": f"/tenants/{index:04d}.onmicrosoft.com/"
+            for index in range(rules)
+        }
+        engine = UrlRewriteEngine(replacement_pairs)
+        for url in URLS:
+            assert engine.rewrite(url) == replace_loop(url, replacement_pairs)
+        loop_seconds = timeit.timeit(
+            lambda: [replace_loop(url, replacement_pairs) for url in URLS],
+            number=iterations,
+        )
+        engine_seconds = timeit.timeit(
+            lambda: [engine.rewrite(url) for url in URLS],
+            number=iterations,
+        )
+        count = iterations * len(URLS)
+        print(
+            f"{rules:>6} {loop_seconds / count * 1e6:>10.2f} {engine_seconds / count * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS)
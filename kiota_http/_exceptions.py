@@ -1,4 +1,8 @@
 """Exceptions raised in Kiota HTTP."""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from kiota_abstractions.api_error import APIError
 
 
 class KiotaHTTPXError(Exception):
@@ -23,3 +27,38 @@ class ResponseError(KiotaHTTPXError):
 
 class RedirectError(KiotaHTTPXError):
     """Raised when a redirect has errors."""
+
+
+class BulkRequestError(KiotaHTTPXError):
+    """Raised when requests of a bulk operation failed.
+
+    Args:
+        message (str): The error message.
+        exceptions (Dict[int, Exception]): The errors raised, by index of the failed request.
+        results (Optional[List[Any]]): The results in the order of the requests, None for the
+        failed requests. Not set when the results were already returned as they completed.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        exceptions: Dict[int, Exception],
+        results: Optional[List[Any]] = None
+    ) -> None:
+        super().__init__(message)
+        self.exceptions = exceptions
+        self.results = results
+
+
+@dataclass
+class UnparsedAPIError(APIError):
+    """Raised for error responses whose body was not deserialized into the error class
+    registered for the status code, because it exceeds the maximum error body size or its
+    content type is not deserialized, e.g. an HTML page returned by a proxy.
+
+    Args:
+        response_body (Optional[bytes]): The error body, truncated to the maximum error
+        body size.
+    """
+
+    response_body: Optional[bytes] = None
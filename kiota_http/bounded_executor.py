@@ -0,0 +1,105 @@
+"""Runs an operation over many items with a bounded number of operations in flight."""
+import asyncio
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Tuple,
+    TypeVar,
+)
+
+from ._exceptions import BulkRequestError
+
+ItemType = TypeVar("ItemType")
+
+
+async def execute_as_completed(
+    items: Iterable[ItemType],
+    operation: Callable[[ItemType], Awaitable[Any]],
+    max_concurrency: int,
+) -> AsyncGenerator[Tuple[int, Any], None]:
+    """Runs the operation over the items with at most max_concurrency operations in flight
+    and yields the index of each item with the result, or the exception raised, as the
+    operations complete.
+
+    Workers pull from a shared iterator so that items are consumed lazily, and completed
+    results go through a bounded queue so that a slow consumer holds back new operations.
+    Closing the iterator cancels the operations in flight.
+
+    Args:
+        items (Iterable[ItemType]): The items to run the operation over.
+        operation (Callable[[ItemType], Awaitable[Any]]): The operation to run.
+        max_concurrency (int): The maximum number of operations in flight.
+
+    Yields:
+        Tuple[int, Any]: The index of the item and the result or raised exception.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency should be greater than zero")
+    pending = enumerate(items)
+    completed: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency)
+
+    async def worker() -> None:
+        try:
+            for index, item in pending:
+                try:
+                    result = await operation(item)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    result = error
+                await completed.put((index, result))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # The items iterable itself failed, stop the whole operation
+            await completed.put(error)
+            return
+        await completed.put(None)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            entry = await completed.get()
+            if entry is None:
+                running -= 1
+                continue
+            if isinstance(entry, Exception):
+                raise entry
+            yield entry
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def collect_in_order(
+    completed: AsyncIterator[Tuple[int, Any]], return_exceptions: bool = False
+) -> List[Any]:
+    """Collects the results yielded by execute_as_completed in the order of the items.
+
+    Args:
+        completed (AsyncIterator[Tuple[int, Any]]): The indexed results as they completed.
+        return_exceptions (bool): Whether exceptions are returned in place of the results
+        instead of being raised.
+
+    Returns:
+        List[Any]: The results in the order of the items.
+
+    Raises:
+        BulkRequestError: When operations failed and return_exceptions is False.
+    """
+    results: List[Any] = []
+    exceptions: Dict[int, Exception] = {}
+    async for index, result in completed:
+        if index >= len(results):
+            results.extend([None] * (index + 1 - len(results)))
+        if isinstance(result, Exception) and not return_exceptions:
+            exceptions[index] = result
+            continue
+        results[index] = result
+    if exceptions:
+        raise BulkRequestError(f"{len(exceptions)} requests failed", exceptions, results)
+    return results
@@ -0,0 +1,197 @@
+"""Authentication provider decorator that caches the headers produced by another provider."""
+import asyncio
+import base64
+import json
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib import parse
+
+from kiota_abstractions.authentication import AuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+CacheKey = Tuple[str, str]
+
+
+class _CachedAuthentication():
+    """The authentication headers acquired for an origin and their lifetime."""
+
+    def __init__(self, headers: Dict[str, Set[str]], expires_at: float, refresh_at: float) -> None:
+        self.headers = headers
+        self.expires_at = expires_at
+        self.refresh_at = refresh_at
+
+
+class CachingAuthenticationProvider(AuthenticationProvider):
+    """Caches the headers an authentication provider adds to a request so that the token
+    endpoint is not hit for every request.
+
+    Entries are keyed by the request origin (which determines the token scope) and the
+    claims passed in the additional authentication context. Concurrent requests missing the
+    cache share a single call to the wrapped provider, and entries that are about to expire
+    are refreshed in the background while the current token keeps being served.
+    """
+    AUTHORIZATION_HEADER = "Authorization"
+    CLAIMS_KEY = "claims"
+
+    # Default number of seconds before expiry at which a token is refreshed in the background
+    DEFAULT_REFRESH_BEFORE_EXPIRY: float = 300.0
+
+    # Default lifetime in seconds of headers whose expiry cannot be read from a JWT
+    DEFAULT_TOKEN_LIFETIME: float = 600.0
+
+    def __init__(
+        self,
+        authentication_provider: AuthenticationProvider,
+        refresh_before_expiry: float = DEFAULT_REFRESH_BEFORE_EXPIRY,
+        default_token_lifetime: float = DEFAULT_TOKEN_LIFETIME,
+    ) -> None:
+        """Creates an instance of CachingAuthenticationProvider
+
+        Args:
+            authentication_provider (AuthenticationProvider): The provider to acquire
+            authentication headers from.
+            refresh_before_expiry (float, optional): Seconds before expiry at which the cached
+            headers are refreshed in the background. Defaults to 300.
+            default_token_lifetime (float, optional): Lifetime in seconds used when the token
+            expiry cannot be read from the token itself. Defaults to 600.
+        """
+        if not authentication_provider:
+            raise TypeError("Authentication provider cannot be null")
+        if refresh_before_expiry < 0:
+            raise ValueError("refresh_before_expiry should not be negative")
+        if default_token_lifetime <= 0:
+            raise ValueError("default_token_lifetime should be greater than zero")
+        self._authentication_provider = authentication_provider
+        self._refresh_before_expiry = refresh_before_expiry
+        self._default_token_lifetime = default_token_lifetime
+        self._cache: Dict[CacheKey, _CachedAuthentication] = {}
+        self._in_flight: Dict[CacheKey, asyncio.Future] = {}
+        self._uncacheable_origins: Set[str] = set()
+
+    async def authenticate_request(
+        self,
+        request: RequestInformation,
+        additional_authentication_context: Dict[str, Any] = {}
+    ) -> None:
+        """Authenticates the request with cached headers, acquiring them from the wrapped
+        provider when they are missing or expired.
+
+        Args:
+            request (RequestInformation): The request to authenticate
+            additional_authentication_context (dict): Additional context passed to the
+            wrapped provider. The claims entry is part of the cache key.
+        """
+        if not request:
+            raise ValueError("Request cannot be null")
+        claims = (additional_authentication_context or {}).get(self.CLAIMS_KEY, "")
+        if request.headers.contains(self.AUTHORIZATION_HEADER):
+            if not claims:
+                return
+            request.headers.remove(self.AUTHORIZATION_HEADER)
+
+        origin = self._get_origin(request.url)
+        if origin in self._uncacheable_origins:
+            await self._authentication_provider.authenticate_request(
+                request, additional_authentication_context
+            )
+            return
+
+        key = (origin, claims)
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry is None or now >= entry.expires_at:
+            entry = await self._acquire(key, request.url, additional_authentication_context)
+        elif now >= entry.refresh_at and key not in self._in_flight:
+            self._start_acquisition(key, request.url, additional_authentication_context)
+
+        if entry is None:
+            await self._authentication_provider.authenticate_request(
+                request, additional_authentication_context
+            )
+            return
+        self._apply_headers(request, entry.headers)
+
+    def clear(self) -> None:
+        """Removes all cached authentication headers."""
+        self._cache.clear()
+        self._uncacheable_origins.clear()
+
+    async def _acquire(
+        self, key: CacheKey, url: str, additional_authentication_context: Dict[str, Any]
+    ) -> Optional[_CachedAuthentication]:
+        """Waits for the acquisition in flight for the key, starting one if there is none."""
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._start_acquisition(key, url, additional_authentication_context)
+        # Shield the shared acquisition so that a cancelled waiter does not cancel it for the
+        # other requests waiting on the same key.
+        return await asyncio.shield(future)
+
+    def _start_acquisition(
+        self, key: CacheKey, url: str, additional_authentication_context: Dict[str, Any]
+    ) -> asyncio.Future:
+        task = asyncio.ensure_future(
+            self._acquire_from_provider(key, url, additional_authentication_context)
+        )
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._in_flight.get(key) is t and self._in_flight.pop(key))
+        # Background refreshes are never awaited, retrieve their result so that failures
+        # do not surface as unretrieved task exceptions. The stale entry keeps being served
+        # until it expires and a foreground acquisition raises the error.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _acquire_from_provider(
+        self, key: CacheKey, url: str, additional_authentication_context: Dict[str, Any]
+    ) -> Optional[_CachedAuthentication]:
+        origin, claims = key
+        scratch_request = RequestInformation(Method.GET, path_parameters={})
+        scratch_request.url = url
+        await self._authentication_provider.authenticate_request(
+            scratch_request, additional_authentication_context
+        )
+        headers = {name: set(values) for name, values in scratch_request.headers.get_all().items()}
+        if not headers:
+            # The provider authenticates requests by other means than headers (e.g. query
+            # parameters), requests to this origin are delegated to it directly.
+            self._uncacheable_origins.add(origin)
+            return None
+
+        now = time.monotonic()
+        lifetime = self._get_token_lifetime(headers)
+        entry = _CachedAuthentication(
+            headers, now + lifetime, now + max(0.0, lifetime - self._refresh_before_expiry)
+        )
+        self._cache[key] = entry
+        if claims:
+            # A token satisfying a claims challenge supersedes the one the challenge was
+            # raised for.
+            self._cache[(origin, "")] = entry
+        return entry
+
+    def _get_token_lifetime(self, headers: Dict[str, Set[str]]) -> float:
+        """Reads the remaining lifetime of the bearer token from its exp claim, falling back
+        to the default lifetime for opaque tokens."""
+        for value in headers.get(self.AUTHORIZATION_HEADER.lower(), set()):
+            scheme, _, token = value.partition(" ")
+            if scheme.casefold() != "bearer" or token.count(".") != 2:
+                continue
+            try:
+                payload = token.split(".")[1]
+                payload += "=" * (-len(payload) % 4)
+                expires_on = float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+            except (ValueError, TypeError, KeyError):
+                continue
+            return max(0.0, expires_on - time.time())
+        return self._default_token_lifetime
+
+    def _apply_headers(self, request: RequestInformation, headers: Dict[str, Set[str]]) -> None:
+        for name, values in headers.items():
+            request.headers.remove(name)
+            request.headers.add(name, list(values))
+
+    @staticmethod
+    def _get_origin(url: str) -> str:
+        parsed_url = parse.urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
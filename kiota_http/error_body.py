@@ -0,0 +1,61 @@
+"""Reads the body of error responses up to a maximum size."""
+from typing import Optional, Tuple
+
+import httpx
+
+# Content types of error bodies raised without being deserialized, e.g. proxy error pages
+UNPARSED_ERROR_CONTENT_TYPES = frozenset(("text/html", "application/xhtml+xml"))
+
+
+async def read_error_body(response: httpx.Response, max_size: int) -> Tuple[bytes, bool]:
+    """Reads the body of an error response, at most max_size bytes of it.
+
+    Bodies already read are returned as they are when they fit. Streamed bodies whose
+    Content-Length fits are read at once, the others are read until max_size bytes are
+    received and the response is closed, so that large error pages are never held in memory.
+
+    Args:
+        response (httpx.Response): The error response.
+        max_size (int): The maximum number of bytes of the body to keep.
+
+    Returns:
+        Tuple[bytes, bool]: The body, truncated to max_size bytes, and whether it is complete.
+    """
+    try:
+        content = response.content
+    except httpx.ResponseNotRead:
+        pass
+    else:
+        if len(content) <= max_size:
+            return content, True
+        return content[:max_size], False
+
+    content_length = _get_content_length(response)
+    if content_length is not None and content_length <= max_size:
+        return await response.aread(), True
+    body = bytearray()
+    try:
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > max_size:
+                return bytes(body[:max_size]), False
+    finally:
+        await response.aclose()
+    return bytes(body), True
+
+
+def is_unparsed_error_content_type(content_type: Optional[str]) -> bool:
+    """Checks whether error bodies of the content type are raised without being deserialized.
+
+    Args:
+        content_type (Optional[str]): The media type of the response, in lower case.
+
+    Returns:
+        bool: True for content types no error class can be deserialized from.
+    """
+    return content_type in UNPARSED_ERROR_CONTENT_TYPES
+
+
+def _get_content_length(response: httpx.Response) -> Optional[int]:
+    content_length = response.headers.get("Content-Length", "")
+    return int(content_length) if content_length.isdigit() else None
@@ -0,0 +1,112 @@
+"""Resolves the error class registered in an error mapping for a response status code."""
+from typing import Dict, List, Optional, Tuple
+
+from kiota_abstractions.serialization import ParsableFactory
+
+ErrorMap = Dict[str, ParsableFactory]
+
+# Maximum number of error mappings tracked by get_error_class
+ERROR_CLASS_TABLE_CACHE_SIZE = 256
+
+
+def resolve_error_class(error_map: ErrorMap,
+                        status_code: int) -> Tuple[Optional[ParsableFactory], bool]:
+    """Resolves the error class registered for the status code, trying the status code itself,
+    then its 4XX or 5XX class and finally XXX.
+
+    Args:
+        error_map (ErrorMap): The error mapping.
+        status_code (int): The response status code.
+
+    Returns:
+        Tuple[Optional[ParsableFactory], bool]: The error class, if any, and whether the status
+        code is mapped at all. Status codes outside of 4XX and 5XX are considered mapped.
+    """
+    status_code_str = str(status_code)
+    if status_code_str in error_map:
+        return error_map[status_code_str], True
+    if 400 <= status_code < 500 and "4XX" in error_map:
+        return error_map["4XX"], True
+    if 500 <= status_code < 600 and "5XX" in error_map:
+        return error_map["5XX"], True
+    if "XXX" in error_map:
+        return error_map["XXX"], True
+    return None, not 400 <= status_code < 600
+
+
+class ErrorClassTable():
+    """The error classes of an error mapping resolved ahead of time for every status code
+    below 600, so that resolving the error class of a response is a single list lookup."""
+    SIZE = 600
+
+    def __init__(self, error_map: ErrorMap) -> None:
+        """Creates an instance of ErrorClassTable
+
+        Args:
+            error_map (ErrorMap): The error mapping to resolve.
+        """
+        self._error_map = error_map
+        self._entries: List[Tuple[Optional[ParsableFactory], bool]] = [
+            resolve_error_class(error_map, status_code) for status_code in range(self.SIZE)
+        ]
+
+    def resolve(self, status_code: int) -> Tuple[Optional[ParsableFactory], bool]:
+        """Resolves the error class registered for the status code.
+
+        Args:
+            status_code (int): The response status code.
+
+        Returns:
+            Tuple[Optional[ParsableFactory], bool]: The error class, if any, and whether the
+            status code is mapped at all.
+        """
+        if 0 <= status_code < self.SIZE:
+            return self._entries[status_code]
+        return resolve_error_class(self._error_map, status_code)
+
+
+# The error mappings used by id, with a copy of their entries when they were resolved and
+# their table once they are used again
+_tables: Dict[int, Tuple[ErrorMap, ErrorMap, Optional[ErrorClassTable]]] = {}
+
+
+def get_error_class(error_map: ErrorMap,
+                    status_code: int) -> Tuple[Optional[ParsableFactory], bool]:
+    """Resolves the error class registered for the status code, through the error class table
+    of the error mapping once the same error mapping is used again.
+
+    Tables are cached by identity of the error mapping and kept alive by the cache so that
+    the id is not reused. The entries of the error mapping are compared with a copy taken
+    when its table was built, and the table is built again when they were modified. Error
+    mappings created for every request are resolved directly, as building or hashing them
+    would cost more than the lookups saved.
+
+    Args:
+        error_map (ErrorMap): The error mapping.
+        status_code (int): The response status code.
+
+    Returns:
+        Tuple[Optional[ParsableFactory], bool]: The error class, if any, and whether the status
+        code is mapped at all.
+    """
+    key = id(error_map)
+    entry = _tables.get(key)
+    if entry is not None and entry[0] is error_map:
+        _, entries, table = entry
+        if table is None or entries != error_map:
+            table = ErrorClassTable(error_map)
+            _tables[key] = (error_map, dict(error_map), table)
+        return table.resolve(status_code)
+    if len(_tables) >= ERROR_CLASS_TABLE_CACHE_SIZE:
+        _evict_unused_error_maps()
+    _tables[key] = (error_map, dict(error_map), None)
+    return resolve_error_class(error_map, status_code)
+
+
+def _evict_unused_error_maps() -> None:
+    """Forgets the error mappings used only once, and every error mapping when the tables
+    alone fill half of the cache."""
+    tables = {key: entry for key, entry in _tables.items() if entry[2] is not None}
+    _tables.clear()
+    if len(tables) < ERROR_CLASS_TABLE_CACHE_SIZE // 2:
+        _tables.update(tables)
@@ -0,0 +1,148 @@
+"""Parse node factory decoding JSON payloads with a fast JSON library when one is installed."""
+import importlib
+import json
+import re
+from typing import Any, Callable, Optional, Tuple
+
+from kiota_abstractions.serialization import (
+    ParseNode,
+    ParseNodeFactory,
+    ParseNodeFactoryRegistry,
+    ParseNodeProxyFactory,
+)
+
+try:
+    from kiota_serialization_json.json_parse_node import JsonParseNode
+except ImportError:  # pragma: no cover
+    JsonParseNode = None
+
+JSON_CONTENT_TYPE = "application/json"
+VENDOR_PREFIX_REGEX = re.compile(r"[^/]+\+")
+
+# Backends tried in order when none is requested
+AUTO_BACKENDS = ("orjson", "simdjson")
+
+
+def _get_loads(backend: str) -> Optional[Callable[[Any], Any]]:
+    """Gets the function decoding JSON bytes of the backend, None when it is not installed."""
+    if backend == "json":
+        return json.loads
+    try:
+        module = importlib.import_module(backend)
+    except ImportError:
+        return None
+    return module.loads
+
+
+class _DecodedJsonParseNodeFactory(ParseNodeFactory):
+    """Creates JSON parse nodes from payloads decoded by the given function."""
+
+    def __init__(self, loads: Callable[[Any], Any]) -> None:
+        self._loads = loads
+
+    def get_valid_content_type(self) -> str:
+        return JSON_CONTENT_TYPE
+
+    def get_root_parse_node(self, content_type: str, content: bytes) -> ParseNode:
+        return JsonParseNode(self._loads(content))
+
+
+class FastJsonParseNodeFactory(ParseNodeFactory):
+    """Creates JSON parse nodes from payloads decoded by orjson or simdjson, which read the
+    response bytes directly instead of decoding them to a str first.
+
+    Other content types, and JSON when no fast backend is installed, are handled by the
+    fallback factory. The proxies wrapping the fallback JSON factory, e.g. the ones installed
+    by enable_backing_store, wrap the fast parse nodes too.
+    """
+
+    def __init__(self, fallback_factory: ParseNodeFactory, backend: Optional[str] = None) -> None:
+        """Creates an instance of FastJsonParseNodeFactory
+
+        Args:
+            fallback_factory (ParseNodeFactory): The factory for the other content types.
+            backend (Optional[str], optional): The module decoding JSON: orjson, simdjson or
+            json. Defaults to the first of orjson and simdjson installed.
+        """
+        if not fallback_factory:
+            raise TypeError("Fallback factory cannot be null")
+        self._fallback_factory = fallback_factory
+        self._loads: Optional[Callable[[Any], Any]] = None
+        self._backend: Optional[str] = None
+        # The proxies of the fallback JSON factory the JSON factory was last wrapped with
+        self._proxies: Tuple[ParseNodeProxyFactory, ...] = ()
+        self._json_factory: Optional[ParseNodeFactory] = None
+        if JsonParseNode is None:
+            if backend:
+                raise ImportError("microsoft-kiota-serialization-json is required")
+            return
+        for candidate in ((backend, ) if backend else AUTO_BACKENDS):
+            self._loads = _get_loads(candidate)
+            if self._loads:
+                self._backend = candidate
+                self._json_factory = _DecodedJsonParseNodeFactory(self._loads)
+                break
+        else:
+            if backend:
+                raise ImportError(f"The JSON backend {backend} is not installed")
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Gets the name of the module decoding JSON payloads
+
+        Returns:
+            Optional[str]: The backend, None when JSON is handled by the fallback factory
+        """
+        return self._backend
+
+    def get_valid_content_type(self) -> str:
+        return JSON_CONTENT_TYPE
+
+    def get_root_parse_node(self, content_type: str, content: bytes) -> ParseNode:
+        """Creates a ParseNode from the given payload and content type
+
+        Args:
+            content_type (str): The content type of the payload
+            content (bytes): The payload to read from
+
+        Returns:
+            ParseNode: A ParseNode that can deserialize the given payload
+        """
+        if self._loads is None or not content or not self._is_json(content_type):
+            return self._fallback_factory.get_root_parse_node(content_type, content)
+        return self._get_json_factory().get_root_parse_node(content_type, content)
+
+    def _get_json_factory(self) -> ParseNodeFactory:
+        """Gets the fast JSON factory wrapped with the proxies of the fallback JSON factory,
+        which can change after this factory is created, e.g. when the backing store is enabled
+        on the registry."""
+        proxies = self._get_fallback_json_proxies()
+        if proxies != self._proxies:
+            factory: ParseNodeFactory = _DecodedJsonParseNodeFactory(self._loads)  # type: ignore
+            for proxy in reversed(proxies):
+                factory = ParseNodeProxyFactory(factory, proxy._on_before, proxy._on_after)
+            self._proxies = proxies
+            self._json_factory = factory
+        return self._json_factory  # type: ignore
+
+    def _get_fallback_json_proxies(self) -> Tuple[ParseNodeProxyFactory, ...]:
+        factory: Optional[ParseNodeFactory] = self._fallback_factory
+        proxies = []
+        # The registry is a singleton, which can be reached at most once
+        in_registry = False
+        while True:
+            if isinstance(factory, ParseNodeProxyFactory):
+                proxies.append(factory)
+                factory = factory._concrete
+            elif isinstance(factory, ParseNodeFactoryRegistry) and not in_registry:
+                in_registry = True
+                factory = factory.CONTENT_TYPE_ASSOCIATED_FACTORIES.get(JSON_CONTENT_TYPE)
+            else:
+                return tuple(proxies)
+
+    @staticmethod
+    def _is_json(content_type: str) -> bool:
+        if not content_type:
+            return False
+        media_type = VENDOR_PREFIX_REGEX.sub("", content_type.split(";")[0].strip())
+        return media_type.casefold() == JSON_CONTENT_TYPE
@@ -0,0 +1,31 @@
+"""Exposes httpx headers as a HeadersCollection without copying them upfront."""
+from typing import Dict, Optional, Set
+
+import httpx
+from kiota_abstractions.headers_collection import HeadersCollection
+
+
+class HeadersView(HeadersCollection):
+    """A HeadersCollection over httpx headers, which are only copied into the collection the
+    first time it is used. Values of headers sent multiple times are joined with commas, as
+    httpx does."""
+
+    def __init__(self, headers: httpx.Headers) -> None:
+        """Creates an instance of HeadersView
+
+        Args:
+            headers (httpx.Headers): The headers to expose.
+        """
+        super().__init__()
+        self._source = headers
+        self._materialized_headers: Optional[Dict[str, Set[str]]] = None
+
+    @property  # type: ignore[override]
+    def _headers(self) -> Dict[str, Set[str]]:
+        if self._materialized_headers is None:
+            self._materialized_headers = {key: {value} for key, value in self._source.items()}
+        return self._materialized_headers
+
+    @_headers.setter
+    def _headers(self, value: Dict[str, Set[str]]) -> None:
+        self._materialized_headers = value
@@ -1,7 +1,27 @@
 """HTTPX client request adapter."""
+# pylint: disable=too-many-lines
+import asyncio
+import os
 import re
+import time
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from urllib import parse
 
 import httpx
@@ -34,17 +54,41 @@ from opentelemetry.semconv.attributes.url_attributes import URL_SCHEME, URL_FULL
 
 from kiota_http._exceptions import (
     BackingStoreError,
+    BulkRequestError,
     DeserializationError,
     RequestError,
     ResponseError,
+    UnparsedAPIError,
 )
 from kiota_http.middleware.parameters_name_decoding_handler import ParametersNameDecodingHandler
 
 from ._version import VERSION
+from .bounded_executor import collect_in_order, execute_as_completed
+from .error_body import is_unparsed_error_content_type, read_error_body
+from .error_mapping import get_error_class
+from .fast_json_parse_node_factory import FastJsonParseNodeFactory
 from .kiota_client_factory import KiotaClientFactory
-from .middleware import ParametersNameDecodingHandler
-from .middleware.options import ParametersNameDecodingHandlerOption, ResponseHandlerOption
+from .metrics import (
+    METRIC_ATTRIBUTES_KEY,
+    get_metric_attributes,
+    get_request_metric_attributes,
+    http_client_metrics,
+)
+from .middleware import ParametersNameDecodingHandler, UrlReplaceHandler
+from .middleware.options import (
+    ParametersNameDecodingHandlerOption,
+    RequestTimingsOption,
+    ResponseHandlerOption,
+    RetryHandlerOption,
+)
 from .observability_options import ObservabilityOptions
+from .page_iterator import PageIterator
+from .request_batcher import BatchRequestItem, RequestBatcher
+from .request_content import get_request_stream
+from .request_timings import RequestTimer, add_timings_event
+from .response_stream import ProgressCallback, ResponseStream
+from .tracing import start_child_span
+from .uri_template import get_request_url
 
 ResponseType = Union[str, int, float, bool, datetime, bytes]
 ModelType = TypeVar("ModelType", bound=Parsable)
@@ -55,6 +99,7 @@ ERROR_MAPPING_FOUND_KEY = "com.microsoft.kiota.error.mapping_found"
 ERROR_BODY_FOUND_KEY = "com.microsoft.kiota.error.body_found"
 DESERIALIZED_MODEL_NAME_KEY = "com.microsoft.kiota.response.type"
 REQUEST_IS_NULL = RequestError("Request info cannot be null")
+CLAIMS_REGEX = re.compile('claims="(.+)"')
 
 tracer = trace.get_tracer(ObservabilityOptions.get_tracer_instrumentation_name(), VERSION)
 
@@ -63,6 +108,14 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
     CLAIMS_KEY = "claims"
     BEARER_AUTHENTICATION_SCHEME = "Bearer"
     RESPONSE_AUTH_HEADER = "WWW-Authenticate"
+    AUTHORIZATION_HEADER = "Authorization"
+    # Seconds during which the authorization acquired for a claims challenge is reused
+    # for further requests challenged with the same claims.
+    CLAIMS_CHALLENGE_REUSE_SECONDS: float = 60.0
+    # Default number of requests of a bulk operation in flight at once
+    DEFAULT_MAX_CONCURRENCY = 10
+    # Default number of bytes of an error body read to deserialize it
+    DEFAULT_MAX_ERROR_BODY_SIZE = 1024 * 1024
 
     def __init__(
         self,
@@ -85,12 +138,17 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         if not http_client:
             http_client = KiotaClientFactory.create_with_default_middleware()
         self._http_client = http_client
+        http_client_metrics.track_connection_pool(http_client)
         if not base_url:
             base_url = ""
         self._base_url: str = base_url
         if not observability_options:
             observability_options = ObservabilityOptions()
         self.observability_options = observability_options
+        self._claims_challenges: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._claims_authorizations: Dict[str, Tuple[str, Set[str], float]] = {}
+        self._request_batcher: Optional[RequestBatcher] = None
+        self._max_error_body_size = self.DEFAULT_MAX_ERROR_BODY_SIZE
 
     @property
     def base_url(self) -> str:
@@ -111,6 +169,27 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         if value:
             self._base_url = value
 
+    @property
+    def max_error_body_size(self) -> int:
+        """Gets the maximum number of bytes of an error body read to deserialize it
+
+        Returns:
+            int: The maximum error body size
+        """
+        return self._max_error_body_size
+
+    @max_error_body_size.setter
+    def max_error_body_size(self, value: int) -> None:
+        """Sets the maximum number of bytes of an error body read to deserialize it. Larger
+        error bodies are raised as an UnparsedAPIError holding their first bytes.
+
+        Args:
+            value (int): The new maximum error body size
+        """
+        if value < 0:
+            raise ValueError("The maximum error body size cannot be negative")
+        self._max_error_body_size = value
+
     def get_serialization_writer_factory(self) -> SerializationWriterFactory:
         """Gets the serialization writer factory currently in use for the HTTP core service.
         Returns:
@@ -138,21 +217,23 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         Returns:
             The parent span.
         """
+        span = tracer.start_span(self._get_tracing_span_name(request_info, method))
+        return span
 
+    @staticmethod
+    def _get_tracing_span_name(request_info: RequestInformation, method: str) -> str:
         uri_template = (request_info.url_template if request_info.url_template else "UNKNOWN")
         characters_to_decode_for_uri_template = ['$', '.', '-', '~']
         decoded_uri_template = ParametersNameDecodingHandler().decode_uri_encoded_string(
             uri_template, characters_to_decode_for_uri_template
         )
-        parent_span_name = f"{method} - {decoded_uri_template}"
-
-        span = tracer.start_span(parent_span_name)
-        return span
+        return f"{method} - {decoded_uri_template}"
 
     def _start_local_tracing_span(self, name: str, parent_span: trace.Span) -> trace.Span:
         """Helper function to start a span locally with the parent context."""
-        _context = trace.set_span_in_context(parent_span)
-        span = tracer.start_span(name, context=_context)
+        span = start_child_span(
+            tracer, name, parent_span, self.observability_options.collapse_spans
+        )
         return span
 
     async def send_async(
@@ -175,30 +256,40 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         """
         parent_span = self.start_tracing_span(request_info, "send_async")
         try:
-            if not request_info:
-                parent_span.record_exception(REQUEST_IS_NULL)
-                raise REQUEST_IS_NULL
+            return await self._send_async(request_info, parsable_factory, error_map, parent_span)
+        finally:
+            self._complete_request_timings(request_info, parent_span)
+            parent_span.end()
 
-            response = await self.get_http_response_message(request_info, parent_span)
+    async def _send_async(
+        self,
+        request_info: RequestInformation,
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        parent_span: trace.Span,
+    ) -> Optional[ModelType]:
+        if not request_info:
+            parent_span.record_exception(REQUEST_IS_NULL)
+            raise REQUEST_IS_NULL
 
-            response_handler = self.get_response_handler(request_info)
-            if response_handler:
-                parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
-                return await response_handler.handle_response_async(response, error_map)
+        response = await self.get_http_response_message(request_info, parent_span)
 
-            await self.throw_failed_responses(response, error_map, parent_span, parent_span)
-            if self._should_return_none(response):
-                return None
-            root_node = await self.get_root_parse_node(response, parent_span, parent_span)
-            if root_node is None:
-                return None
-            _deserialized_span = self._start_local_tracing_span("get_object_value", parent_span)
-            value = root_node.get_object_value(parsable_factory)
-            parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, value.__class__.__name__)
-            _deserialized_span.end()
-            return value
-        finally:
-            parent_span.end()
+        response_handler = self.get_response_handler(request_info)
+        if response_handler:
+            parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
+            return await response_handler.handle_response_async(response, error_map)
+
+        await self.throw_failed_responses(response, error_map, parent_span, parent_span)
+        if self._should_return_none(response):
+            return None
+        root_node = await self.get_root_parse_node(response, parent_span, parent_span)
+        if root_node is None:
+            return None
+        _deserialized_span = self._start_local_tracing_span("get_object_value", parent_span)
+        value = root_node.get_object_value(parsable_factory)
+        parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, value.__class__.__name__)
+        _deserialized_span.end()
+        return value
 
     async def send_collection_async(
         self,
@@ -220,32 +311,44 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         """
         parent_span = self.start_tracing_span(request_info, "send_collection_async")
         try:
-            if not request_info:
-                parent_span.record_exception(REQUEST_IS_NULL)
-                raise REQUEST_IS_NULL
-            response = await self.get_http_response_message(request_info, parent_span)
-            response_handler = self.get_response_handler(request_info)
-            if response_handler:
-                parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
-                return await response_handler.handle_response_async(response, error_map)
-
-            await self.throw_failed_responses(response, error_map, parent_span, parent_span)
-            if self._should_return_none(response):
-                return None
-
-            _deserialized_span = self._start_local_tracing_span(
-                "get_collection_of_object_values", parent_span
+            return await self._send_collection_async(
+                request_info, parsable_factory, error_map, parent_span
             )
-            root_node = await self.get_root_parse_node(response, parent_span, parent_span)
-            if root_node:
-                result = root_node.get_collection_of_object_values(parsable_factory)
-                parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, result.__class__.__name__)
-                _deserialized_span.end()
-                return result
-            return None
         finally:
+            self._complete_request_timings(request_info, parent_span)
             parent_span.end()
 
+    async def _send_collection_async(
+        self,
+        request_info: RequestInformation,
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        parent_span: trace.Span,
+    ) -> Optional[List[ModelType]]:
+        if not request_info:
+            parent_span.record_exception(REQUEST_IS_NULL)
+            raise REQUEST_IS_NULL
+        response = await self.get_http_response_message(request_info, parent_span)
+        response_handler = self.get_response_handler(request_info)
+        if response_handler:
+            parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
+            return await response_handler.handle_response_async(response, error_map)
+
+        await self.throw_failed_responses(response, error_map, parent_span, parent_span)
+        if self._should_return_none(response):
+            return None
+
+        _deserialized_span = self._start_local_tracing_span(
+            "get_collection_of_object_values", parent_span
+        )
+        root_node = await self.get_root_parse_node(response, parent_span, parent_span)
+        if root_node:
+            result = root_node.get_collection_of_object_values(parsable_factory)
+            parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, result.__class__.__name__)
+            _deserialized_span.end()
+            return result
+        return None
+
     async def send_collection_of_primitive_async(
         self,
         request_info: RequestInformation,
@@ -266,33 +369,45 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         """
         parent_span = self.start_tracing_span(request_info, "send_collection_of_primitive_async")
         try:
-            if not request_info:
-                parent_span.record_exception(REQUEST_IS_NULL)
-                raise REQUEST_IS_NULL
-
-            response = await self.get_http_response_message(request_info, parent_span)
-            response_handler = self.get_response_handler(request_info)
-            if response_handler:
-                parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
-                return await response_handler.handle_response_async(response, error_map)
-
-            await self.throw_failed_responses(response, error_map, parent_span, parent_span)
-            if self._should_return_none(response):
-                return None
-
-            _deserialized_span = self._start_local_tracing_span(
-                "get_collection_of_primitive_values", parent_span
+            return await self._send_collection_of_primitive_async(
+                request_info, response_type, error_map, parent_span
             )
-            root_node = await self.get_root_parse_node(response, parent_span, parent_span)
-            if root_node:
-                values = root_node.get_collection_of_primitive_values(response_type)
-                parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, values.__class__.__name__)
-                _deserialized_span.end()
-                return values
-            return None
         finally:
+            self._complete_request_timings(request_info, parent_span)
             parent_span.end()
 
+    async def _send_collection_of_primitive_async(
+        self,
+        request_info: RequestInformation,
+        response_type: ResponseType,
+        error_map: Dict[str, ParsableFactory],
+        parent_span: trace.Span,
+    ) -> Optional[List[ResponseType]]:
+        if not request_info:
+            parent_span.record_exception(REQUEST_IS_NULL)
+            raise REQUEST_IS_NULL
+
+        response = await self.get_http_response_message(request_info, parent_span)
+        response_handler = self.get_response_handler(request_info)
+        if response_handler:
+            parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
+            return await response_handler.handle_response_async(response, error_map)
+
+        await self.throw_failed_responses(response, error_map, parent_span, parent_span)
+        if self._should_return_none(response):
+            return None
+
+        _deserialized_span = self._start_local_tracing_span(
+            "get_collection_of_primitive_values", parent_span
+        )
+        root_node = await self.get_root_parse_node(response, parent_span, parent_span)
+        if root_node:
+            values = root_node.get_collection_of_primitive_values(response_type)
+            parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, values.__class__.__name__)
+            _deserialized_span.end()
+            return values
+        return None
+
     async def send_primitive_async(
         self,
         request_info: RequestInformation,
@@ -313,49 +428,60 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         """
         parent_span = self.start_tracing_span(request_info, "send_primitive_async")
         try:
-            if not request_info:
-                parent_span.record_exception(REQUEST_IS_NULL)
-                raise REQUEST_IS_NULL
+            return await self._send_primitive_async(
+                request_info, response_type, error_map, parent_span
+            )
+        finally:
+            self._complete_request_timings(request_info, parent_span)
+            parent_span.end()
 
-            response = await self.get_http_response_message(request_info, parent_span)
+    async def _send_primitive_async(
+        self,
+        request_info: RequestInformation,
+        response_type: ResponseType,
+        error_map: Dict[str, ParsableFactory],
+        parent_span: trace.Span,
+    ) -> Optional[ResponseType]:
+        if not request_info:
+            parent_span.record_exception(REQUEST_IS_NULL)
+            raise REQUEST_IS_NULL
 
-            response_handler = self.get_response_handler(request_info)
-            if response_handler:
-                parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
-                return await response_handler.handle_response_async(response, error_map)
+        response = await self.get_http_response_message(request_info, parent_span)
 
-            await self.throw_failed_responses(response, error_map, parent_span, parent_span)
-            if self._should_return_none(response):
-                return None
-            if response_type == "bytes":
-                return response.content
-            _deserialized_span = self._start_local_tracing_span("get_root_parse_node", parent_span)
-            root_node = await self.get_root_parse_node(response, parent_span, parent_span)
-            if not root_node:
-                return None
-            value = None
-            if response_type == "str":
-                value = root_node.get_str_value()
-            if response_type == "int":
-                value = root_node.get_int_value()
-            if response_type == "float":
-                value = root_node.get_float_value()
-            if response_type == "bool":
-                value = root_node.get_bool_value()
-            if response_type == "datetime":
-                value = root_node.get_datetime_value()
-            if value is not None:
-                parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, value.__class__.__name__)
-                _deserialized_span.end()
-                return value
-
-            exc = TypeError(f"Error handling the response, unexpected type {response_type!r}")
-            parent_span.record_exception(exc)
+        response_handler = self.get_response_handler(request_info)
+        if response_handler:
+            parent_span.add_event(RESPONSE_HANDLER_EVENT_INVOKED_KEY)
+            return await response_handler.handle_response_async(response, error_map)
+
+        await self.throw_failed_responses(response, error_map, parent_span, parent_span)
+        if self._should_return_none(response):
+            return None
+        if response_type == "bytes":
+            return response.content
+        _deserialized_span = self._start_local_tracing_span("get_root_parse_node", parent_span)
+        root_node = await self.get_root_parse_node(response, parent_span, parent_span)
+        if not root_node:
+            return None
+        value = None
+        if response_type == "str":
+            value = root_node.get_str_value()
+        if response_type == "int":
+            value = root_node.get_int_value()
+        if response_type == "float":
+            value = root_node.get_float_value()
+        if response_type == "bool":
+            value = root_node.get_bool_value()
+        if response_type == "datetime":
+            value = root_node.get_datetime_value()
+        if value is not None:
+            parent_span.set_attribute(DESERIALIZED_MODEL_NAME_KEY, value.__class__.__name__)
             _deserialized_span.end()
-            raise exc
+            return value
 
-        finally:
-            parent_span.end()
+        exc = TypeError(f"Error handling the response, unexpected type {response_type!r}")
+        parent_span.record_exception(exc)
+        _deserialized_span.end()
+        raise exc
 
     async def send_no_response_content_async(
         self, request_info: RequestInformation, error_map: Dict[str, ParsableFactory]
@@ -381,6 +507,7 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
 
             await self.throw_failed_responses(response, error_map, parent_span, parent_span)
         finally:
+            self._complete_request_timings(request_info, parent_span)
             parent_span.end()
 
     def enable_backing_store(self, backing_store_factory: Optional[BackingStoreFactory]) -> None:
@@ -401,6 +528,292 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         if backing_store_factory:
             BackingStoreFactorySingleton(backing_store_factory=backing_store_factory)
 
+    def enable_fast_json_parsing(self, backend: Optional[str] = None) -> None:
+        """Decodes JSON responses with a fast JSON library, falling back to the current parse
+        node factory for other content types or when no such library is installed.
+        Args:
+            backend (Optional[str]): the module decoding JSON: orjson, simdjson or json.
+            Defaults to the first of orjson and simdjson installed.
+        """
+        self._parse_node_factory = FastJsonParseNodeFactory(self._parse_node_factory, backend)
+
+    def enable_request_batching(
+        self,
+        batch_window: float = RequestBatcher.DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = RequestBatcher.MAX_BATCH_SIZE,
+        batch_url: Optional[str] = None,
+    ) -> None:
+        """Enables the aggregation of requests sent within a short window into JSON batch
+        requests. Requests that do not target the base url or have a streamed body are
+        sent on their own.
+        Args:
+            batch_window (float): seconds to wait for more requests before sending a batch.
+            max_batch_size (int): the maximum number of requests per batch.
+            batch_url (Optional[str]): the url of the batch endpoint. Defaults to the $batch
+            endpoint under the base url.
+        """
+        self._request_batcher = RequestBatcher(self, batch_window, max_batch_size, batch_url)
+
+    def disable_request_batching(self) -> None:
+        """Sends every request on its own."""
+        self._request_batcher = None
+
+    async def send_batch_async(
+        self,
+        requests: Sequence[Union[RequestInformation, BatchRequestItem]],
+        max_concurrency: int = 1,
+        retry_option: Optional[RetryHandlerOption] = None,
+        max_batch_size: int = RequestBatcher.MAX_BATCH_SIZE,
+    ) -> List[httpx.Response]:
+        """Excutes the requests as JSON batch requests and returns the response of each.
+        Args:
+            requests (Sequence[Union[RequestInformation, BatchRequestItem]]): the requests to
+            execute. Use BatchRequestItem to declare the requests an item depends on.
+            max_concurrency (int): the maximum number of batch requests in flight.
+            retry_option (Optional[RetryHandlerOption]): the retry policy for sub-requests
+            answered with a retryable status code.
+            max_batch_size (int): the maximum number of requests per batch request.
+
+        Returns:
+            List[httpx.Response]: the responses in the order of the requests.
+        """
+        batch_url = self._request_batcher.batch_url if self._request_batcher else None
+        batcher = RequestBatcher(self, max_batch_size=max_batch_size, batch_url=batch_url)
+        return await batcher.execute_async(requests, max_concurrency, retry_option)
+
+    async def send_many_async(
+        self,
+        requests: Iterable[RequestInformation],
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Excutes the HTTP requests with at most max_concurrency requests in flight and
+        returns the deserialized response models in the order of the requests.
+        Args:
+            requests (Iterable[RequestInformation]): the request infos to execute. The iterable
+            is consumed as requests complete.
+            parsable_factory (ParsableFactory): the class of the response models
+            to deserialize the responses into.
+            error_map (Dict[str, ParsableFactory]): the error dict to use in
+            case of a failed request.
+            max_concurrency (int): the maximum number of requests in flight.
+            return_exceptions (bool): whether the errors of failed requests are returned in
+            place of their results instead of being raised.
+
+        Returns:
+            List[Any]: the deserialized response models in the order of the requests.
+
+        Raises:
+            BulkRequestError: when requests failed and return_exceptions is False.
+        """
+        return await collect_in_order(
+            self._send_many(
+                requests,
+                self._send_async,
+                (parsable_factory, error_map),
+                max_concurrency,
+                "send_many_async",
+            ),
+            return_exceptions,
+        )
+
+    async def send_many_collection_async(
+        self,
+        requests: Iterable[RequestInformation],
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Excutes the HTTP requests like send_many_async and returns the deserialized
+        response model collections in the order of the requests.
+        """
+        return await collect_in_order(
+            self._send_many(
+                requests,
+                self._send_collection_async,
+                (parsable_factory, error_map),
+                max_concurrency,
+                "send_many_collection_async",
+            ),
+            return_exceptions,
+        )
+
+    async def send_many_primitive_async(
+        self,
+        requests: Iterable[RequestInformation],
+        response_type: ResponseType,
+        error_map: Dict[str, ParsableFactory],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Excutes the HTTP requests like send_many_async and returns the deserialized
+        primitive responses of the given response_type in the order of the requests.
+        """
+        return await collect_in_order(
+            self._send_many(
+                requests,
+                self._send_primitive_async,
+                (response_type, error_map),
+                max_concurrency,
+                "send_many_primitive_async",
+            ),
+            return_exceptions,
+        )
+
+    async def send_many_as_completed_async(
+        self,
+        requests: Iterable[RequestInformation],
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Excutes the HTTP requests like send_many_async and yields the index of each
+        request with its deserialized response model as the requests complete. Closing the
+        iterator cancels the requests in flight.
+
+        Raises:
+            BulkRequestError: once all requests completed, when requests failed and
+            return_exceptions is False.
+        """
+        exceptions: Dict[int, Exception] = {}
+        completed = self._send_many(
+            requests,
+            self._send_async,
+            (parsable_factory, error_map),
+            max_concurrency,
+            "send_many_as_completed_async",
+        )
+        try:
+            async for index, result in completed:
+                if isinstance(result, Exception) and not return_exceptions:
+                    exceptions[index] = result
+                    continue
+                yield index, result
+        finally:
+            await completed.aclose()
+        if exceptions:
+            raise BulkRequestError(f"{len(exceptions)} requests failed", exceptions)
+
+    async def send_stream_async(
+        self,
+        request_info: RequestInformation,
+        error_map: Dict[str, ParsableFactory],
+        chunk_size: int = ResponseStream.DEFAULT_CHUNK_SIZE,
+        progress_callback: Optional[ProgressCallback] = None,
+        max_resume_attempts: int = ResponseStream.DEFAULT_MAX_RESUME_ATTEMPTS,
+    ) -> AsyncIterator[bytes]:
+        """Excutes the HTTP request specified by the given RequestInformation and yields the
+        response body in chunks without buffering it. After a transient failure the download
+        is resumed with a range request for the remaining bytes.
+        Args:
+            request_info (RequestInformation): the request info to execute.
+            error_map (Dict[str, ParsableFactory]): the error dict to use in
+            case of a failed request.
+            chunk_size (int): the number of bytes per chunk.
+            progress_callback (Optional[ProgressCallback]): called with the number of bytes
+            received and the total size, if known, after each chunk.
+            max_resume_attempts (int): the number of times the download is resumed.
+
+        Yields:
+            bytes: the next chunk of the response body.
+        """
+        parent_span = self.start_tracing_span(request_info, "send_stream_async")
+        chunks = ResponseStream(
+            self, request_info, error_map, chunk_size, max_resume_attempts, progress_callback
+        ).iterate_chunks(parent_span)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+            self._complete_request_timings(request_info, parent_span)
+            parent_span.end()
+
+    async def send_to_file_async(
+        self,
+        request_info: RequestInformation,
+        destination: Union[str, os.PathLike, int, Any],
+        error_map: Dict[str, ParsableFactory],
+        chunk_size: int = ResponseStream.DEFAULT_CHUNK_SIZE,
+        progress_callback: Optional[ProgressCallback] = None,
+        max_resume_attempts: int = ResponseStream.DEFAULT_MAX_RESUME_ATTEMPTS,
+    ) -> int:
+        """Excutes the HTTP request specified by the given RequestInformation and writes the
+        response body to the destination chunk by chunk, like send_stream_async.
+        Args:
+            request_info (RequestInformation): the request info to execute.
+            destination (Union[str, os.PathLike, int, Any]): a path to create or truncate, an
+            open file descriptor, a binary file object or an object with an asynchronous
+            write method.
+            error_map (Dict[str, ParsableFactory]): the error dict to use in
+            case of a failed request.
+
+        Returns:
+            int: the number of bytes written.
+        """
+        parent_span = self.start_tracing_span(request_info, "send_to_file_async")
+        try:
+            return await ResponseStream(
+                self, request_info, error_map, chunk_size, max_resume_attempts, progress_callback
+            ).write_to(destination, parent_span)
+        finally:
+            self._complete_request_timings(request_info, parent_span)
+            parent_span.end()
+
+    def iterate_pages(
+        self,
+        request_info: RequestInformation,
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        prefetch_depth: int = PageIterator.DEFAULT_PREFETCH_DEPTH,
+    ) -> PageIterator:
+        """Creates an iterator over the pages of a collection response, following the next
+        link of each page and requesting up to prefetch_depth following pages while a page
+        is consumed. See PageIterator.
+        """
+        return PageIterator(self, request_info, parsable_factory, error_map, prefetch_depth)
+
+    async def _send_many(
+        self,
+        requests: Iterable[RequestInformation],
+        send: Callable[..., Awaitable[Any]],
+        send_args: Tuple[Any, ...],
+        max_concurrency: int,
+        span_name: str,
+    ) -> AsyncGenerator[Tuple[int, Any], None]:
+        """Executes the requests under a single parent span for the whole bulk operation,
+        each request recording its attributes on a child span of its own."""
+        parent_span = tracer.start_span(span_name)
+        # Named like the span of a request sent on its own, e.g. send_async - {template}
+        method = send.__name__.lstrip("_")
+
+        async def send_request(request_info: RequestInformation) -> Any:
+            # Collapsing would record the attributes of concurrent requests on the same span
+            request_span = start_child_span(
+                tracer, self._get_tracing_span_name(request_info, method), parent_span, False
+            )
+            try:
+                return await send(request_info, *send_args, request_span)
+            finally:
+                self._complete_request_timings(request_info, request_span)
+                request_span.end()
+
+        completed = execute_as_completed(requests, send_request, max_concurrency)
+        try:
+            async for index, result in completed:
+                yield index, result
+        except Exception as error:
+            parent_span.record_exception(error)
+            raise
+        finally:
+            # Close explicitly so that closing this iterator cancels the requests in flight
+            await completed.aclose()
+            parent_span.end()
+
     async def get_root_parse_node(
         self,
         response: httpx.Response,
@@ -410,7 +823,7 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         span = self._start_local_tracing_span("get_root_parse_node", parent_span)
 
         try:
-            payload = response.content
+            payload = await self._read_response_body(response)
             response_content_type = self.get_response_content_type(response)
             if not response_content_type:
                 return None
@@ -418,6 +831,47 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         finally:
             span.end()
 
+    async def _read_response_body(self, response: httpx.Response) -> bytes:
+        """Gets the response body, reading streamed responses once. httpx keeps the body it
+        read so every later access returns the same bytes object without copying it."""
+        try:
+            return response.content
+        except httpx.ResponseNotRead:
+            return await response.aread()
+
+    async def _get_error_root_parse_node(
+        self,
+        response: httpx.Response,
+        parent_span: trace.Span,
+        attribute_span: trace.Span,
+    ) -> Optional[ParseNode]:
+        """Gets the root parse node of an error body, raising an UnparsedAPIError instead when
+        the body exceeds the maximum error body size or is not deserialized. Streamed error
+        bodies of unknown length cannot be read again once read, so they are parsed as read."""
+        error_body, is_complete = await read_error_body(response, self._max_error_body_size)
+        response_content_type = self.get_response_content_type(response)
+        if not is_complete or is_unparsed_error_content_type(response_content_type):
+            exc = UnparsedAPIError(
+                (
+                    "The server returned an unexpected status code and the error body was not"
+                    f" deserialized: {response_content_type} content"
+                    f"{'' if is_complete else ' exceeding the maximum error body size'}"
+                ),
+                response.status_code,
+                response.headers,
+                error_body,
+            )
+            attribute_span.set_attribute(ERROR_BODY_FOUND_KEY, bool(error_body))
+            attribute_span.record_exception(exc)
+            raise exc
+        try:
+            response.content
+        except httpx.ResponseNotRead:
+            if not response_content_type or not error_body:
+                return None
+            return self._parse_node_factory.get_root_parse_node(response_content_type, error_body)
+        return await self.get_root_parse_node(response, parent_span, parent_span)
+
     def _should_return_none(self, response: httpx.Response) -> bool:
         return response.status_code == 204 or not bool(response.content)
 
@@ -438,7 +892,6 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
             )
 
             response_status_code = response.status_code
-            response_status_code_str = str(response_status_code)
             response_headers = response.headers
 
             _throw_failed_resp_span.set_attribute("status", response_status_code)
@@ -456,10 +909,8 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
                 attribute_span.record_exception(exc)
                 raise exc
 
-            if (
-                response_status_code_str not in error_map
-                and self._error_class_not_in_error_mapping(error_map, response_status_code)
-            ):
+            error_class, is_mapped = get_error_class(error_map, response_status_code)
+            if not is_mapped:
                 exc = APIError(
                     "The server returned an unexpected status code and no error class is registered"
                     f" for this code {response_status_code}",
@@ -470,23 +921,14 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
                 raise exc
             _throw_failed_resp_span.set_attribute("status_message", "received_error_response")
 
-            error_class = None
-            if response_status_code_str in error_map:  # Error Code 400 - <= 599
-                error_class = error_map[response_status_code_str]
-            elif 400 <= response_status_code < 500 and "4XX" in error_map:  # Error code 4XX
-                error_class = error_map["4XX"]
-            elif 500 <= response_status_code < 600 and "5XX" in error_map:  # Error code 5XX
-                error_class = error_map["5XX"]
-            elif "XXX" in error_map:  # Blanket case
-                error_class = error_map["XXX"]
-
-            root_node = await self.get_root_parse_node(
-                response, _throw_failed_resp_span, _throw_failed_resp_span
+            root_node = await self._get_error_root_parse_node(
+                response, _throw_failed_resp_span, attribute_span
             )
             attribute_span.set_attribute(ERROR_BODY_FOUND_KEY, bool(root_node))
 
-            _get_obj_ctx = trace.set_span_in_context(_throw_failed_resp_span)
-            _get_obj_span = tracer.start_span("get_object_value", context=_get_obj_ctx)
+            _get_obj_span = self._start_local_tracing_span(
+                "get_object_value", _throw_failed_resp_span
+            )
 
             if not root_node:
                 return None
@@ -514,25 +956,40 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         request_info: RequestInformation,
         parent_span: trace.Span,
         claims: str = "",
+        stream: bool = False,
     ) -> httpx.Response:
         _get_http_resp_span = self._start_local_tracing_span(
             "get_http_response_message", parent_span
         )
 
         self.set_base_url_for_request_information(request_info)
+        timer = self._start_request_timer(request_info, claims)
 
-        additional_authentication_context = {}
-        if claims:
-            additional_authentication_context[self.CLAIMS_KEY] = claims
+        if (
+            self._request_batcher and not claims and not stream
+            and self._request_batcher.is_batchable(request_info)
+        ):
+            resp = await self._request_batcher.send_async(request_info)
+            parent_span.set_attribute(HTTP_RESPONSE_STATUS_CODE, resp.status_code)
+            _get_http_resp_span.end()
+            return resp
 
-        await self._authentication_provider.authenticate_request(
-            request_info, additional_authentication_context
-        )
+        if timer:
+            timer.start("authentication")
+        if claims:
+            await self._authenticate_request_with_claims(request_info, claims)
+        else:
+            await self._authentication_provider.authenticate_request(request_info, {})
 
+        if timer:
+            timer.stop("authentication")
+            timer.start("request_building")
         request = self.get_request_from_request_information(
             request_info, _get_http_resp_span, parent_span
         )
-        resp = await self._http_client.send(request)
+        if timer:
+            timer.stop("request_building")
+        resp = await self.send_native_async(request, stream)
         if not resp:
             raise ResponseError("Unable to get response from request")
         parent_span.set_attribute(HTTP_RESPONSE_STATUS_CODE, resp.status_code)
@@ -545,32 +1002,148 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         if content_type := resp.headers.get("Content-Type", None):
             parent_span.set_attribute("http.response.header.content-type", content_type)
         _get_http_resp_span.end()
-        return await self.retry_cae_response_if_required(resp, request_info, claims)
+        if timer:
+            timer.start("deserialization")
+        return await self.retry_cae_response_if_required(
+            resp, request_info, claims, parent_span, stream
+        )
+
+    def _start_request_timer(self, request_info: RequestInformation,
+                             claims: str) -> Optional[RequestTimer]:
+        """Starts timing a request with a RequestTimingsOption, resending a request for claims
+        keeps timing the original request."""
+        timings_option = request_info.request_options.get(RequestTimingsOption.get_key())
+        if timings_option is None:
+            return None
+        if claims and timings_option.timer:
+            return timings_option.timer
+        return timings_option.start()
+
+    def _complete_request_timings(
+        self, request_info: Optional[RequestInformation], parent_span: trace.Span
+    ) -> None:
+        """Completes timing a request with a RequestTimingsOption, adding the timings to its
+        span."""
+        if not request_info:
+            return
+        timings_option = request_info.request_options.get(RequestTimingsOption.get_key())
+        if timings_option is None or timings_option.timer is None:
+            return
+        timings_option.timer.stop("deserialization")
+        if timings := timings_option.complete():
+            add_timings_event(parent_span, timings)
+
+    async def send_native_async(
+        self, request: httpx.Request, stream: bool = False
+    ) -> httpx.Response:
+        """Sends a native request through the client and its middleware, recording its
+        metrics. The request is sent as is, without being authenticated.
+        Args:
+            request (httpx.Request): the request to send, e.g. built by convert_to_native_async.
+            stream (bool): whether the response body is left unread, to be streamed.
+
+        Returns:
+            httpx.Response: the response of the request.
+        """
+        attributes = get_request_metric_attributes(request)
+        http_client_metrics.active_requests.add(1, attributes)
+        started = time.perf_counter()
+        try:
+            response = await self._http_client.send(request, stream=stream)
+        except BaseException as error:
+            http_client_metrics.record_request(
+                attributes, time.perf_counter() - started, request, error=error
+            )
+            raise
+        finally:
+            http_client_metrics.active_requests.add(-1, attributes)
+        http_client_metrics.record_request(
+            attributes,
+            time.perf_counter() - started, request, response
+        )
+        return response
 
     async def retry_cae_response_if_required(
-        self, resp: httpx.Response, request_info: RequestInformation, claims: str
+        self,
+        resp: httpx.Response,
+        request_info: RequestInformation,
+        claims: str,
+        parent_span: Optional[trace.Span] = None,
+        stream: bool = False,
     ) -> httpx.Response:
-        parent_span = self.start_tracing_span(request_info, "retry_cae_response_if_required")
-        if (
-            resp.status_code == 401
-            and not claims  # previous claims exist. Means request has already been retried
-            and resp.headers.get(self.RESPONSE_AUTH_HEADER)
+        # previous claims exist. Means request has already been retried
+        if resp.status_code != 401 or claims:
+            return resp
+        auth_header_value = resp.headers.get(self.RESPONSE_AUTH_HEADER)
+        if not auth_header_value or not auth_header_value.casefold().startswith(
+            self.BEARER_AUTHENTICATION_SCHEME.casefold()
         ):
-            auth_header_value = resp.headers.get(self.RESPONSE_AUTH_HEADER)
-            if auth_header_value.casefold().startswith(
-                self.BEARER_AUTHENTICATION_SCHEME.casefold()
-            ):
-                claims_match = re.search('claims="(.+)"', auth_header_value)
-                if not claims_match:
-                    raise ValueError("Unable to parse claims from response")
-                response_claims = claims_match.group().split('="')[1]
-                parent_span.add_event(AUTHENTICATE_CHALLENGED_EVENT_KEY)
-                parent_span.set_attribute("http.retry_count", 1)
-                return await self.get_http_response_message(
-                    request_info, parent_span, response_claims
-                )
             return resp
-        return resp
+        claims_match = CLAIMS_REGEX.search(auth_header_value)
+        if not claims_match:
+            raise ValueError("Unable to parse claims from response")
+        response_claims = claims_match.group().split('="')[1]
+        if parent_span is None:
+            parent_span = self.start_tracing_span(request_info, "retry_cae_response_if_required")
+        parent_span.add_event(AUTHENTICATE_CHALLENGED_EVENT_KEY)
+        parent_span.set_attribute("http.retry_count", 1)
+        # Release the connection of a streamed response before sending the request again
+        await resp.aclose()
+        return await self.get_http_response_message(
+            request_info, parent_span, response_claims, stream
+        )
+
+    async def _authenticate_request_with_claims(
+        self, request_info: RequestInformation, claims: str
+    ) -> None:
+        """Authenticates a request challenged for claims.
+
+        Concurrent challenges for the same claims share one re-authentication, the
+        authorization it produces is applied to the other challenged requests.
+        """
+        host = parse.urlparse(request_info.url).netloc.lower()
+        if authorization := self._claims_authorizations.get(host):
+            authorized_claims, values, acquired_at = authorization
+            if (
+                authorized_claims == claims
+                and time.monotonic() - acquired_at < self.CLAIMS_CHALLENGE_REUSE_SECONDS
+            ):
+                self._set_authorization_header(request_info, values)
+                return
+
+        key = (host, claims)
+        challenge = self._claims_challenges.get(key)
+        if challenge is None:
+            challenge = asyncio.ensure_future(
+                self._authenticate_claims_challenge(request_info, host, claims)
+            )
+            self._claims_challenges[key] = challenge
+            challenge.add_done_callback(lambda _: self._claims_challenges.pop(key, None))
+            await asyncio.shield(challenge)
+            return
+
+        values = await asyncio.shield(challenge)
+        if values:
+            self._set_authorization_header(request_info, values)
+        else:
+            await self._authentication_provider.authenticate_request(
+                request_info, {self.CLAIMS_KEY: claims}
+            )
+
+    async def _authenticate_claims_challenge(
+        self, request_info: RequestInformation, host: str, claims: str
+    ) -> Set[str]:
+        await self._authentication_provider.authenticate_request(
+            request_info, {self.CLAIMS_KEY: claims}
+        )
+        values = set(request_info.headers.get(self.AUTHORIZATION_HEADER))
+        if values:
+            self._claims_authorizations[host] = (claims, values, time.monotonic())
+        return values
+
+    def _set_authorization_header(self, request_info: RequestInformation, values: Set[str]) -> None:
+        request_info.headers.remove(self.AUTHORIZATION_HEADER)
+        request_info.headers.add(self.AUTHORIZATION_HEADER, list(values))
 
     def get_response_handler(self, request_info: RequestInformation) -> Any:
         response_handler_option = request_info.request_options.get(ResponseHandlerOption.get_key())
@@ -590,31 +1163,47 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
         _get_request_span = self._start_local_tracing_span(
             "get_request_from_request_information", parent_span
         )
-        url = parse.urlparse(request_info.url)
-        otel_attributes = {
-            HTTP_REQUEST_METHOD: request_info.http_method,
-            "http.port": url.port,
-            URL_SCHEME: url.hostname,
-            SERVER_ADDRESS: url.scheme,
-            "url.uri_template": request_info.url_template,
-        }
-
-        if self.observability_options.include_euii_attributes:
-            otel_attributes.update({URL_FULL: url.geturl()})
-
+        headers = request_info.request_headers
+        content = request_info.content
+        if request_stream := get_request_stream(content):
+            # Stream file and buffer bodies instead of copying them into memory, the explicit
+            # length keeps httpx from falling back to chunked transfer encoding
+            content, content_length = request_stream
+            headers["Content-Length"] = str(content_length)
         request = self._http_client.build_request(
             method=request_info.http_method.value,
-            url=request_info.url,
-            headers=request_info.request_headers,
-            content=request_info.content,
+            url=get_request_url(request_info),
+            headers=headers,
+            content=content,
         )
         request_options = {
-            self.observability_options.get_key(): self.observability_options,
-            "parent_span": parent_span,
-            **request_info.request_options,
+            self.observability_options.get_key():
+            self.observability_options,
+            "parent_span":
+            parent_span,
+            METRIC_ATTRIBUTES_KEY:
+            get_metric_attributes(request.method, request.url, request_info.url_template),
         }
+        if request_info.request_options:
+            request_options.update(request_info.request_options)
         setattr(request, "options", request_options)
 
+        # The URL parsed by httpx is reused for the attributes instead of parsing it again
+        url = request.url
+        otel_attributes: Dict[str, Any] = {
+            HTTP_REQUEST_METHOD: request.method,
+            URL_SCHEME: url.host,
+            SERVER_ADDRESS: url.scheme,
+        }
+        # Attributes cannot be None, the port is None when it is the default of the scheme
+        if url.port is not None:
+            otel_attributes["http.port"] = url.port
+        if request_info.url_template:
+            otel_attributes["url.uri_template"] = request_info.url_template
+
+        if self.observability_options.include_euii_attributes:
+            otel_attributes.update({URL_FULL: str(url)})
+
         if content_length := request.headers.get("Content-Length", None):
             otel_attributes.update({"http.request.body.size": content_length})
 
@@ -626,6 +1215,21 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
 
         return request
 
+    def rewrite_native_request_url(self, request: httpx.Request) -> None:
+        """Rewrites the url of a native request the way the parameters name decoding and url
+        replacement middleware of the client would, with the options of the request if any.
+        Used for requests sent inside another request, e.g. the items of a batch request,
+        which do not go through the middleware themselves.
+        Args:
+            request (httpx.Request): the request to rewrite the url of.
+        """
+        transport = self._http_client._transport_for_url(request.url)
+        for middleware in getattr(transport, "pipeline", None) or ():
+            if isinstance(middleware, ParametersNameDecodingHandler):
+                middleware.decode_request_url(request)
+            elif isinstance(middleware, UrlReplaceHandler):
+                middleware.replace_request_url(request)
+
     async def convert_to_native_async(self, request_info: RequestInformation) -> httpx.Request:
         parent_span = self.start_tracing_span(request_info, "convert_to_native_async")
         try:
@@ -634,6 +1238,7 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
                 parent_span.record_exception(exc)
                 raise exc
 
+            self.set_base_url_for_request_information(request_info)
             await self._authentication_provider.authenticate_request(request_info)
 
             request = self.get_request_from_request_information(
@@ -642,22 +1247,3 @@ class HttpxRequestAdapter(RequestAdapter, Generic[ModelType]):
             return request
         finally:
             parent_span.end()
-
-    def _error_class_not_in_error_mapping(
-        self, error_map: Dict[str, ParsableFactory], status_code: int
-    ) -> bool:
-        """Helper function to check if the error class corresponding to a response status code
-        is not in the error mapping.
-
-        Args:
-            error_map (Dict[str, ParsableFactory]): The error mapping.
-            status_code (int): The response status code.
-
-        Returns:
-            bool: True if the error class is not in the error mapping, False otherwise.
-        """
-
-        return (
-            (400 <= status_code < 500 and "4XX" not in error_map) or
-            (500 <= status_code < 600 and "5XX" not in error_map)
-        ) and ("XXX" not in error_map)
@@ -0,0 +1,329 @@
+"""Uploads large files in ranges through an upload session."""
+import asyncio
+import mmap
+import os
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+from kiota_abstractions.serialization import ParsableFactory
+from opentelemetry import trace
+
+from ._exceptions import ResponseError
+from ._version import VERSION
+from .bounded_executor import execute_as_completed
+from .middleware import RetryHandler
+from .middleware.options import RetryHandlerOption
+from .observability_options import ObservabilityOptions
+from .request_content import BufferByteStream
+
+if TYPE_CHECKING:
+    from .httpx_request_adapter import HttpxRequestAdapter
+
+# Called with the number of bytes uploaded so far and the size of the file
+ProgressCallback = Callable[[int, int], Any]
+
+# A byte range as inclusive start and end offsets
+ByteRange = Tuple[int, int]
+
+RANGE_RETRY_EVENT_KEY = "com.microsoft.kiota.upload.range_retried"
+RANGE_ALREADY_RECEIVED_STATUS_CODE = 416
+
+tracer = trace.get_tracer(ObservabilityOptions.get_tracer_instrumentation_name(), VERSION)
+
+
+class LargeFileUploadTask():
+    """Uploads a file to an upload session in ranges.
+
+    The file is memory-mapped so that only the ranges in flight are read. Each range is sent
+    with a PUT request carrying a Content-Range header to the pre-authenticated upload url,
+    and failed ranges are retried on their own. An interrupted upload is resumed from the
+    ranges the upload session reports as still expected.
+    """
+    CONTENT_RANGE_HEADER = "Content-Range"
+    NEXT_EXPECTED_RANGES_KEY = "nextExpectedRanges"
+
+    # Default number of bytes per range, a multiple of the 320 KiB required by OneDrive
+    DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        request_adapter: "HttpxRequestAdapter",
+        upload_url: str,
+        file: Union[str, os.PathLike, IO[bytes]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = 1,
+        retry_option: Optional[RetryHandlerOption] = None,
+    ) -> None:
+        """Creates an instance of LargeFileUploadTask
+
+        Args:
+            request_adapter (HttpxRequestAdapter): The adapter whose client sends the ranges.
+            upload_url (str): The url of the upload session.
+            file (Union[str, os.PathLike, IO[bytes]]): The path of the file to upload or a file
+            opened in binary mode.
+            chunk_size (int, optional): The number of bytes per range. Defaults to 5 MiB.
+            max_concurrency (int, optional): The maximum number of ranges in flight. Only
+            increase it for upload sessions accepting ranges out of order. Defaults to 1.
+            retry_option (Optional[RetryHandlerOption], optional): The retry policy applied to
+            each range. Defaults to the default retry policy.
+        """
+        if not upload_url:
+            raise ValueError("Upload url cannot be null")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size should be greater than zero")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be greater than zero")
+        self._request_adapter = request_adapter
+        self._upload_url = upload_url
+        self._file = file
+        self._chunk_size = chunk_size
+        self._max_concurrency = max_concurrency
+        self._retry_option = retry_option or RetryHandlerOption()
+
+    @property
+    def upload_url(self) -> str:
+        """Gets the url of the upload session
+
+        Returns:
+            str: The upload url
+        """
+        return self._upload_url
+
+    async def upload_async(
+        self,
+        error_map: Optional[Dict[str, ParsableFactory]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> httpx.Response:
+        """Uploads the whole file.
+
+        Args:
+            error_map (Optional[Dict[str, ParsableFactory]]): The error dict to use in case of
+            a failed range.
+            progress_callback (Optional[ProgressCallback]): Called with the number of bytes
+            uploaded and the size of the file after each range.
+
+        Returns:
+            httpx.Response: The response completing the upload session.
+        """
+        return await self._upload(None, error_map, progress_callback, "upload_async")
+
+    async def resume_async(
+        self,
+        error_map: Optional[Dict[str, ParsableFactory]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> httpx.Response:
+        """Uploads the ranges the upload session still expects, e.g. after the process
+        uploading the file was interrupted.
+
+        Args:
+            error_map (Optional[Dict[str, ParsableFactory]]): The error dict to use in case of
+            a failed range.
+            progress_callback (Optional[ProgressCallback]): Called with the number of bytes
+            uploaded and the size of the file after each range.
+
+        Returns:
+            httpx.Response: The response completing the upload session.
+
+        Raises:
+            ResponseError: When the upload session already received the whole file.
+        """
+        ranges = await self.get_next_expected_ranges_async(error_map)
+        if not ranges:
+            raise ResponseError(
+                "The upload session already received the whole file, nothing is left to upload"
+            )
+        return await self._upload(ranges, error_map, progress_callback, "resume_async")
+
+    async def get_next_expected_ranges_async(
+        self,
+        error_map: Optional[Dict[str, ParsableFactory]] = None
+    ) -> List[Tuple[int, Optional[int]]]:
+        """Gets the ranges the upload session has not received yet.
+
+        Args:
+            error_map (Optional[Dict[str, ParsableFactory]]): The error dict to use in case of
+            a failed request.
+
+        Returns:
+            List[Tuple[int, Optional[int]]]: The inclusive start and end offsets of the expected
+            ranges, the end is None for a range extending to the end of the file.
+        """
+        response = await self._request_adapter.send_native_async(
+            httpx.Request("GET", self._upload_url)
+        )
+        await self._raise_for_failure(response, error_map, trace.INVALID_SPAN)
+        return self._parse_ranges(response.json().get(self.NEXT_EXPECTED_RANGES_KEY, []))
+
+    async def cancel_async(self) -> None:
+        """Deletes the upload session."""
+        response = await self._request_adapter.send_native_async(
+            httpx.Request("DELETE", self._upload_url)
+        )
+        await self._raise_for_failure(response, {}, trace.INVALID_SPAN)
+
+    async def _upload(
+        self,
+        expected_ranges: Optional[List[Tuple[int, Optional[int]]]],
+        error_map: Optional[Dict[str, ParsableFactory]],
+        progress_callback: Optional[ProgressCallback],
+        span_name: str,
+    ) -> httpx.Response:
+        parent_span = tracer.start_span(span_name)
+        try:
+            with self._map_file() as file_map:
+                parent_span.set_attribute("com.microsoft.kiota.upload.size", len(file_map))
+                if expected_ranges is None:
+                    expected_ranges = [(0, None)]
+                ranges = self._split_ranges(expected_ranges, len(file_map))
+                view = memoryview(file_map)
+                try:
+                    final_response = await self._upload_ranges(
+                        view, ranges, error_map or {}, progress_callback, parent_span
+                    )
+                finally:
+                    view.release()
+            if final_response is None:
+                raise ResponseError("The upload session was not completed by the uploaded ranges")
+            return final_response
+        except Exception as error:
+            parent_span.record_exception(error)
+            raise
+        finally:
+            parent_span.end()
+
+    async def _upload_ranges(
+        self,
+        view: memoryview,
+        ranges: List[ByteRange],
+        error_map: Dict[str, ParsableFactory],
+        progress_callback: Optional[ProgressCallback],
+        parent_span: trace.Span,
+    ) -> Optional[httpx.Response]:
+        """Uploads the ranges and returns the response completing the session, if any."""
+        size = len(view)
+        uploaded = size - sum(end - start + 1 for start, end in ranges)
+        responses = execute_as_completed(
+            ranges,
+            lambda byte_range: self._upload_range(view, byte_range, error_map, parent_span),
+            self._max_concurrency,
+        )
+        final_response = None
+        try:
+            async for index, response in responses:
+                if isinstance(response, Exception):
+                    raise response
+                uploaded += ranges[index][1] - ranges[index][0] + 1
+                if progress_callback:
+                    progress_callback(uploaded, size)
+                if response.status_code in (200, 201):
+                    final_response = response
+        finally:
+            # Stop the ranges in flight before the file is unmapped
+            await responses.aclose()
+        return final_response
+
+    async def _upload_range(
+        self,
+        view: memoryview,
+        byte_range: ByteRange,
+        error_map: Dict[str, ParsableFactory],
+        parent_span: trace.Span,
+    ) -> httpx.Response:
+        start, end = byte_range
+        size = len(view)
+        range_view = view[start:end + 1]
+        request = httpx.Request(
+            "PUT",
+            self._upload_url,
+            headers={
+                self.CONTENT_RANGE_HEADER: f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+                "Content-Type": "application/octet-stream",
+            },
+            stream=BufferByteStream(range_view),
+        )
+        try:
+            response = await self._send_with_retries(request, f"{start}-{end}", parent_span)
+        finally:
+            range_view.release()
+        if response.status_code != RANGE_ALREADY_RECEIVED_STATUS_CODE:
+            # The session already holds ranges received before an interruption
+            await self._raise_for_failure(response, error_map, parent_span)
+        return response
+
+    async def _send_with_retries(
+        self, request: httpx.Request, byte_range: str, parent_span: trace.Span
+    ) -> httpx.Response:
+        retry_handler = RetryHandler(self._retry_option)
+        retry_count = 0
+        max_delay = self._retry_option.max_delay
+        while True:
+            response: Optional[httpx.Response] = None
+            transport_error: Optional[httpx.TransportError] = None
+            try:
+                response = await self._request_adapter.send_native_async(request)
+            except httpx.TransportError as error:
+                transport_error = error
+            else:
+                if response.status_code not in retry_handler.retry_on_status_codes:
+                    return response
+            delay = retry_handler.get_delay_time(retry_count, response)
+            if (
+                not self._retry_option.should_retry
+                or not retry_handler.check_retry_valid(retry_count, self._retry_option)
+                or delay >= max_delay
+            ):
+                if response is None:
+                    raise ResponseError(
+                        f"Unable to upload the range {byte_range}"
+                    ) from transport_error
+                return response
+            max_delay -= delay
+            retry_count += 1
+            parent_span.add_event(
+                RANGE_RETRY_EVENT_KEY, {
+                    "range": byte_range,
+                    "retry_count": retry_count
+                }
+            )
+            await asyncio.sleep(delay)
+
+    async def _raise_for_failure(
+        self, response: httpx.Response, error_map: Optional[Dict[str, ParsableFactory]],
+        parent_span: trace.Span
+    ) -> None:
+        if response.is_success:
+            return
+        await self._request_adapter.throw_failed_responses(
+            response, error_map or {}, parent_span, parent_span
+        )
+
+    def _map_file(self) -> mmap.mmap:
+        if isinstance(self._file, (str, os.PathLike)):
+            with open(self._file, "rb") as file:
+                return self._map(file)
+        return self._map(self._file)
+
+    @staticmethod
+    def _map(file: IO[bytes]) -> mmap.mmap:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError("An empty file cannot be uploaded in ranges")
+        # The mapping stays valid once the file is closed
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _split_ranges(self, expected_ranges: List[Tuple[int, Optional[int]]],
+                      size: int) -> List[ByteRange]:
+        ranges = []
+        for start, end in expected_ranges:
+            end = size - 1 if end is None else min(end, size - 1)
+            for chunk_start in range(start, end + 1, self._chunk_size):
+                ranges.append((chunk_start, min(chunk_start + self._chunk_size, end + 1) - 1))
+        return ranges
+
+    @staticmethod
+    def _parse_ranges(values: List[str]) -> List[Tuple[int, Optional[int]]]:
+        ranges: List[Tuple[int, Optional[int]]] = []
+        for value in values:
+            start, _, end = value.partition("-")
+            ranges.append((int(start), int(end) if end else None))
+        return sorted(ranges)
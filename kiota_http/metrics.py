@@ -0,0 +1,182 @@
+"""OpenTelemetry metric instruments recorded by the request adapter and the middleware.
+
+Attributes are kept to a low cardinality: the request method, the server address, the URL
+template and the class of the response status code, never the full URL.
+"""
+import weakref
+from typing import Dict, Iterable, Optional
+
+import httpx
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from opentelemetry.semconv.attributes.error_attributes import ERROR_TYPE
+from opentelemetry.semconv.attributes.http_attributes import HTTP_REQUEST_METHOD
+from opentelemetry.semconv.attributes.server_attributes import SERVER_ADDRESS
+
+from ._version import VERSION
+from .observability_options import ObservabilityOptions
+
+MetricAttributes = Dict[str, str]
+
+# Request option key of the metric attributes of a request sent by the request adapter
+METRIC_ATTRIBUTES_KEY = "metric_attributes"
+# Attribute holding the URL template of the request
+URL_TEMPLATE = "url.template"
+# Attribute holding the class of the response status code, e.g. 2xx
+HTTP_RESPONSE_STATUS_CLASS = "http.response.status_class"
+# Attribute holding the state of pooled connections, active or idle
+HTTP_CONNECTION_STATE = "http.connection.state"
+
+meter = metrics.get_meter(ObservabilityOptions.get_tracer_instrumentation_name(), VERSION)
+
+
+def get_metric_attributes(
+    method: str, url: httpx.URL, url_template: Optional[str] = None
+) -> MetricAttributes:
+    """Gets the attributes of the metrics of a request.
+
+    Args:
+        method (str): The request method.
+        url (httpx.URL): The request URL, only its host is recorded.
+        url_template (Optional[str]): The URL template the URL was expanded from, if any.
+
+    Returns:
+        MetricAttributes: The attributes.
+    """
+    attributes = {HTTP_REQUEST_METHOD: method, SERVER_ADDRESS: url.host}
+    if url_template:
+        attributes[URL_TEMPLATE] = url_template
+    return attributes
+
+
+def get_request_metric_attributes(request: httpx.Request) -> MetricAttributes:
+    """Gets the metric attributes the request adapter attached to a request, or attributes
+    built from the request itself for requests sent by other clients.
+
+    Args:
+        request (httpx.Request): The request.
+
+    Returns:
+        MetricAttributes: The attributes.
+    """
+    if options := getattr(request, "options", None):
+        if attributes := options.get(METRIC_ATTRIBUTES_KEY):
+            return attributes
+    return get_metric_attributes(request.method, request.url)
+
+
+class HttpClientMetrics():
+    """The metric instruments of the HTTP client.
+
+    Instruments are no-ops until a meter provider is configured, so recording costs next to
+    nothing when metrics are not collected.
+    """
+
+    def __init__(self, metrics_meter: metrics.Meter) -> None:
+        """Creates an instance of HttpClientMetrics
+
+        Args:
+            metrics_meter (metrics.Meter): The meter creating the instruments.
+        """
+        self.request_duration = metrics_meter.create_histogram(
+            "http.client.request.duration",
+            unit="s",
+            description="Duration of HTTP client requests, retries and redirects included.",
+        )
+        self.request_body_size = metrics_meter.create_histogram(
+            "http.client.request.body.size",
+            unit="By",
+            description="Size of HTTP client request bodies.",
+        )
+        self.response_body_size = metrics_meter.create_histogram(
+            "http.client.response.body.size",
+            unit="By",
+            description="Size of HTTP client response bodies.",
+        )
+        self.active_requests = metrics_meter.create_up_down_counter(
+            "http.client.active_requests",
+            unit="{request}",
+            description="Number of active HTTP client requests.",
+        )
+        self.retries = metrics_meter.create_counter(
+            "http.client.request.retries",
+            unit="{retry}",
+            description="Number of retries of HTTP client requests.",
+        )
+        self.redirects = metrics_meter.create_counter(
+            "http.client.request.redirects",
+            unit="{redirect}",
+            description="Number of HTTP client redirects followed.",
+        )
+        self._clients: "weakref.WeakSet[httpx.AsyncClient]" = weakref.WeakSet()
+        self.open_connections = metrics_meter.create_observable_up_down_counter(
+            "http.client.open_connections",
+            callbacks=[self._observe_open_connections],
+            unit="{connection}",
+            description="Number of connections in the connection pools of HTTP clients.",
+        )
+
+    def track_connection_pool(self, client: httpx.AsyncClient) -> None:
+        """Observes the connections of the pool of a client until the client is collected.
+
+        Args:
+            client (httpx.AsyncClient): The client.
+        """
+        self._clients.add(client)
+
+    def record_request(
+        self,
+        attributes: MetricAttributes,
+        duration: float,
+        request: httpx.Request,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Records a completed request.
+
+        Args:
+            attributes (MetricAttributes): The attributes of the request.
+            duration (float): The duration of the request in seconds.
+            request (httpx.Request): The request.
+            response (Optional[httpx.Response]): The response, None when the request failed.
+            error (Optional[BaseException]): The error the request failed with, if any.
+        """
+        if response is not None:
+            attributes = {
+                **attributes, HTTP_RESPONSE_STATUS_CLASS: f"{response.status_code // 100}xx"
+            }
+        elif error is not None:
+            attributes = {**attributes, ERROR_TYPE: type(error).__qualname__}
+        self.request_duration.record(duration, attributes)
+        if (request_body_size := _get_content_length(request.headers)) is not None:
+            self.request_body_size.record(request_body_size, attributes)
+        if response is None:
+            return
+        if (response_body_size := _get_content_length(response.headers)) is not None:
+            self.response_body_size.record(response_body_size, attributes)
+
+    def _observe_open_connections(self, _options: CallbackOptions) -> Iterable[Observation]:
+        counts = {"active": 0, "idle": 0}
+        for client in list(self._clients):
+            for connection in _get_pool_connections(client):
+                counts["idle" if connection.is_idle() else "active"] += 1
+        return [
+            Observation(count, {HTTP_CONNECTION_STATE: state}) for state, count in counts.items()
+        ]
+
+
+def _get_content_length(headers: httpx.Headers) -> Optional[int]:
+    content_length: Optional[str] = headers.get("Content-Length")
+    return int(content_length) if content_length and content_length.isdigit() else None
+
+
+def _get_pool_connections(client: httpx.AsyncClient) -> list:
+    # The middleware transport wraps the transport owning the pool, transports without
+    # an httpcore pool, e.g. mock transports, have no connections to observe
+    transport = getattr(client, "_transport", None)
+    transport = getattr(transport, "transport", transport)
+    pool = getattr(transport, "_pool", None)
+    return list(getattr(pool, "connections", ()))
+
+
+http_client_metrics = HttpClientMetrics(meter)
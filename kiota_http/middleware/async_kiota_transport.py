@@ -1,6 +1,11 @@
+import time
+from typing import Optional
+
 import httpx
 
+from ..request_timings import RequestTimer, current_request_timer
 from .middleware import MiddlewarePipeline
+from .options import RequestTimingsOption
 
 
 class AsyncKiotaTransport(httpx.AsyncBaseTransport):
@@ -13,8 +18,38 @@ class AsyncKiotaTransport(httpx.AsyncBaseTransport):
 
     async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
         if self.pipeline:
+            timer = self._get_request_timer(request)
+            if timer is not None:
+                return await self._send_timed_request(request, timer)
             response = await self.pipeline.send(request)
             return response
 
         response = await self.transport.handle_async_request(request)
         return response
+
+    async def _send_timed_request(
+        self, request: httpx.Request, timer: RequestTimer
+    ) -> httpx.Response:
+        """Sends a request through the pipeline, measuring the time spent in the middleware and
+        observing the connection phases through the httpx trace extension."""
+        if "trace" not in request.extensions:
+            request.extensions["trace"] = timer.trace
+        token = current_request_timer.set(timer)
+        transport_duration = timer.get_duration("transport")
+        started = time.perf_counter()
+        try:
+            return await self.pipeline.send(request)
+        finally:
+            current_request_timer.reset(token)
+            timer.add(
+                "middleware",
+                time.perf_counter() - started -
+                (timer.get_duration("transport") - transport_duration),
+            )
+
+    @staticmethod
+    def _get_request_timer(request: httpx.Request) -> Optional[RequestTimer]:
+        if options := getattr(request, "options", None):
+            if timings_option := options.get(RequestTimingsOption.get_key()):
+                return timings_option.timer
+        return None
@@ -48,13 +48,21 @@ class HeadersInspectionHandler(BaseMiddleware):
         span.set_attribute(HEADERS_INSPECTION_KEY, True)
         span.end()
 
-        if current_options and current_options.inspect_request_headers:
-            for header in request.headers:
-                current_options.request_headers.add(header, request.headers[header])
+        if not current_options or not (
+            current_options.inspect_request_headers or current_options.inspect_response_headers
+        ):
+            return await super().send(request, transport)
+
+        # Options passed with a request hold its headers, the default option is shared by
+        # concurrent requests which each see their own headers in their context
+        scope_to_context = current_options is self.options
+        current_options.inspect_request(
+            request.headers if current_options.inspect_request_headers else None,
+            scope_to_context,
+        )
         response = await super().send(request, transport)
-        if current_options and current_options.inspect_response_headers:
-            for header in response.headers:
-                current_options.response_headers.add(header, response.headers[header])
+        if current_options.inspect_response_headers:
+            current_options.inspect_response(response.headers, scope_to_context)
         return response
 
     def _get_current_options(self, request: httpx.Request) -> HeadersInspectionHandlerOption:
@@ -75,8 +83,4 @@ class HeadersInspectionHandler(BaseMiddleware):
             )
         if current_options:
             return current_options
-
-        # Clear headers per request
-        self.options.request_headers.clear()
-        self.options.response_headers.clear()
         return self.options
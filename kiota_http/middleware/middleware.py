@@ -7,6 +7,8 @@ from urllib3 import PoolManager
 
 from .._version import VERSION
 from ..observability_options import ObservabilityOptions
+from ..request_timings import current_request_timer
+from ..tracing import start_child_span
 
 tracer = trace.get_tracer(ObservabilityOptions.get_tracer_instrumentation_name(), VERSION)
 
@@ -39,11 +41,18 @@ class MiddlewarePipeline():
         # No middleware in pipeline, delete request optoions from header and
         # send the request
         del request.headers['request_options']
-        return await self._transport.handle_async_request(request)
+        return await send_to_transport(request, self._transport)
 
     def _middleware_present(self):
         return self._current_middleware
 
+    def __iter__(self):
+        """Iterates over the middleware in the order requests go through them."""
+        middleware = self._first_middleware
+        while middleware is not None:
+            yield middleware
+            middleware = middleware.next
+
 
 class BaseMiddleware():
     """Base class for middleware. Handles moving a Request to the next middleware in the pipeline.
@@ -59,20 +68,42 @@ class BaseMiddleware():
             # Remove request options if there's no other middleware in the chain.
             if hasattr(request, "options") and request.options:
                 delattr(request, 'options')
-            response = await transport.handle_async_request(request)
+            response = await send_to_transport(request, transport)
             response.request = request
             return response
         return await self.next.send(request, transport)
 
     def _create_observability_span(self, request, span_name: str) -> trace.Span:
-        """Gets the parent_span from the request options and creates a new span.
-        If no parent_span is found, we try to get the current span."""
-        _span = None
+        """Gets the parent_span from the request options and creates a new span, collapsed
+        into the parent span when the observability options say so, and not created at all
+        when the parent span is not recording.
+        If no parent_span is found, the span is collapsed into the current span."""
         if options := getattr(request, "options", None):
             if parent_span := options.get("parent_span", None):
                 self.parent_span = parent_span
-                _context = trace.set_span_in_context(parent_span)
-                _span = tracer.start_span(span_name, _context)
-        if _span is None:
-            _span = trace.get_current_span()
-        return _span
+                observability_options = options.get(ObservabilityOptions.get_key())
+                return start_child_span(
+                    tracer,
+                    span_name,
+                    parent_span,
+                    bool(observability_options and observability_options.collapse_spans),
+                )
+        return start_child_span(tracer, span_name, trace.get_current_span(), True)
+
+
+async def send_to_transport(
+    request: httpx.Request, transport: httpx.AsyncBaseTransport
+) -> httpx.Response:
+    """Sends a request through the transport at the end of the middleware pipeline, measuring
+    the time spent in the transport when the request is timed."""
+    timer = current_request_timer.get()
+    if timer is None:
+        return await transport.handle_async_request(request)
+    timer.start("transport")
+    # Stopped by the trace extension once a connection is acquired from the pool
+    timer.start("connection_acquisition")
+    try:
+        return await transport.handle_async_request(request)
+    finally:
+        timer.cancel("connection_acquisition")
+        timer.stop("transport")
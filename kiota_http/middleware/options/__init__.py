@@ -1,6 +1,7 @@
 from .headers_inspection_handler_option import HeadersInspectionHandlerOption
 from .parameters_name_decoding_handler_option import ParametersNameDecodingHandlerOption
 from .redirect_handler_option import RedirectHandlerOption
+from .request_timings_option import RequestTimingsOption
 from .response_handler_option import ResponseHandlerOption
 from .retry_handler_option import RetryHandlerOption
 from .telemetry_handler_option import TelemetryHandlerOption
@@ -3,11 +3,24 @@
 # Licensed under the MIT License.
 # See License in the project root for license information.
 # ------------------------------------
-from typing import Dict
+from contextvars import ContextVar
+from typing import NamedTuple, Optional
 
+import httpx
 from kiota_abstractions.headers_collection import HeadersCollection
 from kiota_abstractions.request_option import RequestOption
 
+from ...headers_view import HeadersView
+
+
+class InspectedHeaders(NamedTuple):
+    """The headers inspected for a request, None for headers not inspected."""
+    request_headers: Optional[HeadersCollection]
+    response_headers: Optional[HeadersCollection]
+
+
+InspectedHeadersVar = ContextVar[Optional[InspectedHeaders]]
+
 
 class HeadersInspectionHandlerOption(RequestOption):
     """Config options for the HeaderInspectionHandler"""
@@ -23,16 +36,26 @@ class HeadersInspectionHandlerOption(RequestOption):
     ) -> None:
         """Creates an instance of headers inspection handler option.
 
+        The inspected headers reference the httpx headers of the request instead of copying
+        them. They are stored on options passed with a request, and scoped to the context of
+        the request for the default option of the handler, so that the concurrent requests
+        sharing it each get their own headers.
+
         Args:
             inspect_request_headers (bool, optional): whether the request headers
             should be inspected. Defaults to True.
             inspect_response_headers (bool, optional): whether the response headers
             should be inspected. Defaults to True.
+            request_headers (HeadersCollection, optional): The request headers until headers
+            are inspected. Defaults to an empty collection.
+            response_headers (HeadersCollection, optional): The response headers until
+            headers are inspected. Defaults to an empty collection.
         """
         self._inspect_request_headers = inspect_request_headers
         self._inspect_response_headers = inspect_response_headers
         self._request_headers = request_headers if request_headers else HeadersCollection()
         self._response_headers = response_headers if response_headers else HeadersCollection()
+        self._inspected_headers: InspectedHeadersVar = ContextVar("inspected_headers", default=None)
 
     @property
     def inspect_request_headers(self):
@@ -55,20 +78,68 @@ class HeadersInspectionHandlerOption(RequestOption):
     @property
     def request_headers(self):
         """Gets the request headers to for the current request."""
+        inspected_headers = self._inspected_headers.get()
+        if inspected_headers and inspected_headers.request_headers is not None:
+            return inspected_headers.request_headers
         return self._request_headers
 
     @request_headers.setter
     def request_headers(self, value: HeadersCollection):
         self._request_headers = value
+        if inspected_headers := self._inspected_headers.get():
+            self._inspected_headers.set(inspected_headers._replace(request_headers=None))
 
     @property
     def response_headers(self):
         """Gets the response headers to for the current request."""
+        inspected_headers = self._inspected_headers.get()
+        if inspected_headers and inspected_headers.response_headers is not None:
+            return inspected_headers.response_headers
         return self._response_headers
 
     @response_headers.setter
     def response_headers(self, value: HeadersCollection):
         self._response_headers = value
+        if inspected_headers := self._inspected_headers.get():
+            self._inspected_headers.set(inspected_headers._replace(response_headers=None))
+
+    def inspect_request(
+        self, headers: Optional[httpx.Headers], scope_to_context: bool = False
+    ) -> None:
+        """Starts inspecting a request. Called by the HeadersInspectionHandler.
+
+        Args:
+            headers (Optional[httpx.Headers]): The request headers, None when they are not
+            inspected.
+            scope_to_context (bool, optional): Whether the headers are only exposed in the
+            current context, forgetting the headers of the previous request in it, for an
+            option shared by concurrent requests. Defaults to False.
+        """
+        request_headers = None if headers is None else HeadersView(headers)
+        if scope_to_context:
+            self._inspected_headers.set(InspectedHeaders(request_headers, None))
+        elif request_headers is not None:
+            self._request_headers = request_headers
+
+    def inspect_response(self, headers: httpx.Headers, scope_to_context: bool = False) -> None:
+        """Inspects the response headers of the request. Called by the
+        HeadersInspectionHandler.
+
+        Args:
+            headers (httpx.Headers): The response headers.
+            scope_to_context (bool, optional): Whether the headers are only exposed in the
+            current context, like the request headers. Defaults to False.
+        """
+        if not scope_to_context:
+            self._response_headers = HeadersView(headers)
+            return
+        inspected_headers = self._inspected_headers.get()
+        self._inspected_headers.set(
+            InspectedHeaders(
+                inspected_headers.request_headers if inspected_headers else None,
+                HeadersView(headers),
+            )
+        )
 
     @staticmethod
     def get_key() -> str:
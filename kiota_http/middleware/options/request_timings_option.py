@@ -0,0 +1,73 @@
+from typing import Callable, Optional
+
+from kiota_abstractions.request_option import RequestOption
+
+from ...request_timings import RequestTimer, RequestTimings
+
+
+class RequestTimingsOption(RequestOption):
+    """Measures the phases of the request the option is added to.
+
+    The timings are available from the option, passed to the callback and added as an event
+    to the span of the request once the request adapter returns.
+    """
+
+    REQUEST_TIMINGS_OPTION_KEY = "RequestTimingsOption"
+
+    def __init__(self, callback: Optional[Callable[[RequestTimings], None]] = None) -> None:
+        """Creates an instance of RequestTimingsOption
+
+        Args:
+            callback (Optional[Callable[[RequestTimings], None]]): Called with the timings of
+            every request completed with the option. Defaults to None.
+        """
+        self._callback = callback
+        self._timer: Optional[RequestTimer] = None
+        self._timings: Optional[RequestTimings] = None
+
+    @property
+    def callback(self) -> Optional[Callable[[RequestTimings], None]]:
+        """The callback called with the timings of every request completed with the option."""
+        return self._callback
+
+    @callback.setter
+    def callback(self, value: Optional[Callable[[RequestTimings], None]]) -> None:
+        self._callback = value
+
+    @property
+    def timings(self) -> Optional[RequestTimings]:
+        """The timings of the last request completed with the option, None before."""
+        return self._timings
+
+    @property
+    def timer(self) -> Optional[RequestTimer]:
+        """The timer of the request in flight, None when no request is in flight."""
+        return self._timer
+
+    def start(self) -> RequestTimer:
+        """Starts timing a request. Called by the request adapter.
+
+        Returns:
+            RequestTimer: The timer of the request.
+        """
+        self._timer = RequestTimer()
+        return self._timer
+
+    def complete(self) -> Optional[RequestTimings]:
+        """Completes timing the request in flight and calls the callback. Called by the request
+        adapter.
+
+        Returns:
+            Optional[RequestTimings]: The timings, None when no request is in flight.
+        """
+        if self._timer is None:
+            return None
+        self._timings = self._timer.get_timings()
+        self._timer = None
+        if self._callback:
+            self._callback(self._timings)
+        return self._timings
+
+    @staticmethod
+    def get_key() -> str:
+        return RequestTimingsOption.REQUEST_TIMINGS_OPTION_KEY
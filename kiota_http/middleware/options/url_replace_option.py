@@ -1,7 +1,9 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from kiota_abstractions.request_option import RequestOption
 
+from ...url_rewrite_engine import UrlRewriteEngine
+
 
 class UrlReplaceHandlerOption(RequestOption):
     """Config options for the UrlReplaceHandlerOption
@@ -9,17 +11,31 @@ class UrlReplaceHandlerOption(RequestOption):
 
     URL_REPLACE_HANDLER_OPTION_KEY = "UrlReplaceHandlerOption"
 
-    def __init__(self, enabled: bool = True, replacement_pairs: Dict[str, str] = {}) -> None:
+    def __init__(
+        self,
+        enabled: bool = True,
+        replacement_pairs: Optional[Dict[str, str]] = None,
+        host_replacements: Optional[Dict[str, str]] = None,
+        path_prefix_replacements: Optional[Dict[str, str]] = None,
+    ) -> None:
         """Creates an instance of url replace option.
 
         Args:
             enabled (bool, optional): Whether to enable the url replace handler.
             Defaults to True.
-            replacement_pairs (Dict[str, str], optional): Dictionary of values
-            to replace. Defaults to {}.
+            replacement_pairs (Optional[Dict[str, str]], optional): Dictionary of values
+            to replace. Defaults to None.
+            host_replacements (Optional[Dict[str, str]], optional): Dictionary of hosts
+            to replace. Defaults to None.
+            path_prefix_replacements (Optional[Dict[str, str]], optional): Dictionary of
+            path prefixes to replace. Defaults to None.
         """
         self._enabled = enabled
-        self._replacement_pairs = replacement_pairs
+        self._replacement_pairs = replacement_pairs or {}
+        self._host_replacements = host_replacements or {}
+        self._path_prefix_replacements = path_prefix_replacements or {}
+        self._compiled_rules: Tuple[Dict[str, str], ...] = ()
+        self._rewrite_engine = self._compile()
 
     @property
     def is_enabled(self):
@@ -39,6 +55,42 @@ class UrlReplaceHandlerOption(RequestOption):
     def replacement_pairs(self, value: Dict[str, str]):
         self._replacement_pairs = value
 
+    @property
+    def host_replacements(self) -> Dict[str, str]:
+        """The hosts to replace, compared case-insensitively"""
+        return self._host_replacements
+
+    @host_replacements.setter
+    def host_replacements(self, value: Dict[str, str]):
+        self._host_replacements = value
+
+    @property
+    def path_prefix_replacements(self) -> Dict[str, str]:
+        """The path prefixes to replace, matched on path segment boundaries"""
+        return self._path_prefix_replacements
+
+    @path_prefix_replacements.setter
+    def path_prefix_replacements(self, value: Dict[str, str]):
+        self._path_prefix_replacements = value
+
+    @property
+    def rewrite_engine(self) -> UrlRewriteEngine:
+        """The rules compiled into a rewrite engine, compiled again when they were set or
+        modified in place since."""
+        if self._get_rules() != self._compiled_rules:
+            self._rewrite_engine = self._compile()
+        return self._rewrite_engine
+
+    def _get_rules(self) -> Tuple[Dict[str, str], ...]:
+        return (self._replacement_pairs, self._host_replacements, self._path_prefix_replacements)
+
+    def _compile(self) -> UrlRewriteEngine:
+        # Copies are kept to tell whether the dictionaries were modified in place
+        self._compiled_rules = tuple(dict(rules) for rules in self._get_rules())
+        return UrlRewriteEngine(
+            self._replacement_pairs, self._host_replacements, self._path_prefix_replacements
+        )
+
     @staticmethod
     def get_key() -> str:
         return UrlReplaceHandlerOption.URL_REPLACE_HANDLER_OPTION_KEY
@@ -19,6 +19,7 @@ class UserAgentHandlerOption(RequestOption):
         self._enabled = enabled
         self._product_name = product_name
         self._product_version = product_version
+        self._product_token = f"{product_name}/{product_version}"
 
     @property
     def is_enabled(self):
@@ -28,7 +29,7 @@ class UserAgentHandlerOption(RequestOption):
     @is_enabled.setter
     def is_enabled(self, value: bool):
         """Sets the option enabled value."""
-        self._value = value
+        self._enabled = value
 
     @property
     def product_name(self):
@@ -41,6 +42,7 @@ class UserAgentHandlerOption(RequestOption):
         if not value:
             raise ValueError("product_name cannot be empty.")
         self._product_name = value
+        self._product_token = f"{value}/{self._product_version}"
 
     @property
     def product_version(self):
@@ -53,6 +55,12 @@ class UserAgentHandlerOption(RequestOption):
         if not value:
             raise ValueError("product_version cannot be empty.")
         self._product_version = value
+        self._product_token = f"{self._product_name}/{value}"
+
+    @property
+    def product_token(self):
+        """Returns the product_name/product_version token added to the User-Agent header."""
+        return self._product_token
 
     @staticmethod
     def get_key() -> str:
@@ -1,4 +1,6 @@
-from typing import List
+import re
+from itertools import product
+from typing import Dict, List, Match, Pattern, Tuple
 from urllib.parse import urlparse
 
 import httpx
@@ -9,6 +11,9 @@ from .options import ParametersNameDecodingHandlerOption
 
 PARAMETERS_NAME_DECODING_KEY = "com.microsoft.kiota.handler.parameters_name_decoding.enable"
 
+# Decoding tables by characters to decode, see _get_decoding_table
+_decoding_tables: Dict[Tuple[str, ...], Tuple[Pattern[str], Dict[str, str]]] = {}
+
 
 class ParametersNameDecodingHandler(BaseMiddleware):
 
@@ -44,23 +49,37 @@ class ParametersNameDecodingHandler(BaseMiddleware):
             span.set_attribute(PARAMETERS_NAME_DECODING_KEY, current_options.enabled)
         span.end()
 
-        query_params = request.url.query.decode('utf-8')
+        self.decode_request_url(request)
+        response = await super().send(request, transport)
+        return response
+
+    def decode_request_url(self, request: httpx.Request) -> None:
+        """Decodes the parameter names in the query of the request url, with the options of
+        the request if any.
+
+        Args:
+            request (httpx.Request): The prepared request object
+        """
+        current_options = self._get_current_options(request)
+        query = request.url.query
         if all(
             [
                 current_options,
                 current_options.enabled,
-                "%" in query_params,
+                b"%" in query,
                 current_options.characters_to_decode,
             ]
         ):
-            original_url: str = str(request.url)  # type: ignore
+            query_params = query.decode('utf-8')
             decoded_query_parameters_string = self.decode_uri_encoded_string(
                 query_params, current_options.characters_to_decode
             )
-            new_url = original_url.replace(query_params, decoded_query_parameters_string)
-            request.url = httpx.URL(new_url)
-        response = await super().send(request, transport)
-        return response
+            # Only the query is replaced, and only when a parameter name was decoded, so that
+            # the URL is not parsed again for nothing
+            if decoded_query_parameters_string != query_params:
+                request.url = request.url.copy_with(
+                    query=decoded_query_parameters_string.encode('utf-8')
+                )
 
     def _get_current_options(self, request: httpx.Request) -> ParametersNameDecodingHandlerOption:
         """Returns the options to use for the request.Overrides default options if
@@ -81,21 +100,48 @@ class ParametersNameDecodingHandler(BaseMiddleware):
         return self.options
 
     def decode_uri_encoded_string(self, original: str, characters_to_decode: List[str]) -> str:
-        """Decodes a uri encoded url string"""
-        if not original or not characters_to_decode:
-            return original
-        symbols_to_replace = [
-            (f"%{ord(x):X}", x) for x in characters_to_decode if f"%{ord(x):X}" in original
-        ]
+        """Decodes the characters to decode in the parameter names of a uri encoded query
+        string, in a single pass. Parameter values are left encoded.
 
-        encoded_parameter_values = [
-            part.split('=')[0] for part in original.split('&') if '%' in part
-        ]
-
-        for parameter in encoded_parameter_values:
-            for symbol_to_replace in symbols_to_replace:
-                if symbol_to_replace[0] in parameter:
-                    new_parameter = parameter.replace(symbol_to_replace[0], symbol_to_replace[1])
-                    original = original.replace(parameter, new_parameter)
+        Args:
+            original (str): The query string.
+            characters_to_decode (List[str]): The characters to decode.
 
-        return original
+        Returns:
+            str: The query string with the parameter names decoded.
+        """
+        if not original or not characters_to_decode or "%" not in original:
+            return original
+        pattern, decoded_characters = _get_decoding_table(characters_to_decode)
+
+        def decode(match: Match[str]) -> str:
+            return decoded_characters[match.group(0)]
+
+        parameters = original.split("&")
+        for index, parameter in enumerate(parameters):
+            name, separator, value = parameter.partition("=")
+            if "%" in name:
+                parameters[index] = pattern.sub(decode, name) + separator + value
+        return "&".join(parameters)
+
+
+def _get_decoding_table(characters_to_decode: List[str]) -> Tuple[Pattern[str], Dict[str, str]]:
+    """Gets the pattern matching the percent-encodings of the characters to decode, with hex
+    digits in either case, and the characters by percent-encoding, built once per set of
+    characters."""
+    key = tuple(characters_to_decode)
+    table = _decoding_tables.get(key)
+    if table is None:
+        decoded_characters: Dict[str, str] = {}
+        for character in key:
+            hex_digits = f"{ord(character):02X}"
+            for digits in product(*({digit, digit.lower()} for digit in hex_digits)):
+                decoded_characters[f"%{''.join(digits)}"] = character
+        # Longer encodings first, so that e.g. %20AC is not matched as %20
+        pattern = re.compile(
+            "|".join(
+                re.escape(encoded) for encoded in sorted(decoded_characters, key=len, reverse=True)
+            )
+        )
+        table = _decoding_tables[key] = (pattern, decoded_characters)
+    return table
@@ -7,6 +7,7 @@ from opentelemetry.semconv.attributes.http_attributes import (
 )
 
 from .._exceptions import RedirectError
+from ..metrics import get_request_metric_attributes, http_client_metrics
 from .middleware import BaseMiddleware
 from .options import RedirectHandlerOption
 
@@ -70,6 +71,7 @@ class RedirectHandler(BaseMiddleware):
         _enable_span.end()
 
         max_redirect = current_options.max_redirect
+        metric_attributes = get_request_metric_attributes(request)
         history: typing.List[httpx.Request] = []
 
         while max_redirect >= 0:
@@ -87,6 +89,7 @@ class RedirectHandler(BaseMiddleware):
                 _redirect_span.set_attribute(REDIRECT_COUNT_KEY, len(history))
                 new_request = self._build_redirect_request(request, response, current_options)
                 history.append(request)
+                http_client_metrics.redirects.add(1, metric_attributes)
                 request = new_request
                 await response.aclose()
                 continue
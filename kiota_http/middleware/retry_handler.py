@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import random
 import time
@@ -10,6 +11,7 @@ from opentelemetry.semconv.attributes.http_attributes import (
     HTTP_RESPONSE_STATUS_CODE,
 )
 
+from ..metrics import get_request_metric_attributes, http_client_metrics
 from .middleware import BaseMiddleware
 from .options import RetryHandlerOption
 
@@ -77,12 +79,13 @@ class RetryHandler(BaseMiddleware):
         _span.set_attribute("com.microsoft.kiota.handler.retry.enable", True)
         _span.end()
         retry_valid = current_options.should_retry
+        metric_attributes = get_request_metric_attributes(request)
         max_delay = current_options.max_delay
         _retry_span = self._create_observability_span(
             request, f"RetryHandler_send - attempt {retry_count}"
         )
         while retry_valid:
-            start_time = time.time()
+            start_time = time.monotonic()
             response = await super().send(request, transport)
             _retry_span.set_attribute(HTTP_RESPONSE_STATUS_CODE, response.status_code)
             # check that max retries has not been hit
@@ -95,11 +98,11 @@ class RetryHandler(BaseMiddleware):
             # and status code
             should_retry = self.should_retry(request, current_options, response)
             if all([should_retry, retry_valid, delay < max_delay]):
-                time.sleep(delay)
-                end_time = time.time()
-                max_delay -= (end_time - start_time)
+                await asyncio.sleep(delay)
+                max_delay -= (time.monotonic() - start_time)
                 # increment the count for retries
                 retry_count += 1
+                http_client_metrics.retries.add(1, metric_attributes)
                 request.headers.update({'retry-attempt': f'{retry_count}'})
                 _retry_span.set_attribute('http.request.resend_count', retry_count)
                 continue
@@ -174,7 +177,7 @@ class RetryHandler(BaseMiddleware):
         Respects a retry-after header in the response if provided
         If no retry-after response header, it defaults to exponential backoff
         """
-        retry_after = self._get_retry_after(response)
+        retry_after = self._get_retry_after(response) if response is not None else None
         if retry_after:
             return retry_after
         return self._get_delay_time_exp_backoff(retry_count)
@@ -35,16 +35,30 @@ class UrlReplaceHandler(BaseMiddleware):
         _enable_span = self._create_observability_span(request, "UrlReplaceHandler_send")
         if self.options and self.options.is_enabled:
             _enable_span.set_attribute("com.microsoft.kiota.handler.url_replacer.enable", True)
-            current_options = self._get_current_options(request)
-
-            url_string: str = str(request.url)  # type: ignore
-            url_string = self.replace_url_segment(url_string, current_options)
-            request.url = httpx.URL(url_string)
-            _enable_span.set_attribute(URL_FULL, str(request.url))
+            _enable_span.set_attribute(URL_FULL, self.replace_request_url(request))
         response = await super().send(request, transport)
         _enable_span.end()
         return response
 
+    def replace_request_url(self, request: httpx.Request) -> str:
+        """Replaces the segments of the request url, with the options of the request if any.
+
+        Args:
+            request (httpx.Request): The prepared request object
+
+        Returns:
+            str: The url of the request.
+        """
+        url_string: str = str(request.url)  # type: ignore
+        if self.options and self.options.is_enabled:
+            current_options = self._get_current_options(request)
+            replaced_url_string = self.replace_url_segment(url_string, current_options)
+            # The URL is only parsed again when a segment was replaced
+            if replaced_url_string != url_string:
+                request.url = httpx.URL(replaced_url_string)
+                url_string = str(request.url)
+        return url_string
+
     def _get_current_options(self, request: httpx.Request) -> UrlReplaceHandlerOption:
         """Returns the options to use for the request.Overries default options if
         request options are passed.
@@ -64,7 +78,8 @@ class UrlReplaceHandler(BaseMiddleware):
         return self.options
 
     def replace_url_segment(self, url_str: str, current_options: UrlReplaceHandlerOption) -> str:
-        if all([current_options, current_options.is_enabled, current_options.replacement_pairs]):
-            for k, v in current_options.replacement_pairs.items():
-                url_str = url_str.replace(k, v, 1)
+        if current_options and current_options.is_enabled:
+            rewrite_engine = current_options.rewrite_engine
+            if not rewrite_engine.is_empty:
+                return rewrite_engine.rewrite(url_str)
         return url_str
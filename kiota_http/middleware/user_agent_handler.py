@@ -23,8 +23,7 @@ class UserAgentHandler(BaseMiddleware):
         _span = self._create_observability_span(request, "UserAgentHandler_send")
         if current_options and current_options.is_enabled:
             _span.set_attribute("com.microsoft.kiota.handler.useragent.enable", True)
-            value = f"{self.options.product_name}/{self.options.product_version}"
-            self._update_user_agent(request, value)
+            self._update_user_agent(request, current_options.product_token)
         _span.end()
         return await super().send(request, transport)
 
@@ -48,9 +47,8 @@ class UserAgentHandler(BaseMiddleware):
 
     def _update_user_agent(self, request: Request, value: str):
         """Updates the values of the User-Agent header."""
-        user_agent = request.headers.get("User-Agent", "")
+        user_agent = request.headers.get("User-Agent")
         if not user_agent:
-            request.headers.update({"User-Agent": value})
-        else:
-            if value not in user_agent:
-                request.headers.update({"User-Agent": f"{user_agent} {value}"})
+            request.headers["User-Agent"] = value
+        elif value not in user_agent:
+            request.headers["User-Agent"] = f"{user_agent} {value}"
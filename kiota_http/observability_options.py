@@ -6,16 +6,25 @@ class ObservabilityOptions(RequestOption):
     """Defines the metrics, tracing and logging configurations."""
     OBSERVABILITY_OPTION_KEY = "ObservabilityOptionKey"
 
-    def __init__(self, enabled: bool = True, include_euii_attributes: bool = True) -> None:
+    def __init__(
+        self,
+        enabled: bool = True,
+        include_euii_attributes: bool = True,
+        collapse_spans: bool = False,
+    ) -> None:
         """Initialize the observability options.
 
         Args:
             enabled(bool): whether to enable the ObservabilityOptions in the middleware chain.
             include_euii_attributes(bool): whether to include attributes that
                 could contain EUII information likr URLS.
+            collapse_spans(bool): whether the spans of the handlers and of the steps of a
+                request are recorded as attributes and events of the request span, so that a
+                request produces a single span.
         """
         self._enabled = enabled
         self._include_euii_attributes = include_euii_attributes
+        self._collapse_spans = collapse_spans
 
     @property
     def enabled(self) -> bool:
@@ -37,6 +46,16 @@ class ObservabilityOptions(RequestOption):
         """Sets whether to include EUII attributes."""
         self._include_euii_attributes = value
 
+    @property
+    def collapse_spans(self) -> bool:
+        """Returns whether child spans are collapsed into the request span."""
+        return self._collapse_spans
+
+    @collapse_spans.setter
+    def collapse_spans(self, value: bool) -> None:
+        """Sets whether child spans are collapsed into the request span."""
+        self._collapse_spans = value
+
     @staticmethod
     def get_key() -> str:
         """The middleware key name."""
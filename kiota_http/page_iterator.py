@@ -0,0 +1,182 @@
+"""Iterates over the pages of a collection response by following its next links."""
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+
+from kiota_abstractions.headers_collection import HeadersCollection
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import ParsableFactory
+
+if TYPE_CHECKING:
+    from .httpx_request_adapter import HttpxRequestAdapter
+
+# Marks the end of the pages in the prefetch queue
+_END_OF_PAGES = object()
+# Header set by authentication providers, which have to authenticate every page on its own
+AUTHORIZATION_HEADER = "Authorization"
+
+
+class PageIterator():
+    """Asynchronously iterates over the pages of a collection response.
+
+    The next link of each page is followed until a page without one is reached. The delta link
+    of the last page, if any, is exposed once the iteration completed. While a page is being
+    consumed, up to prefetch_depth following pages are requested in the background so that
+    downloading and processing overlap. Closing the iterator cancels the pending requests.
+    """
+    NEXT_LINK_ATTRIBUTE = "odata_next_link"
+    NEXT_LINK_KEY = "@odata.nextLink"
+    DELTA_LINK_ATTRIBUTE = "odata_delta_link"
+    DELTA_LINK_KEY = "@odata.deltaLink"
+    VALUE_ATTRIBUTE = "value"
+
+    # Default number of pages requested ahead of the page being consumed
+    DEFAULT_PREFETCH_DEPTH = 1
+
+    def __init__(
+        self,
+        request_adapter: "HttpxRequestAdapter",
+        request_info: RequestInformation,
+        parsable_factory: ParsableFactory,
+        error_map: Dict[str, ParsableFactory],
+        prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+    ) -> None:
+        """Creates an instance of PageIterator
+
+        Args:
+            request_adapter (HttpxRequestAdapter): The adapter to send the page requests with.
+            request_info (RequestInformation): The request for the first page. Its headers, as
+            they are before the request is authenticated and without Authorization, and its
+            request options are applied to the next page requests.
+            parsable_factory (ParsableFactory): The class of the page model.
+            error_map (Dict[str, ParsableFactory]): The error dict to use in case of a failed
+            request.
+            prefetch_depth (int, optional): The number of pages requested ahead of the page
+            being consumed, 0 to request each page when it is consumed. Defaults to 1.
+        """
+        if not request_info:
+            raise ValueError("Request info cannot be null")
+        if prefetch_depth < 0:
+            raise ValueError("prefetch_depth should not be negative")
+        self._request_adapter = request_adapter
+        self._request_info = request_info
+        # Copied before the first request is sent, so that the headers added by the
+        # authentication provider for its host are not sent to the hosts of the next links
+        self._headers = HeadersCollection()
+        self._headers.add_all(request_info.headers)
+        self._headers.remove(AUTHORIZATION_HEADER)
+        self._parsable_factory = parsable_factory
+        self._error_map = error_map
+        self._prefetch_depth = prefetch_depth
+        self._next_request: Optional[RequestInformation] = request_info
+        self._delta_link: Optional[str] = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._prefetch_slots: Optional[asyncio.Semaphore] = None
+        self._producer: Optional[asyncio.Future] = None
+
+    @property
+    def delta_link(self) -> Optional[str]:
+        """Gets the delta link returned with the last page, to request the changes made
+        after the iteration.
+
+        Returns:
+            Optional[str]: The delta link
+        """
+        return self._delta_link
+
+    def __aiter__(self) -> "PageIterator":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._prefetch_depth == 0:
+            if self._next_request is None:
+                raise StopAsyncIteration
+            return await self._get_page(self._next_request)
+
+        if self._pages is None:
+            self._pages = asyncio.Queue()
+            self._prefetch_slots = asyncio.Semaphore(self._prefetch_depth)
+            self._producer = asyncio.ensure_future(
+                self._produce_pages(self._pages, self._prefetch_slots)
+            )
+        try:
+            page = await self._pages.get()
+        except asyncio.CancelledError:
+            await self.aclose()
+            raise
+        if self._prefetch_slots is not None:
+            self._prefetch_slots.release()
+        if page is _END_OF_PAGES:
+            raise StopAsyncIteration
+        if isinstance(page, Exception):
+            await self.aclose()
+            raise page
+        return page
+
+    async def __aenter__(self) -> "PageIterator":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stops the iteration and cancels the pending page requests."""
+        self._next_request = None
+        producer, self._producer = self._producer, None
+        if producer is not None and not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+        if self._pages is not None:
+            # Unblock consumers waiting for a page that will never be requested
+            while not self._pages.empty():
+                self._pages.get_nowait()
+            self._pages.put_nowait(_END_OF_PAGES)
+
+    async def iterate_items(self) -> AsyncIterator[Any]:
+        """Iterates over the items in the value of each page.
+
+        Yields:
+            Any: The items of the collection.
+        """
+        async for page in self:
+            for item in getattr(page, self.VALUE_ATTRIBUTE, None) or []:
+                yield item
+
+    async def _produce_pages(self, pages: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        # A slot is taken before a page is requested and given back once it is consumed, so
+        # that at most prefetch_depth pages are requested or waiting to be consumed
+        try:
+            while self._next_request is not None:
+                await slots.acquire()
+                pages.put_nowait(await self._get_page(self._next_request))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            pages.put_nowait(error)
+            return
+        pages.put_nowait(_END_OF_PAGES)
+
+    async def _get_page(self, request_info: RequestInformation) -> Any:
+        page = await self._request_adapter.send_async(
+            request_info, self._parsable_factory, self._error_map
+        )
+        next_link = self._get_link(page, self.NEXT_LINK_ATTRIBUTE, self.NEXT_LINK_KEY)
+        self._next_request = self._get_next_request(next_link) if next_link else None
+        if self._next_request is None:
+            self._delta_link = self._get_link(page, self.DELTA_LINK_ATTRIBUTE, self.DELTA_LINK_KEY)
+        return page
+
+    def _get_next_request(self, next_link: str) -> RequestInformation:
+        next_request = RequestInformation(Method.GET, path_parameters={})
+        next_request.url = next_link
+        next_request.headers.add_all(self._headers)
+        next_request.add_request_options(list(self._request_info.request_options.values()))
+        return next_request
+
+    @staticmethod
+    def _get_link(page: Any, attribute: str, key: str) -> Optional[str]:
+        if page is None:
+            return None
+        link = getattr(page, attribute, None)
+        if link:
+            return link
+        additional_data = getattr(page, "additional_data", None) or {}
+        return additional_data.get(key)
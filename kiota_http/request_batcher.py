@@ -0,0 +1,434 @@
+"""Aggregates requests issued within a short window into JSON batch requests."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import httpx
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from opentelemetry import trace
+
+from ._exceptions import ResponseError
+from .middleware import RetryHandler
+from .middleware.options import RetryHandlerOption
+
+if TYPE_CHECKING:
+    from .httpx_request_adapter import HttpxRequestAdapter
+
+JSON_CONTENT_TYPE = "application/json"
+FAILED_DEPENDENCY_STATUS_CODE = 424
+BATCH_ITEM_EXCLUDED_HEADERS = frozenset(
+    [
+        "accept-encoding",
+        "authorization",
+        "connection",
+        "content-length",
+        "host",
+        "transfer-encoding",
+        "user-agent",
+    ]
+)
+
+
+class BatchRequestItem():
+    """A request to send as part of a batch along with the requests it depends on."""
+
+    def __init__(
+        self,
+        request_information: RequestInformation,
+        depends_on: Optional[List[BatchRequestItem]] = None,
+    ) -> None:
+        """Creates an instance of BatchRequestItem
+
+        Args:
+            request_information (RequestInformation): The request to send.
+            depends_on (Optional[List[BatchRequestItem]], optional): The items that have to
+            complete before this one is executed. They are sent in the same batch request.
+        """
+        self.request_information = request_information
+        self.depends_on: List[BatchRequestItem] = depends_on or []
+
+
+class RequestBatcher():
+    """Collects the requests sent through a request adapter within a short window and sends
+    them as a single JSON batch request, fanning the batch response back out to the callers.
+    """
+
+    # Default number of seconds to wait for more requests before sending a batch
+    DEFAULT_BATCH_WINDOW: float = 0.01
+
+    # The maximum number of requests a JSON batch request can hold
+    MAX_BATCH_SIZE: int = 20
+
+    def __init__(
+        self,
+        request_adapter: HttpxRequestAdapter,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        batch_url: Optional[str] = None,
+    ) -> None:
+        """Creates an instance of RequestBatcher
+
+        Args:
+            request_adapter (HttpxRequestAdapter): The adapter used to build and send requests.
+            batch_window (float, optional): Seconds to wait for more requests before sending
+            a batch. Defaults to 0.01.
+            max_batch_size (int, optional): The maximum number of requests per batch.
+            Defaults to 20.
+            batch_url (Optional[str], optional): The url of the batch endpoint.
+            Defaults to the $batch endpoint under the adapter base url.
+        """
+        if batch_window < 0:
+            raise ValueError("batch_window should not be negative")
+        if not 1 <= max_batch_size <= self.MAX_BATCH_SIZE:
+            raise ValueError(f"max_batch_size should be between 1 and {self.MAX_BATCH_SIZE}")
+        self._request_adapter = request_adapter
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._batch_url = batch_url
+        self._pending: List[Tuple[RequestInformation, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches_in_flight: Set[asyncio.Future] = set()
+
+    @property
+    def base_url(self) -> str:
+        """The url the batch item urls are relative to."""
+        return self._request_adapter.base_url.rstrip("/")
+
+    @property
+    def batch_url(self) -> str:
+        """The url of the batch endpoint."""
+        return self._batch_url or f"{self.base_url}/$batch"
+
+    def is_batchable(self, request_info: RequestInformation) -> bool:
+        """Whether the request can be sent as part of a batch request.
+
+        Args:
+            request_info (RequestInformation): The request to check.
+
+        Returns:
+            bool: True if the request targets the base url and has an in memory body.
+        """
+        if not self.base_url or not isinstance(request_info.content, (bytes, type(None))):
+            return False
+        url = request_info.url
+        return url.startswith(f"{self.base_url}/") and not url.startswith(self.batch_url)
+
+    async def send_async(self, request_info: RequestInformation) -> httpx.Response:
+        """Queues the request for the next batch and returns its response once the batch
+        completes.
+
+        Args:
+            request_info (RequestInformation): The request to send.
+
+        Returns:
+            httpx.Response: The response of the request extracted from the batch response.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request_info, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._batch_window, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self._max_batch_size]
+            del self._pending[:self._max_batch_size]
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._batches_in_flight.add(task)
+            task.add_done_callback(self._batches_in_flight.discard)
+
+    async def _send_batch(self, batch: List[Tuple[RequestInformation, asyncio.Future]]) -> None:
+        try:
+            responses = await self.send_batch_requests([request_info for request_info, _ in batch])
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), response in zip(batch, responses):
+            if future.done():
+                continue
+            if isinstance(response, Exception):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+    async def execute_async(
+        self,
+        items: Sequence[Union[RequestInformation, BatchRequestItem]],
+        max_concurrency: int = 1,
+        retry_option: Optional[RetryHandlerOption] = None,
+    ) -> List[httpx.Response]:
+        """Sends the requests as batch requests of at most max_batch_size requests each.
+
+        Requests depending on each other are kept in the same batch request. Sub-requests
+        answered with a retryable status code are retried on their own, honoring their
+        Retry-After header, without resending the ones that succeeded.
+
+        Args:
+            items (Sequence[Union[RequestInformation, BatchRequestItem]]): The requests to send.
+            max_concurrency (int, optional): The maximum number of batch requests in flight.
+            Defaults to 1.
+            retry_option (Optional[RetryHandlerOption], optional): The retry policy applied
+            to the sub-requests. Defaults to RetryHandlerOption().
+
+        Returns:
+            List[httpx.Response]: The response of every request, in the order of the items.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be greater than zero")
+        batch_items = [
+            item if isinstance(item, BatchRequestItem) else BatchRequestItem(item) for item in items
+        ]
+        indexes = {id(item): index for index, item in enumerate(batch_items)}
+        dependencies: List[List[int]] = []
+        for item in batch_items:
+            if any(id(dependency) not in indexes for dependency in item.depends_on):
+                raise ValueError("Batch items can only depend on items of the same batch")
+            dependencies.append([indexes[id(dependency)] for dependency in item.depends_on])
+
+        request_infos = [item.request_information for item in batch_items]
+        responses: List[Optional[httpx.Response]] = [None] * len(request_infos)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        retry_option = retry_option or RetryHandlerOption()
+
+        async def send_chunk(chunk: List[int]) -> None:
+            async with semaphore:
+                await self._send_chunk_with_retries(
+                    chunk, request_infos, dependencies, responses, retry_option
+                )
+
+        await asyncio.gather(
+            *(send_chunk(chunk) for chunk in self._get_chunks(dependencies, self._max_batch_size))
+        )
+        return responses  # type: ignore
+
+    async def _send_chunk_with_retries(
+        self,
+        chunk: List[int],
+        request_infos: List[RequestInformation],
+        dependencies: List[List[int]],
+        responses: List[Optional[httpx.Response]],
+        retry_option: RetryHandlerOption,
+    ) -> None:
+        retry_handler = RetryHandler(retry_option)
+        retry_count = 0
+        max_delay = retry_option.max_delay
+        while chunk:
+            start_time = time.monotonic()
+            chunk_responses = await self.send_batch_requests(
+                [request_infos[index] for index in chunk],
+                self._get_chunk_dependencies(chunk, dependencies),
+            )
+            for index, response in zip(chunk, chunk_responses):
+                if isinstance(response, Exception):
+                    raise response
+                responses[index] = response
+            retryable = self._get_retryable_requests(
+                chunk, chunk_responses, dependencies, retry_handler.retry_on_status_codes
+            )
+
+            if not retryable or not retry_handler.check_retry_valid(retry_count, retry_option):
+                return
+            delay = max(
+                retry_handler.get_delay_time(retry_count, responses[index]) for index in retryable
+            )
+            if not retry_option.should_retry or delay >= max_delay:
+                return
+            await asyncio.sleep(delay)
+            max_delay -= time.monotonic() - start_time
+            retry_count += 1
+            chunk = [index for index in chunk if index in retryable]
+
+    @staticmethod
+    def _get_chunk_dependencies(chunk: List[int], dependencies: List[List[int]]) -> List[List[int]]:
+        """Maps the dependencies of the chunk requests to their position in the chunk,
+        dropping the ones outside of it as they have already completed."""
+        positions = {index: position for position, index in enumerate(chunk)}
+        return [
+            [
+                positions[dependency] for dependency in dependencies[index]
+                if dependency in positions
+            ] for index in chunk
+        ]
+
+    @staticmethod
+    def _get_retryable_requests(
+        chunk: List[int],
+        chunk_responses: List[httpx.Response],
+        dependencies: List[List[int]],
+        retry_status_codes: Set[int],
+    ) -> Set[int]:
+        retryable = {
+            index
+            for index, response in zip(chunk, chunk_responses)
+            if response.status_code in retry_status_codes
+        }
+        # Sub-requests that failed because a dependency is retried are retried with it
+        for index, response in zip(chunk, chunk_responses):
+            if response.status_code == FAILED_DEPENDENCY_STATUS_CODE and any(
+                dependency in retryable for dependency in dependencies[index]
+            ):
+                retryable.add(index)
+        return retryable
+
+    @staticmethod
+    def _get_chunks(dependencies: List[List[int]], max_batch_size: int) -> List[List[int]]:
+        """Groups the requests linked by dependencies and packs the groups into chunks of at
+        most max_batch_size requests."""
+        groups = list(range(len(dependencies)))
+
+        def find(index: int) -> int:
+            while groups[index] != index:
+                groups[index] = groups[groups[index]]
+                index = groups[index]
+            return index
+
+        for index, item_dependencies in enumerate(dependencies):
+            for dependency in item_dependencies:
+                groups[find(dependency)] = find(index)
+
+        members: Dict[int, List[int]] = {}
+        for index in range(len(dependencies)):
+            members.setdefault(find(index), []).append(index)
+
+        chunks: List[List[int]] = []
+        for group in members.values():
+            if len(group) > max_batch_size:
+                raise ValueError(
+                    f"{len(group)} requests depend on each other, "
+                    f"more than the {max_batch_size} a batch request can hold"
+                )
+            chunk = next(
+                (chunk for chunk in chunks if len(chunk) + len(group) <= max_batch_size), None
+            )
+            if chunk is None:
+                chunks.append(group)
+            else:
+                chunk.extend(group)
+        return [sorted(chunk) for chunk in chunks]
+
+    async def send_batch_requests(
+        self,
+        request_infos: List[RequestInformation],
+        depends_on: Optional[List[List[int]]] = None,
+    ) -> List[Any]:
+        """Sends the requests as a single batch request.
+
+        Only the batch request is authenticated, the requests it holds are not.
+
+        Args:
+            request_infos (List[RequestInformation]): The requests to send.
+            depends_on (Optional[List[List[int]]]): For every request, the indexes of the
+            requests of the batch it depends on.
+
+        Returns:
+            List[Any]: For every request, its httpx.Response or the exception raised when
+            reading it from the batch response.
+        """
+        if len(request_infos) == 1:
+            # Not worth the batch envelope
+            request = await self._request_adapter.convert_to_native_async(request_infos[0])
+            return [await self._request_adapter.send_native_async(request)]
+
+        requests = [self._build_request(request_info) for request_info in request_infos]
+        base_path = httpx.URL(self.base_url).raw_path.decode("ascii").rstrip("/")
+        items = []
+        for index, request in enumerate(requests):
+            item = self._get_batch_item(str(index), request, base_path)
+            if depends_on and depends_on[index]:
+                item["dependsOn"] = [str(dependency) for dependency in depends_on[index]]
+            items.append(item)
+
+        batch_request_info = RequestInformation(Method.POST, path_parameters={})
+        batch_request_info.url = self.batch_url
+        batch_request_info.headers.try_add("Content-Type", JSON_CONTENT_TYPE)
+        batch_request_info.content = json.dumps({"requests": items}).encode("utf-8")
+        batch_request = await self._request_adapter.convert_to_native_async(batch_request_info)
+        batch_response = await self._request_adapter.send_native_async(batch_request)
+        if not batch_response.is_success:
+            # Every caller gets to handle the failure with its own error mapping
+            return [batch_response] * len(requests)
+
+        items_by_id = {item.get("id"): item for item in batch_response.json().get("responses", [])}
+        return [
+            self._get_item_response(items_by_id.get(str(index)), request)
+            for index, request in enumerate(requests)
+        ]
+
+    def _build_request(self, request_info: RequestInformation) -> httpx.Request:
+        """Builds the native request of a batch item without authenticating it, with the url
+        the middleware of the client would send it to."""
+        self._request_adapter.set_base_url_for_request_information(request_info)
+        request = self._request_adapter.get_request_from_request_information(
+            request_info, trace.INVALID_SPAN, trace.INVALID_SPAN
+        )
+        self._request_adapter.rewrite_native_request_url(request)
+        return request
+
+    def _get_batch_item(self, item_id: str, request: httpx.Request,
+                        base_path: str) -> Dict[str, Any]:
+        # Both urls are normalized by httpx, so the path of the base url is a prefix of the
+        # request path whatever the case of the host, the port or the percent-encodings
+        path = request.url.raw_path.decode("ascii")
+        if not path.startswith(f"{base_path}/"):
+            raise ValueError(f"The url of {request.url} was rewritten outside of the base url")
+        item: Dict[str, Any] = {
+            "id": item_id,
+            "method": request.method,
+            "url": path[len(base_path):],
+        }
+        headers = {
+            key: value
+            for key, value in request.headers.items()
+            if key.lower() not in BATCH_ITEM_EXCLUDED_HEADERS
+        }
+        if headers:
+            item["headers"] = headers
+        if body := request.content:
+            if self._is_json(request.headers.get("Content-Type")):
+                item["body"] = json.loads(body)
+            else:
+                item["body"] = base64.b64encode(body).decode("ascii")
+        return item
+
+    def _get_item_response(self, item: Optional[Dict[str, Any]], request: httpx.Request) -> Any:
+        if item is None:
+            return ResponseError(f"The batch response has no response for {request.url}")
+        headers = httpx.Headers(item.get("headers") or {})
+        body = item.get("body")
+        content = b""
+        if isinstance(body, str) and not self._is_json(headers.get("Content-Type")):
+            try:
+                content = base64.b64decode(body, validate=True)
+            except (binascii.Error, ValueError):
+                content = body.encode("utf-8")
+        elif body is not None:
+            content = json.dumps(body).encode("utf-8")
+            headers.setdefault("Content-Type", JSON_CONTENT_TYPE)
+        return httpx.Response(
+            status_code=int(item.get("status", 500)),
+            headers=headers,
+            content=content,
+            request=request,
+        )
+
+    @staticmethod
+    def _is_json(content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        media_type = content_type.split(";")[0].strip().lower()
+        return media_type == JSON_CONTENT_TYPE or media_type.endswith("+json")
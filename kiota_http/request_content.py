@@ -0,0 +1,111 @@
+"""Streams file-backed and memory-backed request bodies without copying them."""
+import io
+import mmap
+import os
+from typing import IO, Any, AsyncIterator, Optional, Tuple, Union
+
+import httpx
+
+# Number of bytes sent per write
+SLICE_SIZE = 64 * 1024
+
+
+class BufferByteStream(httpx.AsyncByteStream):
+    """Streams a buffer, e.g. a memoryview, mmap or bytearray, in slices of the buffer itself
+    so that the body is never copied. The stream can be iterated again when the request is
+    retried or redirected."""
+
+    def __init__(self, buffer: Union[memoryview, mmap.mmap, bytearray]) -> None:
+        view = memoryview(buffer)
+        self._view = view if view.format == "B" and view.ndim == 1 else view.cast("B")
+
+    @property
+    def content_length(self) -> int:
+        """Gets the number of bytes in the stream
+
+        Returns:
+            int: The content length
+        """
+        return self._view.nbytes
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for start in range(0, self._view.nbytes, SLICE_SIZE):
+            yield self._view[start:start + SLICE_SIZE]
+
+
+class FileByteStream(httpx.AsyncByteStream):
+    """Streams a file from disk in slices. Files given by path are opened for each iteration,
+    open files are read from their position when the stream was created, so that the
+    stream can be iterated again when the request is retried or redirected."""
+
+    def __init__(self, file: Union[os.PathLike, IO[bytes]]) -> None:
+        self._file = file
+        if isinstance(file, os.PathLike):
+            self._offset = 0
+            self._content_length = os.stat(file).st_size
+        else:
+            self._offset = file.tell()
+            self._content_length = os.fstat(file.fileno()).st_size - self._offset
+
+    @property
+    def content_length(self) -> int:
+        """Gets the number of bytes in the stream
+
+        Returns:
+            int: The content length
+        """
+        return self._content_length
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if isinstance(self._file, os.PathLike):
+            with open(self._file, "rb") as file:
+                for chunk in self._read(file):
+                    yield chunk
+        else:
+            self._file.seek(self._offset)
+            for chunk in self._read(self._file):
+                yield chunk
+
+    def _read(self, file: IO[bytes]):
+        remaining = self._content_length
+        while remaining > 0:
+            chunk = file.read(min(SLICE_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+def get_request_stream(content: Any) -> Optional[Tuple[httpx.AsyncByteStream, int]]:
+    """Gets the stream to send request content that httpx would otherwise copy into memory
+    or reject, along with its length.
+
+    Files are streamed when given as an os.PathLike path, e.g. a pathlib.Path, or as an
+    open binary file. A str is sent as text, as it cannot be told apart from a text body.
+
+    Args:
+        content (Any): The request content.
+
+    Returns:
+        Optional[Tuple[httpx.AsyncByteStream, int]]: The stream and its length in bytes, None
+        for content httpx sends as is, e.g. bytes, str or asynchronous iterators.
+    """
+    if isinstance(content, io.BytesIO):
+        content = content.getbuffer()[content.tell():]
+    if isinstance(content, (memoryview, mmap.mmap, bytearray)):
+        buffer_stream = BufferByteStream(content)
+        return buffer_stream, buffer_stream.content_length
+    if isinstance(content, os.PathLike) or _is_file(content):
+        file_stream = FileByteStream(content)
+        return file_stream, file_stream.content_length
+    return None
+
+
+def _is_file(content: Any) -> bool:
+    if not (hasattr(content, "read") and hasattr(content, "seek")):
+        return False
+    try:
+        content.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+    return True
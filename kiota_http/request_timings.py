@@ -0,0 +1,176 @@
+"""Measures how long the phases of a request take, from authentication to deserialization."""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from opentelemetry import trace
+
+# Span event holding the durations of the phases of a request
+REQUEST_TIMINGS_EVENT = "com.microsoft.kiota.request_timings"
+# Prefix of the span event attributes holding the duration of each phase
+REQUEST_TIMINGS_ATTRIBUTE_PREFIX = "com.microsoft.kiota.request_timings."
+
+
+@dataclass
+class RequestTimings():
+    """The durations of the phases of a request in seconds, summed over retries and redirects.
+
+    Phases that were not observed are None, e.g. connect and tls when a pooled connection was
+    reused, or the connection phases when the transport does not support httpx trace
+    extensions.
+    """
+    authentication: Optional[float] = None
+    request_building: Optional[float] = None
+    middleware: Optional[float] = None
+    connection_acquisition: Optional[float] = None
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    time_to_first_byte: Optional[float] = None
+    body_download: Optional[float] = None
+    deserialization: Optional[float] = None
+    total: Optional[float] = None
+
+    def get_span_attributes(self) -> Dict[str, float]:
+        """Gets the observed durations as span event attributes.
+
+        Returns:
+            Dict[str, float]: The durations keyed by attribute name.
+        """
+        return {
+            f"{REQUEST_TIMINGS_ATTRIBUTE_PREFIX}{field.name}": value
+            for field in fields(self) if (value := getattr(self, field.name)) is not None
+        }
+
+
+class RequestTimer():
+    """Measures the phases of a request in flight.
+
+    The request adapter measures authentication, request building and deserialization, the
+    middleware transport measures the time spent in the middleware, and the connection phases
+    are measured through the httpx trace extension of the request.
+    """
+
+    # Phases stopped and started when httpcore starts an operation, and stopped when it
+    # completes or fails one
+    _TRACE_STARTED_STOPS = {
+        "connect_tcp": "connection_acquisition",
+        "connect_unix_socket": "connection_acquisition",
+        "send_request_headers": "connection_acquisition",
+    }
+    _TRACE_STARTED_STARTS = {
+        "connect_tcp": "connect",
+        "connect_unix_socket": "connect",
+        "start_tls": "tls",
+        "send_request_headers": "time_to_first_byte",
+        "receive_response_body": "body_download",
+    }
+    _TRACE_COMPLETED_STOPS = {
+        "connect_tcp": "connect",
+        "connect_unix_socket": "connect",
+        "start_tls": "tls",
+        "receive_response_headers": "time_to_first_byte",
+        "receive_response_body": "body_download",
+    }
+
+    def __init__(self) -> None:
+        """Creates an instance of RequestTimer, starting the measure of the whole request."""
+        self._created_at = time.perf_counter()
+        self._started_at: Dict[str, float] = {}
+        self._durations: Dict[str, float] = {}
+
+    def start(self, phase: str) -> None:
+        """Starts measuring a phase.
+
+        Args:
+            phase (str): The name of the phase, a RequestTimings field for reported phases.
+        """
+        self._started_at[phase] = time.perf_counter()
+
+    def stop(self, phase: str) -> float:
+        """Stops measuring a phase, adding the time since it started to its duration.
+
+        Args:
+            phase (str): The name of the phase.
+
+        Returns:
+            float: The time since the phase started, 0 when it was not started.
+        """
+        started_at = self._started_at.pop(phase, None)
+        if started_at is None:
+            return 0.0
+        duration = time.perf_counter() - started_at
+        self._durations[phase] = self._durations.get(phase, 0.0) + duration
+        return duration
+
+    def cancel(self, phase: str) -> None:
+        """Stops measuring a phase without adding to its duration, e.g. when the end of the phase
+        was not observed.
+
+        Args:
+            phase (str): The name of the phase.
+        """
+        self._started_at.pop(phase, None)
+
+    def add(self, phase: str, duration: float) -> None:
+        """Adds to the duration of a phase measured elsewhere.
+
+        Args:
+            phase (str): The name of the phase.
+            duration (float): The time to add in seconds.
+        """
+        self._durations[phase] = self._durations.get(phase, 0.0) + duration
+
+    def get_duration(self, phase: str) -> float:
+        """Gets the duration of a phase so far.
+
+        Args:
+            phase (str): The name of the phase.
+
+        Returns:
+            float: The duration in seconds, 0 for phases not measured.
+        """
+        return self._durations.get(phase, 0.0)
+
+    def get_timings(self) -> RequestTimings:
+        """Gets the durations of the phases measured so far.
+
+        Returns:
+            RequestTimings: The durations, the total being the time since the timer was created.
+        """
+        timings = RequestTimings(total=time.perf_counter() - self._created_at)
+        for field in fields(timings):
+            if field.name in self._durations:
+                setattr(timings, field.name, self._durations[field.name])
+        return timings
+
+    async def trace(self, event_name: str, _info: Dict[str, Any]) -> None:
+        """The httpx trace extension callback measuring the connection phases.
+
+        Args:
+            event_name (str): The httpcore event, e.g. connection.connect_tcp.started.
+            _info (Dict[str, Any]): The event details.
+        """
+        name, _, state = event_name.partition(".")[2].rpartition(".")
+        if state == "started":
+            if stopped_phase := self._TRACE_STARTED_STOPS.get(name):
+                self.stop(stopped_phase)
+            if started_phase := self._TRACE_STARTED_STARTS.get(name):
+                self.start(started_phase)
+        elif completed_phase := self._TRACE_COMPLETED_STOPS.get(name):
+            self.stop(completed_phase)
+
+
+# The timer of the request the middleware transport is sending, None when it is not timed
+current_request_timer: ContextVar[Optional[RequestTimer]]
+current_request_timer = ContextVar("current_request_timer", default=None)
+
+
+def add_timings_event(span: trace.Span, timings: RequestTimings) -> None:
+    """Adds the durations of the phases of a request to its span as an event.
+
+    Args:
+        span (trace.Span): The span of the request.
+        timings (RequestTimings): The durations.
+    """
+    span.add_event(REQUEST_TIMINGS_EVENT, timings.get_span_attributes())
@@ -0,0 +1,218 @@
+"""Streams response bodies in chunks without buffering the whole payload."""
+import inspect
+import os
+import re
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Callable, Dict, Optional, Union
+
+import httpx
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import ParsableFactory
+from opentelemetry import trace
+
+from ._exceptions import ResponseError
+
+if TYPE_CHECKING:
+    from .httpx_request_adapter import HttpxRequestAdapter
+
+# Called with the number of bytes received so far and the total size, if known
+ProgressCallback = Callable[[int, Optional[int]], Any]
+
+CONTENT_RANGE_REGEX = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+RESUME_ATTEMPT_EVENT_KEY = "com.microsoft.kiota.download.resumed"
+
+
+class ResponseStream():
+    """Streams the body of the response to a request in chunks.
+
+    When the connection fails after part of the body was received, the download is resumed
+    with a range request for the remaining bytes. An If-Range validator taken from the first
+    response ensures that the remaining bytes belong to the same content. Bodies with a
+    Content-Encoding are not resumed since ranges apply to the encoded bytes.
+    """
+    RANGE_HEADER = "Range"
+    IF_RANGE_HEADER = "If-Range"
+
+    # Default number of bytes per chunk
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    # Default number of times a failed download is resumed
+    DEFAULT_MAX_RESUME_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        request_adapter: "HttpxRequestAdapter",
+        request_info: RequestInformation,
+        error_map: Dict[str, ParsableFactory],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_resume_attempts: int = DEFAULT_MAX_RESUME_ATTEMPTS,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> None:
+        """Creates an instance of ResponseStream
+
+        Args:
+            request_adapter (HttpxRequestAdapter): The adapter to send the requests with.
+            request_info (RequestInformation): The request to stream the response of.
+            error_map (Dict[str, ParsableFactory]): The error dict to use in case of a
+            failed request.
+            chunk_size (int, optional): The number of bytes per chunk. Defaults to 64 KiB.
+            max_resume_attempts (int, optional): The number of times the download is resumed
+            after a transient failure. Defaults to 3.
+            progress_callback (Optional[ProgressCallback]): Called with the number of bytes
+            received and the total size, if known, after each chunk.
+        """
+        if not request_info:
+            raise ValueError("Request info cannot be null")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size should be greater than zero")
+        if max_resume_attempts < 0:
+            raise ValueError("max_resume_attempts should not be negative")
+        self._request_adapter = request_adapter
+        self._request_info = request_info
+        self._error_map = error_map
+        self._parent_span: trace.Span = trace.INVALID_SPAN
+        self._chunk_size = chunk_size
+        self._max_resume_attempts = max_resume_attempts
+        self._progress_callback = progress_callback
+        self._received = 0
+        self._total: Optional[int] = None
+        self._validator: Optional[str] = None
+        # Offsets of encoded bodies are not offsets of the content, they cannot be resumed
+        self._encoded = False
+
+    async def iterate_chunks(self, parent_span: trace.Span) -> AsyncGenerator[bytes, None]:
+        """Iterates over the chunks of the response body.
+
+        Args:
+            parent_span (trace.Span): The span of the download.
+
+        Yields:
+            bytes: The next chunk of the body.
+        """
+        self._parent_span = parent_span
+        chunks = self._iterate_attempts()
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            # Close explicitly so that the response is released when the iteration stops early
+            await chunks.aclose()
+            self._request_info.headers.remove(self.RANGE_HEADER)
+            self._request_info.headers.remove(self.IF_RANGE_HEADER)
+
+    async def _iterate_attempts(self) -> AsyncGenerator[bytes, None]:
+        attempts = 0
+        while True:
+            response = None
+            try:
+                response = await self._send()
+                skip = await self._get_bytes_to_skip(response)
+                async for chunk in response.aiter_bytes(self._chunk_size):
+                    if skip:
+                        skipped = min(skip, len(chunk))
+                        skip -= skipped
+                        chunk = chunk[skipped:]
+                        if not chunk:
+                            continue
+                    self._received += len(chunk)
+                    if self._progress_callback:
+                        self._progress_callback(self._received, self._total)
+                    yield chunk
+                return
+            except httpx.TransportError as error:
+                resumable = self._received == 0 or not self._encoded
+                if attempts >= self._max_resume_attempts or not resumable:
+                    raise
+                attempts += 1
+                self._parent_span.add_event(
+                    RESUME_ATTEMPT_EVENT_KEY, {
+                        "offset": self._received,
+                        "error": type(error).__name__
+                    }
+                )
+            finally:
+                if response is not None:
+                    await response.aclose()
+
+    async def write_to(
+        self, destination: Union[str, os.PathLike, int, Any], parent_span: trace.Span
+    ) -> int:
+        """Writes the response body to the destination chunk by chunk.
+
+        Args:
+            destination (Union[str, os.PathLike, int, Any]): A path to create or truncate, an
+            open file descriptor, a binary file object or an object with an asynchronous
+            write method.
+            parent_span (trace.Span): The span of the download.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, "wb") as file:
+                return await self.write_to(file, parent_span)
+        chunks = self.iterate_chunks(parent_span)
+        try:
+            async for chunk in chunks:
+                if isinstance(destination, int):
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(destination, view):]
+                    continue
+                result = destination.write(chunk)
+                if inspect.isawaitable(result):
+                    await result
+        finally:
+            await chunks.aclose()
+        return self._received
+
+    async def _send(self) -> httpx.Response:
+        request_info = self._request_info
+        request_info.headers.remove(self.RANGE_HEADER)
+        request_info.headers.remove(self.IF_RANGE_HEADER)
+        if self._received:
+            request_info.headers.try_add(self.RANGE_HEADER, f"bytes={self._received}-")
+            if self._validator:
+                request_info.headers.try_add(self.IF_RANGE_HEADER, self._validator)
+        response = await self._request_adapter.get_http_response_message(
+            request_info, self._parent_span, stream=True
+        )
+        if not response.is_success:
+            try:
+                await self._request_adapter.throw_failed_responses(
+                    response, self._error_map, self._parent_span, self._parent_span
+                )
+            except Exception:
+                await response.aclose()
+                raise
+        return response
+
+    async def _get_bytes_to_skip(self, response: httpx.Response) -> int:
+        """Gets the number of bytes of the response already received by earlier attempts."""
+        if not self._received:
+            self._encoded = "Content-Encoding" in response.headers
+            self._total = self._get_content_length(response)
+            etag = response.headers.get("ETag")
+            # Weak validators cannot be used in If-Range
+            if etag and not etag.startswith("W/"):
+                self._validator = etag
+            else:
+                self._validator = response.headers.get("Last-Modified")
+            return 0
+        if response.status_code == 206:
+            content_range = CONTENT_RANGE_REGEX.match(response.headers.get("Content-Range", ""))
+            if not content_range or int(content_range.group(1)) != self._received:
+                raise ResponseError("The resumed response does not start at the requested offset")
+            return 0
+        # The server ignored the range: the content either changed or ranges are not supported
+        etag = response.headers.get("ETag")
+        if self._validator and etag and etag != self._validator:
+            raise ResponseError("The content changed while it was being downloaded")
+        return self._received
+
+    @staticmethod
+    def _get_content_length(response: httpx.Response) -> Optional[int]:
+        if "Content-Encoding" in response.headers:
+            return None
+        content_length = response.headers.get("Content-Length")
+        return int(content_length) if content_length and content_length.isdigit() else None
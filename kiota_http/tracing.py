@@ -0,0 +1,89 @@
+"""Starts the child spans of a request within the span budget of the observability options."""
+from typing import Optional
+
+from opentelemetry import trace
+from opentelemetry.util import types
+
+
+class CollapsedSpan(trace.Span):
+    """A child span collapsed into its parent: attributes, events, exceptions and status are
+    recorded on the parent span, and ending the child leaves the parent running."""
+
+    def __init__(self, parent_span: trace.Span) -> None:
+        """Creates an instance of CollapsedSpan
+
+        Args:
+            parent_span (trace.Span): The span recording the child span.
+        """
+        self._parent_span = parent_span
+
+    @property
+    def parent_span(self) -> trace.Span:
+        """The span recording the child span."""
+        return self._parent_span
+
+    def end(self, end_time: Optional[int] = None) -> None:
+        pass
+
+    def get_span_context(self) -> trace.SpanContext:
+        return self._parent_span.get_span_context()
+
+    def set_attributes(self, attributes: types.Attributes) -> None:
+        self._parent_span.set_attributes(attributes)  # type: ignore[arg-type]
+
+    def set_attribute(self, key: str, value: types.AttributeValue) -> None:
+        self._parent_span.set_attribute(key, value)
+
+    def add_event(
+        self,
+        name: str,
+        attributes: types.Attributes = None,
+        timestamp: Optional[int] = None,
+    ) -> None:
+        self._parent_span.add_event(name, attributes, timestamp)
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return self._parent_span.is_recording()
+
+    def set_status(self, status, description: Optional[str] = None) -> None:
+        self._parent_span.set_status(status, description)
+
+    def record_exception(
+        self,
+        exception: BaseException,
+        attributes: types.Attributes = None,
+        timestamp: Optional[int] = None,
+        escaped: bool = False,
+    ) -> None:
+        self._parent_span.record_exception(exception, attributes, timestamp, escaped)
+
+
+def start_child_span(
+    tracer: trace.Tracer, name: str, parent_span: Optional[trace.Span], collapse_spans: bool
+) -> trace.Span:
+    """Starts a child span of a request span.
+
+    Nothing is allocated for parents that are not recording, e.g. because they were not
+    sampled, as their children would not be exported either.
+
+    Args:
+        tracer (trace.Tracer): The tracer starting the span.
+        name (str): The name of the span.
+        parent_span (Optional[trace.Span]): The span of the request.
+        collapse_spans (bool): Whether the child is recorded on its parent instead of being a
+        span of its own.
+
+    Returns:
+        trace.Span: The child span, a non-recording span when there is no parent span or it is
+        not recording.
+    """
+    if parent_span is None or not parent_span.is_recording():
+        return trace.INVALID_SPAN
+    if isinstance(parent_span, CollapsedSpan):
+        parent_span = parent_span.parent_span
+    if collapse_spans:
+        return CollapsedSpan(parent_span)
+    return tracer.start_span(name, trace.set_span_in_context(parent_span))
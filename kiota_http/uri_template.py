@@ -0,0 +1,256 @@
+"""Expands URI templates, and the URL of request information reusing the expansions of
+repeated parameters."""
+import re
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import quote
+
+from kiota_abstractions.request_information import RequestInformation
+from stduritemplate import StdUriTemplate
+
+# Maximum number of expanded URLs kept
+URL_EXPANSION_CACHE_SIZE = 1024
+# Maximum number of compiled URI templates kept
+COMPILED_TEMPLATE_CACHE_SIZE = 1024
+# Name of the private attribute holding a URL set on the request information
+_EXPLICIT_URL_ATTRIBUTE = "_RequestInformation__uri"
+
+# Variable names the compiled templates expand, names with modifiers are left to StdUriTemplate
+_VARIABLE_NAME_REGEX = re.compile(
+    r"(?:[A-Za-z0-9_]|%[0-9A-Fa-f]{2})+(?:\.(?:[A-Za-z0-9_]|%[0-9A-Fa-f]{2})+)*"
+)
+
+_expansions: Dict[Hashable, str] = {}
+_compiled_templates: Dict[str, Optional["CompiledUriTemplate"]] = {}
+
+
+class _Operator(NamedTuple):
+    """How the variables of an expression are expanded, as defined by RFC 6570."""
+    prefix: str
+    separator: str
+    named: bool
+    empty_value_assignment: bool
+    allow_reserved: bool
+
+
+_OPERATORS = {
+    "": _Operator("", ",", False, False, False),
+    "+": _Operator("", ",", False, False, True),
+    "#": _Operator("#", ",", False, False, True),
+    ".": _Operator(".", ".", False, False, False),
+    "/": _Operator("/", "/", False, False, False),
+    ";": _Operator(";", ";", True, False, False),
+    "?": _Operator("?", "&", True, True, False),
+    "&": _Operator("&", "&", True, True, False),
+}
+
+
+class _Expression(NamedTuple):
+    operator: _Operator
+    names: Tuple[str, ...]
+
+
+class CompiledUriTemplate():
+    """A URI template parsed once into its literal and variable segments.
+
+    Only expressions without value modifiers, with string, number, boolean or list values, are
+    expanded. Anything else is left to StdUriTemplate so that results and errors stay the
+    same.
+    """
+
+    def __init__(self, segments: List[Union[str, _Expression]]) -> None:
+        """Creates an instance of CompiledUriTemplate
+
+        Args:
+            segments (List[Union[str, _Expression]]): The literals and expressions.
+        """
+        self._segments = segments
+
+    @staticmethod
+    def compile(template: str) -> Optional["CompiledUriTemplate"]:
+        """Parses a URI template.
+
+        Args:
+            template (str): The URI template.
+
+        Returns:
+            Optional[CompiledUriTemplate]: The compiled template, None when the template uses
+            features that are not compiled or is invalid.
+        """
+        segments: List[Union[str, _Expression]] = []
+        position = 0
+        while position < len(template):
+            start = template.find("{", position)
+            literal = template[position:] if start == -1 else template[position:start]
+            if "}" in literal or "," in literal:
+                return None
+            if literal:
+                segments.append(_encode_literal(literal))
+            if start == -1:
+                break
+            end = template.find("}", start)
+            if end == -1:
+                return None
+            expression = _compile_expression(template[start + 1:end])
+            if expression is None:
+                return None
+            segments.append(expression)
+            position = end + 1
+        return CompiledUriTemplate(segments)
+
+    def expand(self, substitutions: Dict[str, Any]) -> Optional[str]:
+        """Expands the template.
+
+        Args:
+            substitutions (Dict[str, Any]): The values of the variables.
+
+        Returns:
+            Optional[str]: The expanded template, None when a value is not expanded by the
+            compiled template.
+        """
+        parts: List[str] = []
+        for segment in self._segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            operator = segment.operator
+            first = True
+            for name in segment.names:
+                value = substitutions.get(name)
+                if value is None:
+                    continue
+                if isinstance(value, list):
+                    if not value:
+                        continue
+                    encoded_values = [_encode_value(item, operator) for item in value]
+                else:
+                    encoded_values = [_encode_value(value, operator)]
+                if None in encoded_values:
+                    return None
+                parts.append(operator.prefix if first else operator.separator)
+                first = False
+                if operator.named:
+                    parts.append(name)
+                    if operator.empty_value_assignment or encoded_values[0]:
+                        parts.append("=")
+                parts.append(",".join(encoded_values))  # type: ignore
+        return "".join(parts)
+
+
+def expand_uri_template(template: str, substitutions: Dict[str, Any]) -> str:
+    """Expands a URI template like StdUriTemplate.expand does, through the compiled template
+    cached for the template string.
+
+    Args:
+        template (str): The URI template.
+        substitutions (Dict[str, Any]): The values of the variables.
+
+    Returns:
+        str: The expanded template.
+    """
+    try:
+        compiled_template = _compiled_templates[template]
+    except KeyError:
+        compiled_template = CompiledUriTemplate.compile(template)
+        if len(_compiled_templates) >= COMPILED_TEMPLATE_CACHE_SIZE:
+            _compiled_templates.clear()
+        _compiled_templates[template] = compiled_template
+    if compiled_template is not None:
+        expanded = compiled_template.expand(substitutions)
+        if expanded is not None:
+            return expanded
+    return StdUriTemplate.expand(template, substitutions)
+
+
+def get_request_url(request_info: RequestInformation) -> str:
+    """Gets the URL of the request information, like RequestInformation.url does, expanding
+    its URL template only the first time the same template is used with the same parameters.
+
+    Args:
+        request_info (RequestInformation): The request information.
+
+    Returns:
+        str: The URL of the request.
+    """
+    if (
+        getattr(request_info, _EXPLICIT_URL_ATTRIBUTE, True)
+        or request_info.path_parameters.get(RequestInformation.RAW_URL_KEY)
+        or not request_info.url_template or request_info.query_parameters is None
+        or request_info.path_parameters is None
+    ):
+        return request_info.url
+
+    data: Dict[str, Any] = {}
+    for key, val in request_info.query_parameters.items():
+        data[key] = request_info._get_sanitized_value(val)  # pylint: disable=protected-access
+    for key, val in request_info.path_parameters.items():
+        data[key] = request_info._get_sanitized_value(val)  # pylint: disable=protected-access
+
+    cache_key = _get_cache_key(request_info.url_template, data)
+    if cache_key is None:
+        return expand_uri_template(request_info.url_template, data)
+    url = _expansions.get(cache_key)
+    if url is None:
+        url = expand_uri_template(request_info.url_template, data)
+        if len(_expansions) >= URL_EXPANSION_CACHE_SIZE:
+            _expansions.clear()
+        _expansions[cache_key] = url
+    return url
+
+
+def _get_cache_key(url_template: str, data: Dict[str, Any]) -> Optional[Hashable]:
+    """Gets the key of an expansion, None when a parameter value cannot be hashed. Values are
+    keyed with their type, as equal values of different types, e.g. True and 1, expand to
+    different URLs."""
+    cache_key: Tuple[Any, ...] = (
+        url_template,
+        *((key, _get_value_key(val)) for key, val in data.items()),
+    )
+    try:
+        hash(cache_key)
+    except TypeError:
+        return None
+    return cache_key
+
+
+def _get_value_key(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(_get_value_key(item) for item in value)
+    return type(value), value
+
+
+def _compile_expression(expression: str) -> Optional[_Expression]:
+    operator = _OPERATORS.get(expression[:1])
+    if operator is None:
+        operator = _OPERATORS[""]
+    else:
+        expression = expression[1:]
+    names = tuple(expression.split(","))
+    if not all(_VARIABLE_NAME_REGEX.fullmatch(name) for name in names):
+        return None
+    return _Expression(operator, names)
+
+
+def _encode_literal(literal: str) -> str:
+    if literal.isascii():
+        return literal
+    return "".join(
+        character if character.isascii() else quote(character, safe="") for character in literal
+    )
+
+
+def _encode_value(value: Any, operator: _Operator) -> Optional[str]:
+    """Encodes a value of a variable, None for values the compiled template leaves to
+    StdUriTemplate."""
+    if isinstance(value, str):
+        string_value = value
+    elif isinstance(value, bool):
+        string_value = "true" if value else "false"
+    elif isinstance(value, (int, float)):
+        string_value = str(value)
+    else:
+        return None
+    if not operator.allow_reserved:
+        return quote(string_value, safe="")
+    if string_value.isascii() and "%" not in string_value and " " not in string_value:
+        return string_value
+    return None
@@ -0,0 +1,160 @@
+"""Rewrites request urls with host, path prefix and segment rules compiled once."""
+import re
+from typing import Dict, Iterable, Match, Optional, Pattern
+
+# Splits a url into its scheme and authority, host and the rest of the url
+_URL_REGEX = re.compile(
+    r"(?P<authority>[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/?#]*@)?)(?P<host>\[[^\]]*\]|[^:/?#]*)"
+    r"(?P<rest>.*)",
+    re.DOTALL,
+)
+# Splits the rest of a url into its port and path, and its query and fragment
+_PATH_REGEX = re.compile(r"(?P<port>:[0-9]*)?(?P<path>[^?#]*)(?P<suffix>.*)", re.DOTALL)
+
+
+def compile_literals(literals: Iterable[str]) -> Optional[Pattern[str]]:
+    """Compiles literals into a single pattern built from their trie, so that a url is
+    scanned once whatever the number of literals, and the longest literal matching at a
+    position wins.
+
+    Args:
+        literals (Iterable[str]): The literals to match.
+
+    Returns:
+        Optional[Pattern[str]]: The pattern, None when there are no literals.
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        if not literal:
+            continue
+        node = trie
+        for character in literal:
+            node = node.setdefault(character, {})
+        node[""] = {}
+    if not trie:
+        return None
+    return re.compile(_get_trie_pattern(trie))
+
+
+def _get_trie_pattern(node: Dict[str, dict]) -> str:
+    # Longer literals are tried first, the end of a literal is the last alternative
+    alternatives = [
+        re.escape(character) + _get_trie_pattern(child)
+        for character, child in sorted(node.items()) if character
+    ]
+    if "" in node:
+        alternatives.append("")
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return "(?:" + "|".join(alternatives) + ")"
+
+
+class UrlRewriteEngine():
+    """Rewrites urls with rules compiled once, in a single scan per kind of rule.
+
+    Rules apply in a fixed order whatever the order they were given in:
+    - host rules replace the whole host, compared case-insensitively,
+    - path prefix rules replace the longest prefix of the path ending on a segment boundary,
+    - segment rules replace the first occurrence of each segment in the rewritten url,
+    scanning it from the left and preferring the longest segment at each position.
+    """
+
+    def __init__(
+        self,
+        replacement_pairs: Optional[Dict[str, str]] = None,
+        host_replacements: Optional[Dict[str, str]] = None,
+        path_prefix_replacements: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Creates an instance of UrlRewriteEngine
+
+        Args:
+            replacement_pairs (Optional[Dict[str, str]], optional): Segments of the url and
+            their replacement.
+            host_replacements (Optional[Dict[str, str]], optional): Hosts and their
+            replacement.
+            path_prefix_replacements (Optional[Dict[str, str]], optional): Path prefixes and
+            their replacement.
+        """
+        self._replacement_pairs = {
+            segment: replacement
+            for segment, replacement in (replacement_pairs or {}).items() if segment
+        }
+        self._segment_pattern = compile_literals(self._replacement_pairs)
+        self._host_replacements = {
+            host.lower(): replacement
+            for host, replacement in (host_replacements or {}).items()
+        }
+        self._path_prefix_replacements = {
+            prefix.rstrip("/"): replacement.rstrip("/")
+            for prefix, replacement in (path_prefix_replacements or {}).items()
+            if prefix.rstrip("/")
+        }
+        path_prefix_pattern = compile_literals(self._path_prefix_replacements)
+        self._path_prefix_pattern = re.compile(
+            f"{path_prefix_pattern.pattern}(?=/|$)"
+        ) if path_prefix_pattern else None
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the engine has no rules, so that urls are never rewritten
+
+        Returns:
+            bool: True when there are no rules
+        """
+        return not (self._segment_pattern or self._host_replacements or self._path_prefix_pattern)
+
+    def rewrite(self, url: str) -> str:
+        """Rewrites a url.
+
+        Args:
+            url (str): The url to rewrite.
+
+        Returns:
+            str: The rewritten url, the url itself when no rule applies.
+        """
+        if self._host_replacements or self._path_prefix_pattern:
+            url = self._rewrite_host_and_path(url)
+        if self._segment_pattern:
+            url = self._replace_segments(url)
+        return url
+
+    def _rewrite_host_and_path(self, url: str) -> str:
+        url_match = _URL_REGEX.match(url)
+        if not url_match:
+            return url
+        host, rest = url_match.group("host", "rest")
+        replaced_host = self._host_replacements.get(host.lower(), host)
+        replaced_rest = self._replace_path_prefix(rest) if self._path_prefix_pattern else rest
+        if replaced_host is host and replaced_rest is rest:
+            return url
+        return url_match.group("authority") + replaced_host + replaced_rest
+
+    def _replace_path_prefix(self, rest: str) -> str:
+        path_match = _PATH_REGEX.match(rest)
+        if path_match is None:
+            return rest
+        path = path_match.group("path")
+        prefix_match = self._path_prefix_pattern.match(path)  # type: ignore
+        if not prefix_match:
+            return rest
+        replacement = self._path_prefix_replacements[prefix_match.group(0)]
+        return (
+            (path_match.group("port") or "") + replacement + path[prefix_match.end():] +
+            path_match.group("suffix")
+        )
+
+    def _replace_segments(self, url: str) -> str:
+        if len(self._replacement_pairs) == 1:
+            # A plain replacement is faster than the pattern for a single segment
+            segment, replacement = next(iter(self._replacement_pairs.items()))
+            return url.replace(segment, replacement, 1)
+        replaced = set()
+
+        def replace(match: Match[str]) -> str:
+            segment = match.group(0)
+            if segment in replaced:
+                return segment
+            replaced.add(segment)
+            return self._replacement_pairs[segment]
+
+        return self._segment_pattern.sub(replace, url)  # type: ignore
@@ -1,10 +1,17 @@
+import asyncio
+
 import pytest
 import httpx
 
 from unittest.mock import AsyncMock
 
 from kiota_abstractions.headers_collection import HeadersCollection
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.kiota_client_factory import KiotaClientFactory
 from kiota_http.middleware.middleware import BaseMiddleware
+from kiota_http.headers_view import HeadersView
 from kiota_http.middleware.options.headers_inspection_handler_option import HeadersInspectionHandlerOption
 from kiota_http.middleware.headers_inspection_handler import HeadersInspectionHandler
 
@@ -65,3 +72,65 @@ async def test_headers_inspection_handler_gets_headers():
     assert not handler.options.request_headers.try_get('test_request') == {'test_request_header'}
     assert handler.options.request_headers.try_get('test_request_2') == {'test_request_header_2'}
     assert handler.options.response_headers.try_get('test_response') == {'test_response_header'}
+
+
+@pytest.mark.asyncio
+async def test_headers_inspection_handler_scopes_headers_to_concurrent_requests():
+
+    async def send(handler, transport, name):
+        request = httpx.Request('GET', 'https://localhost', headers={'request-name': name})
+        await handler.send(request, transport)
+        await asyncio.sleep(0)
+        return handler.options.request_headers.try_get('request-name')
+
+    handler = HeadersInspectionHandler()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    names = [f"request-{index}" for index in range(10)]
+    inspected = await asyncio.gather(*(send(handler, transport, name) for name in names))
+    assert inspected == [{name} for name in names]
+
+
+@pytest.mark.asyncio
+async def test_headers_inspection_handler_skips_disabled_inspection():
+    handler = HeadersInspectionHandler(
+        HeadersInspectionHandlerOption(
+            inspect_request_headers=False, inspect_response_headers=False
+        )
+    )
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, headers={'a': 'b'}))
+    request = httpx.Request('GET', 'https://localhost', headers={'c': 'd'})
+    await handler.send(request, transport)
+    assert handler.options.request_headers.count() == 0
+    assert handler.options.response_headers.count() == 0
+
+
+def test_headers_view_copies_headers_on_first_use():
+    headers = httpx.Headers([('a', '1'), ('a', '2'), ('B', '3')])
+    view = HeadersView(headers)
+    assert view._materialized_headers is None
+    assert view.try_get('A') == {'1, 2'}
+    assert view.try_get('b') == {'3'}
+    view.add('c', '4')
+    assert view.get_all() == {'a': {'1, 2'}, 'b': {'3'}, 'c': {'4'}}
+    assert 'c' not in headers
+
+
+@pytest.mark.asyncio
+async def test_headers_inspection_handler_stores_headers_on_request_options(auth_provider):
+    client = KiotaClientFactory.create_with_default_middleware(
+        httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(204, headers={'x-ms-request-id': 'abc'})
+            )
+        )
+    )
+    adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    option = HeadersInspectionHandlerOption()
+    request_info = RequestInformation(Method.GET, "https://localhost/users", {})
+    request_info.add_request_options([option])
+
+    # Sent in a task of its own, whose context the headers outlive
+    await asyncio.gather(adapter.send_no_response_content_async(request_info, {}))
+
+    assert option.response_headers.get_all() == {'x-ms-request-id': {'abc'}}
+    assert 'host' in option.request_headers.get_all()
@@ -75,3 +75,59 @@ async def test_decodes_query_parameter_names_only():
         mock_transport = httpx.MockTransport(request_handler)
         resp = await handler.send(request, mock_transport)
         assert str(resp.request.url) == decoded
+
+
+def test_decode_uri_encoded_string_leaves_values_matching_names_encoded():
+    """
+    Test that values equal to an encoded parameter name are not decoded
+    """
+    handler = ParametersNameDecodingHandler()
+    decoded = handler.decode_uri_encoded_string(
+        "api%2Dversion=api%2Dversion&%24filter=%24select%20eq%201&%24select", [".", "-", "$"]
+    )
+    assert decoded == "api-version=api%2Dversion&$filter=%24select%20eq%201&$select"
+
+
+def test_decode_uri_encoded_string_decodes_lower_case_encodings():
+    """
+    Test that percent-encodings are decoded regardless of the case of their hex digits
+    """
+    handler = ParametersNameDecodingHandler()
+    assert handler.decode_uri_encoded_string("subject%2ename=1&a%7eb",
+                                             [".", "~"]) == ("subject.name=1&a~b")
+
+
+def test_decode_uri_encoded_string_only_decodes_characters_to_decode():
+    """
+    Test that only the configured characters are decoded
+    """
+    handler = ParametersNameDecodingHandler()
+    assert handler.decode_uri_encoded_string("%24top%2D1%2Ex=5", ["-"]) == "%24top-1%2Ex=5"
+    assert handler.decode_uri_encoded_string("%24top%2D1%2Ex=5", []) == "%24top%2D1%2Ex=5"
+
+
+@pytest.mark.asyncio
+async def test_decodes_query_only():
+    """
+    Test that the path is left untouched when it contains the query
+    """
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    handler = ParametersNameDecodingHandler()
+    request = httpx.Request("GET", "http://localhost/%24top=1?%24top=1")
+
+    resp = await handler.send(request, transport)
+    assert str(resp.request.url) == "http://localhost/%24top=1?$top=1"
+
+
+@pytest.mark.asyncio
+async def test_keeps_url_without_encoded_parameter_names():
+    """
+    Test that the url is not rebuilt when no parameter name is decoded
+    """
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    handler = ParametersNameDecodingHandler()
+    request = httpx.Request("GET", "http://localhost?q=M%26A")
+    url = request.url
+
+    resp = await handler.send(request, transport)
+    assert resp.request.url is url
@@ -1,3 +1,4 @@
+import asyncio
 from email.utils import formatdate
 from time import time
 
@@ -264,3 +265,32 @@ async def test_retry_options_apply_per_request():
     assert resp.status_code == GATEWAY_TIMEOUT
     assert 'request_2' in resp.request.headers
     assert resp.request.headers[RETRY_ATTEMPT] == '2'
+
+
+@pytest.mark.asyncio
+async def test_retry_delay_does_not_block_event_loop(monkeypatch):
+    """Test that other requests progress while a request waits to be retried"""
+
+    def request_handler(request: httpx.Request):
+        if RETRY_ATTEMPT in request.headers:
+            return httpx.Response(200, )
+        return httpx.Response(TOO_MANY_REQUESTS)
+
+    # Without a Retry-After header the first retry waits half the backoff factor, without jitter
+    monkeypatch.setattr("kiota_http.middleware.retry_handler.random.randint", lambda a, b: 0)
+    handler = RetryHandler()
+    handler.backoff_factor = 0.4
+    mock_transport = httpx.MockTransport(request_handler)
+    retried_request = asyncio.create_task(
+        handler.send(httpx.Request('GET', BASE_URL), mock_transport)
+    )
+    await asyncio.sleep(0)
+
+    ticks = 0
+    while not retried_request.done():
+        ticks += 1
+        await asyncio.sleep(0.01)
+
+    assert retried_request.result().status_code == 200
+    # Blocking the event loop for the 0.2 second delay would leave a single tick
+    assert ticks > 10
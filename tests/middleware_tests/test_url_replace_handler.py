@@ -48,3 +48,83 @@ def test_replace_url_segment():
     assert handler.options.replacement_pairs
     assert handler.options.get_key() == "UrlReplaceHandlerOption"
     assert handler.replace_url_segment(ORIGINAL_URL, handler.options) == REPLACED_URL
+
+
+@pytest.mark.asyncio
+async def test_send_keeps_url_without_replacement():
+    """
+    Test that the url is not rebuilt when no segment is replaced
+    """
+    handler = UrlReplaceHandler(
+        options=UrlReplaceHandlerOption(replacement_pairs={"/users/unknown-id": "/me"})
+    )
+    request = httpx.Request("GET", ORIGINAL_URL)
+    url = request.url
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+    resp = await handler.send(request, transport)
+    assert resp.request.url is url
+
+
+@pytest.mark.asyncio
+async def test_send_replaces_url_segment():
+    """
+    Test that the request is sent to the url with the segments replaced
+    """
+    handler = UrlReplaceHandler(
+        options=UrlReplaceHandlerOption(replacement_pairs={"/users/user-id-to-replace": "/me"})
+    )
+    request = httpx.Request("GET", ORIGINAL_URL)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+    resp = await handler.send(request, transport)
+    assert str(resp.request.url) == REPLACED_URL
+
+
+def test_replace_url_segment_skips_empty_keys():
+    """
+    Test that empty keys are not replaced
+    """
+    handler = UrlReplaceHandler(options=UrlReplaceHandlerOption(replacement_pairs={"": "/me"}))
+    assert handler.replace_url_segment(ORIGINAL_URL, handler.options) == ORIGINAL_URL
+
+
+def test_replace_url_segment_with_host_and_path_prefix_rules():
+    """
+    Test that host and path prefix rules apply before segment rules
+    """
+    options = UrlReplaceHandlerOption(
+        replacement_pairs={"/users/user-id-to-replace": "/me"},
+        host_replacements={"graph.microsoft.com": "graph.microsoft.us"},
+        path_prefix_replacements={"/users/user-id-to-replace": "/users/other-id"},
+    )
+    handler = UrlReplaceHandler(options=options)
+
+    assert handler.replace_url_segment(ORIGINAL_URL, options
+                                       ) == ("https://graph.microsoft.us/users/other-id/messages")
+
+
+def test_rewrite_rules_are_compiled_when_set():
+    """
+    Test that the rewrite rules are compiled again when they are set
+    """
+    options = UrlReplaceHandlerOption()
+    handler = UrlReplaceHandler(options=options)
+    assert options.rewrite_engine.is_empty
+
+    options.replacement_pairs = {"/users/user-id-to-replace": "/me"}
+    assert handler.replace_url_segment(ORIGINAL_URL, options) == REPLACED_URL
+
+
+def test_rewrite_rules_are_compiled_when_modified_in_place():
+    """
+    Test that the rewrite rules are compiled again when their dictionaries are modified
+    """
+    options = UrlReplaceHandlerOption()
+    handler = UrlReplaceHandler(options=options)
+    assert handler.replace_url_segment(ORIGINAL_URL, options) == ORIGINAL_URL
+
+    options.replacement_pairs["/users/user-id-to-replace"] = "/me"
+    assert handler.replace_url_segment(ORIGINAL_URL, options) == REPLACED_URL
+    # The default dictionary is not shared between options
+    assert UrlReplaceHandlerOption().replacement_pairs == {}
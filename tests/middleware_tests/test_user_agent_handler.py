@@ -1,7 +1,9 @@
+import httpx
 import pytest
 
 from kiota_http._version import VERSION
 from kiota_http.middleware.options.user_agent_handler_option import UserAgentHandlerOption
+from kiota_http.middleware.user_agent_handler import UserAgentHandler
 
 
 def test_no_config():
@@ -21,3 +23,48 @@ def test_custom_config():
 
     options = UserAgentHandlerOption(enabled=False)
     assert not options.is_enabled
+
+
+def test_product_token_follows_product_name_and_version():
+    options = UserAgentHandlerOption(product_name='sdk', product_version='1.0')
+    assert options.product_token == 'sdk/1.0'
+    options.product_name = 'other-sdk'
+    options.product_version = '2.0'
+    assert options.product_token == 'other-sdk/2.0'
+
+
+def test_is_enabled_setter():
+    options = UserAgentHandlerOption()
+    options.is_enabled = False
+    assert not options.is_enabled
+
+
+@pytest.mark.asyncio
+async def test_user_agent_handler_appends_product_token():
+    handler = UserAgentHandler(UserAgentHandlerOption(product_name='sdk', product_version='1.0'))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    request = httpx.Request('GET', 'https://localhost', headers={'User-Agent': 'app/2.0'})
+    await handler.send(request, transport)
+    assert request.headers['User-Agent'] == 'app/2.0 sdk/1.0'
+    await handler.send(request, transport)
+    assert request.headers['User-Agent'] == 'app/2.0 sdk/1.0'
+
+
+@pytest.mark.asyncio
+async def test_user_agent_handler_uses_request_options():
+    handler = UserAgentHandler(UserAgentHandlerOption(product_name='sdk', product_version='1.0'))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    request = httpx.Request('GET', 'https://localhost')
+    request.options = {
+        UserAgentHandlerOption.get_key():
+        UserAgentHandlerOption(product_name='request-sdk', product_version='3.0')
+    }
+    await handler.send(request, transport)
+    assert request.headers['User-Agent'] == 'request-sdk/3.0'
+
+    disabled_request = httpx.Request('GET', 'https://localhost')
+    disabled_request.options = {
+        UserAgentHandlerOption.get_key(): UserAgentHandlerOption(enabled=False)
+    }
+    await handler.send(disabled_request, transport)
+    assert 'User-Agent' not in disabled_request.headers
@@ -0,0 +1,146 @@
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+from kiota_abstractions.authentication import AuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.caching_authentication_provider import CachingAuthenticationProvider
+
+BASE_URL = "https://graph.microsoft.com/v1.0/me"
+
+
+def _jwt(expires_on: float, token_id: int) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": expires_on}).encode()).decode()
+    return f"header{token_id}.{payload.rstrip('=')}.signature"
+
+
+class CountingAuthenticationProvider(AuthenticationProvider):
+
+    def __init__(self, lifetime: float = 3600, delay: float = 0) -> None:
+        self.calls = []
+        self.lifetime = lifetime
+        self.delay = delay
+
+    async def authenticate_request(self, request, additional_authentication_context={}):
+        self.calls.append(dict(additional_authentication_context))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        token = _jwt(time.time() + self.lifetime, len(self.calls))
+        request.headers.add("Authorization", f"Bearer {token}")
+
+
+def _request_info(url: str = BASE_URL) -> RequestInformation:
+    request_info = RequestInformation(Method.GET, path_parameters={})
+    request_info.url = url
+    return request_info
+
+
+def test_create_caching_authentication_provider_no_provider():
+    with pytest.raises(TypeError):
+        CachingAuthenticationProvider(None)
+
+
+@pytest.mark.asyncio
+async def test_reuses_cached_headers_for_same_origin():
+    inner = CountingAuthenticationProvider()
+    provider = CachingAuthenticationProvider(inner)
+
+    first = _request_info()
+    second = _request_info("https://graph.microsoft.com/v1.0/users")
+    await provider.authenticate_request(first)
+    await provider.authenticate_request(second)
+
+    assert len(inner.calls) == 1
+    assert first.headers.get("Authorization") == second.headers.get("Authorization")
+
+
+@pytest.mark.asyncio
+async def test_acquires_headers_per_origin():
+    inner = CountingAuthenticationProvider()
+    provider = CachingAuthenticationProvider(inner)
+
+    await provider.authenticate_request(_request_info())
+    await provider.authenticate_request(_request_info("https://example.com/items"))
+
+    assert len(inner.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_acquisition():
+    inner = CountingAuthenticationProvider(delay=0.01)
+    provider = CachingAuthenticationProvider(inner)
+
+    requests = [_request_info() for _ in range(10)]
+    await asyncio.gather(*(provider.authenticate_request(request) for request in requests))
+
+    assert len(inner.calls) == 1
+    assert all(request.headers.contains("Authorization") for request in requests)
+
+
+@pytest.mark.asyncio
+async def test_refreshes_in_background_before_expiry():
+    inner = CountingAuthenticationProvider(lifetime=60)
+    provider = CachingAuthenticationProvider(inner, refresh_before_expiry=120)
+
+    first = _request_info()
+    await provider.authenticate_request(first)
+    second = _request_info()
+    await provider.authenticate_request(second)
+    # The stale token is served while the refresh runs
+    assert first.headers.get("Authorization") == second.headers.get("Authorization")
+    await asyncio.sleep(0)
+
+    assert len(inner.calls) == 2
+    third = _request_info()
+    await provider.authenticate_request(third)
+    assert third.headers.get("Authorization") != first.headers.get("Authorization")
+
+
+@pytest.mark.asyncio
+async def test_reacquires_expired_headers():
+    inner = CountingAuthenticationProvider(lifetime=-1)
+    provider = CachingAuthenticationProvider(inner)
+
+    await provider.authenticate_request(_request_info())
+    await provider.authenticate_request(_request_info())
+
+    assert len(inner.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_claims_are_part_of_the_cache_key():
+    inner = CountingAuthenticationProvider()
+    provider = CachingAuthenticationProvider(inner)
+
+    await provider.authenticate_request(_request_info())
+    challenged = _request_info()
+    await provider.authenticate_request(challenged, {"claims": "abc"})
+    following = _request_info()
+    await provider.authenticate_request(following)
+
+    assert inner.calls == [{}, {"claims": "abc"}]
+    assert following.headers.get("Authorization") == challenged.headers.get("Authorization")
+
+
+@pytest.mark.asyncio
+async def test_delegates_when_provider_adds_no_headers():
+
+    class QueryAuthenticationProvider(AuthenticationProvider):
+
+        def __init__(self):
+            self.calls = 0
+
+        async def authenticate_request(self, request, additional_authentication_context={}):
+            self.calls += 1
+
+    inner = QueryAuthenticationProvider()
+    provider = CachingAuthenticationProvider(inner)
+    await provider.authenticate_request(_request_info())
+    await provider.authenticate_request(_request_info())
+
+    # One scratch acquisition, then every request is delegated
+    assert inner.calls == 3
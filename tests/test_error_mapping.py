@@ -0,0 +1,88 @@
+import pytest
+
+from kiota_http.error_mapping import (
+    ERROR_CLASS_TABLE_CACHE_SIZE,
+    ErrorClassTable,
+    _tables,
+    get_error_class,
+    resolve_error_class,
+)
+
+ERROR_MAPS = [
+    {},
+    {
+        "404": "NotFound"
+    },
+    {
+        "404": "NotFound",
+        "4XX": "ClientError"
+    },
+    {
+        "5XX": "ServerError",
+        "503": "Unavailable"
+    },
+    {
+        "4XX": "ClientError",
+        "5XX": "ServerError",
+        "XXX": "Error"
+    },
+    {
+        "XXX": "Error",
+        "302": "Found"
+    },
+]
+
+
+@pytest.mark.parametrize("error_map", ERROR_MAPS)
+def test_error_class_table_matches_resolution(error_map):
+    table = ErrorClassTable(error_map)
+    for status_code in range(-1, 700):
+        assert table.resolve(status_code) == resolve_error_class(error_map, status_code)
+
+
+def test_resolve_error_class_precedence():
+    error_map = {"404": "NotFound", "4XX": "ClientError", "XXX": "Error"}
+    assert resolve_error_class(error_map, 404) == ("NotFound", True)
+    assert resolve_error_class(error_map, 429) == ("ClientError", True)
+    assert resolve_error_class(error_map, 503) == ("Error", True)
+
+
+def test_unmapped_status_codes():
+    error_map = {"4XX": "ClientError"}
+    assert resolve_error_class(error_map, 500) == (None, False)
+    assert resolve_error_class(error_map, 302) == (None, True)
+
+
+def test_get_error_class_builds_table_for_reused_error_maps():
+    error_map = {"418": "Teapot", "5XX": "ServerError"}
+    assert get_error_class(error_map, 418) == ("Teapot", True)
+    assert _tables[id(error_map)] == (error_map, error_map, None)
+    assert get_error_class(error_map, 503) == ("ServerError", True)
+    assert isinstance(_tables[id(error_map)][2], ErrorClassTable)
+    assert get_error_class(error_map, 418) == ("Teapot", True)
+
+
+def test_get_error_class_rebuilds_tables_of_modified_error_maps():
+    error_map = {"5XX": "ServerError"}
+    get_error_class(error_map, 503)
+    assert get_error_class(error_map, 503) == ("ServerError", True)
+
+    error_map["503"] = "Unavailable"
+    assert get_error_class(error_map, 503) == ("Unavailable", True)
+    del error_map["503"]
+    assert get_error_class(error_map, 503) == ("ServerError", True)
+
+
+def test_get_error_class_evicts_error_maps_used_once():
+    error_map = {"429": "Throttled"}
+    get_error_class(error_map, 429)
+    get_error_class(error_map, 429)
+    for _ in range(ERROR_CLASS_TABLE_CACHE_SIZE):
+        assert get_error_class({"429": "Throttled"}, 429) == ("Throttled", True)
+    assert len(_tables) <= ERROR_CLASS_TABLE_CACHE_SIZE
+    assert _tables[id(error_map)][2] is not None
+
+
+def test_get_error_class_accepts_unhashable_error_classes():
+    error_class = {"unhashable": True}
+    assert get_error_class({"500": error_class}, 500) == (error_class, True)
@@ -0,0 +1,132 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import Parsable, ParseNodeFactoryRegistry
+from kiota_abstractions.store import (
+    BackedModel,
+    BackingStore,
+    BackingStoreParseNodeFactory,
+    InMemoryBackingStore,
+)
+
+from kiota_http.fast_json_parse_node_factory import FastJsonParseNodeFactory
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+JsonParseNode = pytest.importorskip("kiota_serialization_json.json_parse_node").JsonParseNode
+JsonParseNodeFactory = pytest.importorskip(
+    "kiota_serialization_json.json_parse_node_factory"
+).JsonParseNodeFactory
+
+PAYLOAD = b'{"displayName": "Diego Siciliani", "businessPhones": ["+1 205 555 0108"]}'
+
+
+@dataclass
+class BackedUser(BackedModel, Parsable):
+    backing_store: BackingStore = field(default_factory=InMemoryBackingStore, repr=False)
+    display_name: Optional[str] = None
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node=None):
+        return BackedUser()
+
+    def get_field_deserializers(self):
+        return {"displayName": lambda n: setattr(self, "display_name", n.get_str_value())}
+
+    def serialize(self, writer):
+        writer.write_str_value("displayName", self.display_name)
+
+
+def test_fast_json_parse_node_factory_no_fallback():
+    with pytest.raises(TypeError):
+        FastJsonParseNodeFactory(None)
+
+
+def test_fast_json_parse_node_factory_unknown_backend():
+    with pytest.raises(ImportError):
+        FastJsonParseNodeFactory(Mock(), "unknown_json_backend")
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+@pytest.mark.parametrize(
+    "content_type",
+    ["application/json", "application/vnd.api+json", "application/json; charset=utf-8"]
+)
+def test_fast_json_parse_node_factory_parses_json(backend, content_type):
+    if backend != "json":
+        pytest.importorskip(backend)
+    fallback = Mock()
+    factory = FastJsonParseNodeFactory(fallback, backend)
+
+    root_node = factory.get_root_parse_node(content_type, PAYLOAD)
+
+    assert factory.backend == backend
+    assert isinstance(root_node, JsonParseNode)
+    assert root_node.get_child_node("displayName").get_str_value() == "Diego Siciliani"
+    fallback.get_root_parse_node.assert_not_called()
+
+
+def test_fast_json_parse_node_factory_prefers_installed_backend():
+    pytest.importorskip("orjson")
+
+    assert FastJsonParseNodeFactory(Mock()).backend == "orjson"
+
+
+def test_fast_json_parse_node_factory_delegates_other_content_types():
+    fallback = Mock()
+    factory = FastJsonParseNodeFactory(fallback, "json")
+
+    factory.get_root_parse_node("text/plain", b"content")
+
+    fallback.get_root_parse_node.assert_called_once_with("text/plain", b"content")
+
+
+def test_enable_fast_json_parsing(request_adapter):
+    registry = request_adapter._parse_node_factory
+
+    request_adapter.enable_fast_json_parsing("json")
+
+    assert isinstance(request_adapter._parse_node_factory, FastJsonParseNodeFactory)
+    assert request_adapter._parse_node_factory._fallback_factory is registry
+
+
+def test_fast_json_parse_node_factory_applies_fallback_proxies():
+    factory = FastJsonParseNodeFactory(BackingStoreParseNodeFactory(JsonParseNodeFactory()), "json")
+
+    user = factory.get_root_parse_node("application/json", PAYLOAD).get_object_value(BackedUser)
+    user.backing_store.return_only_changed_values = True
+
+    assert user.backing_store.is_initialization_completed
+    assert user.backing_store.enumerate_() == []
+    user.display_name = "edited"
+    assert user.backing_store.enumerate_() == [("display_name", "edited")]
+
+
+@pytest.mark.asyncio
+async def test_enable_fast_json_parsing_after_backing_store(auth_provider, monkeypatch):
+    monkeypatch.setitem(
+        ParseNodeFactoryRegistry.CONTENT_TYPE_ASSOCIATED_FACTORIES, "application/json",
+        JsonParseNodeFactory()
+    )
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.
+            Response(200, content=PAYLOAD, headers={"Content-Type": "application/json"})
+        )
+    )
+    request_adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    request_adapter.enable_backing_store(None)
+    request_adapter.enable_fast_json_parsing("json")
+    request_info = RequestInformation(Method.GET, "https://graph.microsoft.com/v1.0/me")
+
+    user = await request_adapter.send_async(request_info, BackedUser, {})
+    user.backing_store.return_only_changed_values = True
+
+    assert user.backing_store.is_initialization_completed
+    assert user.backing_store.enumerate_() == []
+    user.display_name = "edited"
+    assert user.backing_store.enumerate_() == [("display_name", "edited")]
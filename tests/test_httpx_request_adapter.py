@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, Mock, call, patch
 from urllib.parse import unquote
 
@@ -6,12 +7,18 @@ import pytest
 from kiota_abstractions.api_error import APIError
 from kiota_abstractions.method import Method
 from kiota_abstractions.native_response_handler import NativeResponseHandler
+from kiota_abstractions.request_information import RequestInformation
 from kiota_abstractions.serialization import (
     ParseNodeFactoryRegistry,
     SerializationWriterFactoryRegistry,
 )
 from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.semconv.attributes.http_attributes import HTTP_RESPONSE_STATUS_CODE
 
+from kiota_http._exceptions import BulkRequestError, UnparsedAPIError
 from kiota_http.httpx_request_adapter import HttpxRequestAdapter
 from kiota_http.middleware.options import ResponseHandlerOption
 
@@ -115,6 +122,26 @@ async def test_get_root_parse_node_no_content_type_header_return_null(
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_get_root_parse_node_reads_streamed_response(request_adapter, mock_otel_span):
+
+    class BodyStream(httpx.AsyncByteStream):
+
+        async def __aiter__(self):
+            yield b'{"message": '
+            yield b'"Streamed"}'
+
+    response = httpx.Response(200, headers={"Content-Type": APPLICATION_JSON}, stream=BodyStream())
+    request_adapter._parse_node_factory = Mock()
+
+    await request_adapter.get_root_parse_node(response, mock_otel_span, mock_otel_span)
+
+    get_root_parse_node = request_adapter._parse_node_factory.get_root_parse_node
+    get_root_parse_node.assert_called_once_with(APPLICATION_JSON, b'{"message": "Streamed"}')
+    # The body read once is handed over without copying
+    assert get_root_parse_node.call_args.args[1] is response.content
+
+
 @pytest.mark.asyncio
 async def test_does_not_throw_failed_responses_on_success(request_adapter, simple_success_response):
     try:
@@ -233,6 +260,97 @@ async def test_throw_failed_responses_XXX(
     assert str(e.value.message) == "OdataError"
 
 
+@pytest.mark.asyncio
+async def test_throw_failed_responses_does_not_parse_html_error_pages(
+    request_adapter, mock_apierror_map, mock_otel_span
+):
+    request_adapter.get_root_parse_node = AsyncMock()
+    resp = httpx.Response(
+        status_code=500, headers={"Content-Type": "text/html"}, content=b"<html>Bad Gateway</html>"
+    )
+
+    with pytest.raises(UnparsedAPIError) as e:
+        span = mock_otel_span
+        await request_adapter.throw_failed_responses(resp, mock_apierror_map, span, span)
+    assert e.value.response_status_code == 500
+    assert e.value.response_body == b"<html>Bad Gateway</html>"
+    request_adapter.get_root_parse_node.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_throw_failed_responses_does_not_parse_error_bodies_over_max_size(
+    request_adapter, mock_apierror_map, mock_otel_span
+):
+    request_adapter.get_root_parse_node = AsyncMock()
+    request_adapter.max_error_body_size = 8
+    resp = httpx.Response(status_code=400, json={"error": {"code": "TooLarge"}})
+
+    with pytest.raises(UnparsedAPIError) as e:
+        span = mock_otel_span
+        await request_adapter.throw_failed_responses(resp, mock_apierror_map, span, span)
+    assert e.value.response_body == resp.content[:8]
+    assert "maximum error body size" in e.value.message
+    request_adapter.get_root_parse_node.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_throw_failed_responses_reads_streamed_error_bodies_up_to_max_size(
+    request_adapter, mock_apierror_map, mock_otel_span
+):
+    chunks_read = []
+
+    class ErrorPageStream(httpx.AsyncByteStream):
+
+        async def __aiter__(self):
+            for _ in range(100):
+                chunks_read.append(1)
+                yield b"x" * 1024
+
+    request_adapter.max_error_body_size = 4096
+    resp = httpx.Response(
+        status_code=500, headers={"Content-Type": "text/plain"}, stream=ErrorPageStream()
+    )
+
+    with pytest.raises(UnparsedAPIError) as e:
+        span = mock_otel_span
+        await request_adapter.throw_failed_responses(resp, mock_apierror_map, span, span)
+    assert e.value.response_body == b"x" * 4096
+    assert len(chunks_read) == 5
+    assert resp.is_closed
+
+
+@pytest.mark.asyncio
+async def test_throw_failed_responses_parses_streamed_error_bodies_of_unknown_length(
+    request_adapter, mock_apierror_map, mock_error_object, mock_otel_span
+):
+
+    class ErrorStream(httpx.AsyncByteStream):
+
+        async def __aiter__(self):
+            yield b'{"error": '
+            yield b'"Not found"}'
+
+    request_adapter._parse_node_factory = Mock()
+    request_adapter._parse_node_factory.get_root_parse_node.return_value = mock_error_object
+    resp = httpx.Response(
+        status_code=400, headers={"Content-Type": APPLICATION_JSON}, stream=ErrorStream()
+    )
+
+    with pytest.raises(APIError) as e:
+        span = mock_otel_span
+        await request_adapter.throw_failed_responses(resp, mock_apierror_map, span, span)
+    assert str(e.value.message) == "Resource not found"
+    request_adapter._parse_node_factory.get_root_parse_node.assert_called_once_with(
+        APPLICATION_JSON, b'{"error": "Not found"}'
+    )
+
+
+def test_max_error_body_size_cannot_be_negative(request_adapter):
+    assert request_adapter.max_error_body_size == HttpxRequestAdapter.DEFAULT_MAX_ERROR_BODY_SIZE
+    with pytest.raises(ValueError):
+        request_adapter.max_error_body_size = -1
+
+
 @pytest.mark.asyncio
 async def test_send_async(request_adapter, request_info, mock_user_response, mock_user):
     request_adapter.get_http_response_message = AsyncMock(return_value=mock_user_response)
@@ -400,3 +518,173 @@ async def test_retries_on_cae_failure(
         ),
     ]
     request_adapter._authentication_provider.authenticate_request.assert_has_awaits(calls)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cae_challenges_share_one_reauthentication(
+    request_adapter, mock_cae_failure_response, mock_otel_span
+):
+
+    async def authenticate_request(request_info, additional_authentication_context):
+        if additional_authentication_context:
+            await asyncio.sleep(0.01)
+            request_info.headers.try_add("Authorization", "Bearer claims-token")
+
+    request_adapter._http_client.send = AsyncMock(return_value=mock_cae_failure_response)
+    request_adapter._authentication_provider.authenticate_request = AsyncMock(
+        side_effect=authenticate_request
+    )
+    request_infos = []
+    for _ in range(5):
+        request_info = RequestInformation(Method.GET, path_parameters={})
+        request_info.url = BASE_URL
+        request_infos.append(request_info)
+
+    await asyncio.gather(
+        *(
+            request_adapter.get_http_response_message(request_info, mock_otel_span)
+            for request_info in request_infos
+        )
+    )
+
+    claims_calls = [
+        awaited
+        for awaited in request_adapter._authentication_provider.authenticate_request.await_args_list
+        if awaited.args[1]
+    ]
+    assert len(claims_calls) == 1
+    for request_info in request_infos:
+        assert request_info.headers.get("Authorization") == {"Bearer claims-token"}
+
+
+def _mock_bulk_send(request_adapter, failing=()):
+    """Replaces the single request send with one completing in reverse order and records
+    the requests in flight."""
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def send(request_info, parsable_factory, error_map, parent_span):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        index = int(request_info.url.rsplit("/", 1)[1])
+        # Yielding to the event loop rather than sleeping makes the completion order
+        # independent of timers
+        for _ in range(10 - index):
+            await asyncio.sleep(0)
+        state["in_flight"] -= 1
+        if index in failing:
+            raise APIError(f"request {index} failed")
+        return index
+
+    request_adapter._send_async = send
+    return state
+
+
+def _bulk_request_infos(count):
+    request_infos = []
+    for index in range(count):
+        request_info = RequestInformation(Method.GET, path_parameters={})
+        request_info.url = f"{BASE_URL}/items/{index}"
+        request_infos.append(request_info)
+    return request_infos
+
+
+@pytest.mark.asyncio
+async def test_send_many_async_returns_results_in_order(request_adapter):
+    state = _mock_bulk_send(request_adapter)
+
+    results = await request_adapter.send_many_async(
+        _bulk_request_infos(10), MockResponseObject, {}, max_concurrency=3
+    )
+
+    assert results == list(range(10))
+    assert state["max_in_flight"] == 3
+
+
+@pytest.mark.asyncio
+async def test_send_many_async_records_each_request_on_its_own_span(auth_provider):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200 + int(request.url.path.rsplit("/", 1)[1]))
+        )
+    )
+    request_adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+
+    with patch("kiota_http.httpx_request_adapter.tracer", provider.get_tracer("test")):
+        await request_adapter.send_many_primitive_async(
+            _bulk_request_infos(3), "bytes", {}, max_concurrency=3
+        )
+
+    spans = exporter.get_finished_spans()
+    (bulk_span, ) = [span for span in spans if span.name == "send_many_primitive_async"]
+    request_spans = [
+        span for span in spans if span.parent and span.parent.span_id == bulk_span.context.span_id
+    ]
+    assert sorted(span.attributes[HTTP_RESPONSE_STATUS_CODE]
+                  for span in request_spans) == [200, 201, 202]
+    assert all(span.name.startswith("send_primitive_async - ") for span in request_spans)
+    assert HTTP_RESPONSE_STATUS_CODE not in bulk_span.attributes
+
+
+@pytest.mark.asyncio
+async def test_send_many_async_aggregates_failures(request_adapter):
+    _mock_bulk_send(request_adapter, failing=(2, 5))
+
+    with pytest.raises(BulkRequestError) as exc_info:
+        await request_adapter.send_many_async(_bulk_request_infos(6), MockResponseObject, {})
+
+    assert sorted(exc_info.value.exceptions) == [2, 5]
+    assert exc_info.value.results == [0, 1, None, 3, 4, None]
+
+
+@pytest.mark.asyncio
+async def test_send_many_async_returns_exceptions(request_adapter):
+    _mock_bulk_send(request_adapter, failing=(1, ))
+
+    results = await request_adapter.send_many_async(
+        _bulk_request_infos(3), MockResponseObject, {}, return_exceptions=True
+    )
+
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], APIError)
+
+
+@pytest.mark.asyncio
+async def test_send_many_as_completed_async_yields_as_requests_complete(request_adapter):
+    _mock_bulk_send(request_adapter)
+
+    completed = [
+        index async for index, _ in request_adapter.send_many_as_completed_async(
+            _bulk_request_infos(5), MockResponseObject, {}, max_concurrency=5
+        )
+    ]
+
+    assert completed == [4, 3, 2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_send_many_as_completed_async_close_cancels_requests(request_adapter):
+    started = []
+    cancelled = []
+
+    async def send(request_info, parsable_factory, error_map, parent_span):
+        started.append(request_info)
+        if len(started) > 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(request_info)
+                raise
+        return request_info
+
+    request_adapter._send_async = send
+    results = request_adapter.send_many_as_completed_async(
+        _bulk_request_infos(10), MockResponseObject, {}, max_concurrency=2
+    )
+    await results.__anext__()
+    await results.aclose()
+
+    assert len(started) == 3
+    assert len(cancelled) == 2
@@ -0,0 +1,170 @@
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+
+from kiota_http._exceptions import ResponseError
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.large_file_upload_task import LargeFileUploadTask
+from kiota_http.middleware import RetryHandler
+
+UPLOAD_URL = "https://upload.example.com/sessions/1"
+CONTENT = bytes(range(256)) * 40
+
+
+class UploadSession():
+    """Records the ranges put to an upload session and answers like OneDrive does."""
+
+    def __init__(self, size, received=None, failures=None):
+        self.size = size
+        self.data = bytearray(size)
+        self.received = set(received or [])
+        self.failures = failures or {}
+        self.requests = []
+
+    def next_expected_ranges(self):
+        missing = [index for index in range(self.size) if index not in self.received]
+        ranges = []
+        for index in missing:
+            if ranges and ranges[-1][1] == index - 1:
+                ranges[-1][1] = index
+            else:
+                ranges.append([index, index])
+        return [f"{start}-{end}" for start, end in ranges]
+
+    def handler(self, request):
+        self.requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(200, json={"nextExpectedRanges": self.next_expected_ranges()})
+        content_range = request.headers["Content-Range"]
+        if failure := self.failures.pop(content_range, None):
+            if isinstance(failure, Exception):
+                raise failure
+            return httpx.Response(failure)
+        start, end = map(int, content_range.split(" ")[1].split("/")[0].split("-"))
+        self.data[start:end + 1] = request.read()
+        self.received.update(range(start, end + 1))
+        if len(self.received) == self.size:
+            return httpx.Response(201, json={"id": "item"})
+        return httpx.Response(202, json={"nextExpectedRanges": self.next_expected_ranges()})
+
+
+@pytest.fixture
+def upload_file(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(RetryHandler, "get_delay_time", lambda *args: 0)
+
+
+def _adapter(auth_provider, session):
+    return HttpxRequestAdapter(
+        auth_provider,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(session.handler)),
+    )
+
+
+def test_large_file_upload_task_rejects_invalid_chunk_size(request_adapter, upload_file):
+    with pytest.raises(ValueError):
+        LargeFileUploadTask(request_adapter, UPLOAD_URL, upload_file, chunk_size=0)
+
+
+@pytest.mark.asyncio
+async def test_upload_async_puts_ranges(auth_provider, upload_file):
+    session = UploadSession(len(CONTENT))
+    task = LargeFileUploadTask(
+        _adapter(auth_provider, session), UPLOAD_URL, upload_file, chunk_size=4096
+    )
+    progress = []
+
+    response = await task.upload_async(
+        progress_callback=lambda uploaded, total: progress.append(uploaded)
+    )
+
+    assert response.status_code == 201
+    assert bytes(session.data) == CONTENT
+    assert [request.headers["Content-Range"] for request in session.requests
+            ] == ["bytes 0-4095/10240", "bytes 4096-8191/10240", "bytes 8192-10239/10240"]
+    assert progress == [4096, 8192, 10240]
+
+
+@pytest.mark.asyncio
+async def test_upload_async_uploads_ranges_in_parallel(auth_provider, upload_file):
+    session = UploadSession(len(CONTENT))
+    with open(upload_file, "rb") as file:
+        task = LargeFileUploadTask(
+            _adapter(auth_provider, session), UPLOAD_URL, file, chunk_size=1024, max_concurrency=4
+        )
+        response = await task.upload_async()
+
+    assert response.status_code == 201
+    assert bytes(session.data) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_upload_async_retries_failed_ranges_only(auth_provider, upload_file):
+    session = UploadSession(
+        len(CONTENT),
+        failures={
+            "bytes 4096-8191/10240": 503,
+            "bytes 8192-10239/10240": httpx.WriteError("connection reset"),
+        },
+    )
+    task = LargeFileUploadTask(
+        _adapter(auth_provider, session), UPLOAD_URL, upload_file, chunk_size=4096
+    )
+
+    response = await task.upload_async()
+
+    assert response.status_code == 201
+    assert bytes(session.data) == CONTENT
+    assert [request.headers["Content-Range"] for request in session.requests] == [
+        "bytes 0-4095/10240",
+        "bytes 4096-8191/10240",
+        "bytes 4096-8191/10240",
+        "bytes 8192-10239/10240",
+        "bytes 8192-10239/10240",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upload_async_raises_failed_ranges(auth_provider, upload_file):
+    session = UploadSession(len(CONTENT), failures={"bytes 0-4095/10240": 400})
+    task = LargeFileUploadTask(
+        _adapter(auth_provider, session), UPLOAD_URL, upload_file, chunk_size=4096
+    )
+
+    with pytest.raises(APIError):
+        await task.upload_async()
+
+
+@pytest.mark.asyncio
+async def test_resume_async_sends_no_range_to_a_complete_session(auth_provider, upload_file):
+    session = UploadSession(len(CONTENT), received=range(len(CONTENT)))
+    task = LargeFileUploadTask(
+        _adapter(auth_provider, session), UPLOAD_URL, upload_file, chunk_size=4096
+    )
+
+    with pytest.raises(ResponseError, match="nothing is left to upload"):
+        await task.resume_async()
+
+    assert [request.method for request in session.requests] == ["GET"]
+
+
+@pytest.mark.asyncio
+async def test_resume_async_uploads_next_expected_ranges(auth_provider, upload_file):
+    session = UploadSession(len(CONTENT), received=range(0, 6000))
+    session.data[:6000] = CONTENT[:6000]
+    task = LargeFileUploadTask(
+        _adapter(auth_provider, session), UPLOAD_URL, upload_file, chunk_size=4096
+    )
+
+    response = await task.resume_async()
+
+    assert response.status_code == 201
+    assert bytes(session.data) == CONTENT
+    assert [request.headers.get("Content-Range") for request in session.requests
+            ] == [None, "bytes 6000-10095/10240", "bytes 10096-10239/10240"]
@@ -0,0 +1,113 @@
+import httpx
+import pytest
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from kiota_http import httpx_request_adapter
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.metrics import HttpClientMetrics, get_metric_attributes
+from kiota_http.middleware import RetryHandler
+from kiota_http.middleware import retry_handler
+from kiota_http.middleware.options import RetryHandlerOption
+
+
+@pytest.fixture
+def metric_reader():
+    return InMemoryMetricReader()
+
+
+@pytest.fixture
+def client_metrics(metric_reader, monkeypatch):
+    provider = MeterProvider(metric_readers=[metric_reader])
+    client_metrics = HttpClientMetrics(provider.get_meter("test"))
+    monkeypatch.setattr(httpx_request_adapter, "http_client_metrics", client_metrics)
+    monkeypatch.setattr(retry_handler, "http_client_metrics", client_metrics)
+    return client_metrics
+
+
+def get_data_points(metric_reader):
+    data_points = {}
+    for resource_metrics in metric_reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                data_points[metric.name] = list(metric.data.data_points)
+    return data_points
+
+
+def test_get_metric_attributes_records_host_only():
+    attributes = get_metric_attributes(
+        "GET", httpx.URL("https://example.com/users/1?$top=1"), "{+baseurl}/users/{id}"
+    )
+    assert attributes == {
+        "http.request.method": "GET",
+        "server.address": "example.com",
+        "url.template": "{+baseurl}/users/{id}",
+    }
+
+
+@pytest.mark.asyncio
+async def test_adapter_records_request_metrics(auth_provider, metric_reader, client_metrics):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(204, content=b""))
+    )
+    adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    request_info = RequestInformation(Method.POST, "{+baseurl}/users", {})
+    request_info.url = "https://example.com/users"
+    request_info.content = b'{"a": 1}'
+
+    await adapter.send_no_response_content_async(request_info, {})
+
+    data_points = get_data_points(metric_reader)
+    duration = data_points["http.client.request.duration"][0]
+    assert duration.count == 1
+    assert duration.attributes == {
+        "http.request.method": "POST",
+        "server.address": "example.com",
+        "url.template": "{+baseurl}/users",
+        "http.response.status_class": "2xx",
+    }
+    assert data_points["http.client.request.body.size"][0].sum == 8
+    assert data_points["http.client.active_requests"][0].value == 0
+    open_connections = data_points["http.client.open_connections"]
+    assert {data_point.value for data_point in open_connections} == {0}
+
+
+@pytest.mark.asyncio
+async def test_adapter_records_failed_request_metrics(auth_provider, metric_reader, client_metrics):
+
+    def handler(request):
+        raise httpx.ConnectError("Connection refused")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    request_info = RequestInformation(Method.GET, "https://example.com/users", {})
+
+    with pytest.raises(httpx.ConnectError):
+        await adapter.send_no_response_content_async(request_info, {})
+
+    data_points = get_data_points(metric_reader)
+    duration = data_points["http.client.request.duration"][0]
+    assert duration.attributes["error.type"] == "ConnectError"
+    assert data_points["http.client.active_requests"][0].value == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_handler_counts_retries(metric_reader, client_metrics, monkeypatch):
+    monkeypatch.setattr(retry_handler.random, "randint", lambda start, end: 0)
+    responses = iter([httpx.Response(503), httpx.Response(503), httpx.Response(200)])
+    transport = httpx.MockTransport(lambda request: next(responses))
+    handler = RetryHandler(RetryHandlerOption(delay=0.01))
+    handler.backoff_factor = 0
+    request = httpx.Request('GET', 'https://example.com/users')
+
+    response = await handler.send(request, transport)
+
+    assert response.status_code == 200
+    retries = get_data_points(metric_reader)["http.client.request.retries"][0]
+    assert retries.value == 2
+    assert retries.attributes == {
+        "http.request.method": "GET",
+        "server.address": "example.com",
+    }
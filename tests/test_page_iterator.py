@@ -0,0 +1,161 @@
+import asyncio
+from urllib.parse import urlparse
+
+import pytest
+from kiota_abstractions.authentication import (
+    AccessTokenProvider,
+    AllowedHostsValidator,
+    BaseBearerTokenAuthenticationProvider,
+)
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.page_iterator import PageIterator
+
+BASE_URL = "https://graph.microsoft.com/v1.0/users"
+
+
+class MockPage():
+
+    def __init__(self, value, next_link=None, delta_link=None, additional_data=None):
+        self.value = value
+        self.odata_next_link = next_link
+        self.odata_delta_link = delta_link
+        self.additional_data = additional_data or {}
+
+
+def _request_info(url=BASE_URL):
+    request_info = RequestInformation(Method.GET, path_parameters={})
+    request_info.url = url
+    request_info.headers.try_add("ConsistencyLevel", "eventual")
+    return request_info
+
+
+def _mock_pages(request_adapter, pages, delay=0):
+    requested = []
+
+    async def send_async(request_info, parsable_factory, error_map):
+        requested.append(request_info)
+        if delay:
+            await asyncio.sleep(delay)
+        page = pages[request_info.url]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    request_adapter.send_async = send_async
+    return requested
+
+
+PAGES = {
+    BASE_URL: MockPage([1, 2], next_link=f"{BASE_URL}?page=2"),
+    f"{BASE_URL}?page=2": MockPage([3], additional_data={"@odata.nextLink": f"{BASE_URL}?page=3"}),
+    f"{BASE_URL}?page=3": MockPage([4, 5], delta_link=f"{BASE_URL}/delta?token=abc"),
+}
+
+
+def test_page_iterator_rejects_negative_prefetch_depth(request_adapter):
+    with pytest.raises(ValueError):
+        PageIterator(request_adapter, _request_info(), MockPage, {}, prefetch_depth=-1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch_depth", [0, 1, 3])
+async def test_page_iterator_follows_next_links(request_adapter, prefetch_depth):
+    requested = _mock_pages(request_adapter, PAGES)
+
+    pages = request_adapter.iterate_pages(
+        _request_info(), MockPage, {}, prefetch_depth=prefetch_depth
+    )
+    items = [item async for item in pages.iterate_items()]
+
+    assert items == [1, 2, 3, 4, 5]
+    assert pages.delta_link == f"{BASE_URL}/delta?token=abc"
+    assert [request.url for request in requested] == list(PAGES)
+    assert all(request.headers.get("ConsistencyLevel") == {"eventual"} for request in requested)
+
+
+@pytest.mark.asyncio
+async def test_page_iterator_prefetches_next_page(request_adapter):
+    requested = _mock_pages(request_adapter, PAGES)
+
+    pages = request_adapter.iterate_pages(_request_info(), MockPage, {})
+    await pages.__anext__()
+    await asyncio.sleep(0.01)
+
+    # The first page and the one prefetched while it is consumed
+    assert len(requested) == 2
+    await pages.__anext__()
+    await asyncio.sleep(0.01)
+    assert len(requested) == 3
+    await pages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_page_iterator_raises_page_errors(request_adapter):
+    pages = dict(PAGES)
+    pages[f"{BASE_URL}?page=2"] = ValueError("page failed")
+    _mock_pages(request_adapter, pages)
+
+    iterator = request_adapter.iterate_pages(_request_info(), MockPage, {})
+    assert (await iterator.__anext__()).value == [1, 2]
+    with pytest.raises(ValueError):
+        await iterator.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await iterator.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_page_iterator_close_cancels_pending_requests(request_adapter):
+    requested = _mock_pages(request_adapter, PAGES, delay=0.05)
+
+    async with request_adapter.iterate_pages(_request_info(), MockPage, {}) as pages:
+        async for _ in pages:
+            # The next page is requested while this one is consumed
+            await asyncio.sleep(0.01)
+            break
+
+    await asyncio.sleep(0.1)
+    assert len(requested) == 2
+    with pytest.raises(StopAsyncIteration):
+        await pages.__anext__()
+
+
+class MockAccessTokenProvider(AccessTokenProvider):
+
+    def __init__(self):
+        self.validator = AllowedHostsValidator(["graph.microsoft.com"])
+
+    async def get_authorization_token(self, uri, additional_authentication_context=None):
+        return "SECRET" if urlparse(uri).hostname in self.validator.get_allowed_hosts() else ""
+
+    def get_allowed_hosts_validator(self):
+        return self.validator
+
+
+@pytest.mark.asyncio
+async def test_page_iterator_authenticates_next_links_against_allowed_hosts():
+    request_adapter = HttpxRequestAdapter(
+        BaseBearerTokenAuthenticationProvider(MockAccessTokenProvider())
+    )
+    other_host_url = "https://evil.example.com/page2"
+    pages = {
+        BASE_URL: MockPage([1], next_link=other_host_url),
+        other_host_url: MockPage([2]),
+    }
+    authorizations = {}
+
+    async def send_async(request_info, parsable_factory, error_map):
+        await request_adapter._authentication_provider.authenticate_request(request_info)
+        authorizations[request_info.url] = request_info.headers.get("Authorization")
+        return pages[request_info.url]
+
+    request_adapter.send_async = send_async
+    items = [
+        item async for item in request_adapter.iterate_pages(_request_info(), MockPage, {}
+                                                             ).iterate_items()
+    ]
+
+    assert items == [1, 2]
+    assert authorizations == {BASE_URL: {"Bearer SECRET"}, other_host_url: set()}
@@ -0,0 +1,297 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.kiota_client_factory import KiotaClientFactory
+from kiota_http.middleware.options import UrlReplaceHandlerOption
+from kiota_http.request_batcher import BatchRequestItem, RequestBatcher
+
+BASE_URL = "https://graph.microsoft.com/v1.0"
+
+
+def batch_handler(request: httpx.Request) -> httpx.Response:
+    if not request.url.path.endswith("/$batch"):
+        return httpx.Response(200, json={"single": request.url.path})
+    batch = json.loads(request.content)
+    responses = []
+    for item in batch["requests"]:
+        status = 404 if item["url"].startswith("/missing") else 200
+        responses.append(
+            {
+                "id": item["id"],
+                "status": status,
+                "headers": {
+                    "Content-Type": "application/json"
+                },
+                "body": {
+                    "url": item["url"],
+                    "method": item["method"],
+                    "body": item.get("body")
+                },
+            }
+        )
+    return httpx.Response(200, json={"responses": responses})
+
+
+@pytest.fixture
+def batch_transport():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return batch_handler(request)
+
+    transport = httpx.MockTransport(handler)
+    transport.requests = requests
+    return transport
+
+
+@pytest.fixture
+def batching_adapter(auth_provider, batch_transport):
+    adapter = HttpxRequestAdapter(
+        auth_provider,
+        http_client=httpx.AsyncClient(transport=batch_transport),
+        base_url=BASE_URL,
+    )
+    adapter.enable_request_batching(batch_window=0.01)
+    return adapter
+
+
+def _request_info(path: str, method: Method = Method.GET) -> RequestInformation:
+    request_info = RequestInformation(method, path_parameters={})
+    request_info.url = f"{BASE_URL}{path}"
+    return request_info
+
+
+def test_batcher_rejects_invalid_batch_size(request_adapter):
+    with pytest.raises(ValueError):
+        RequestBatcher(request_adapter, max_batch_size=21)
+
+
+def test_is_batchable(batching_adapter):
+    batcher = batching_adapter._request_batcher
+    assert batcher.is_batchable(_request_info("/me"))
+    assert not batcher.is_batchable(_request_info("/$batch"))
+    other_host = RequestInformation(Method.GET, path_parameters={})
+    other_host.url = "https://example.com/me"
+    assert not batcher.is_batchable(other_host)
+
+
+@pytest.mark.asyncio
+async def test_requests_in_window_are_sent_as_one_batch(
+    batching_adapter, batch_transport, mock_otel_span
+):
+    post = _request_info("/users", Method.POST)
+    post.headers.try_add("Content-Type", "application/json")
+    post.content = b'{"displayName": "Adele"}'
+    request_infos = [_request_info("/me"), _request_info("/me/messages"), post]
+
+    responses = await asyncio.gather(
+        *(
+            batching_adapter.get_http_response_message(request_info, mock_otel_span)
+            for request_info in request_infos
+        )
+    )
+
+    assert len(batch_transport.requests) == 1
+    assert batch_transport.requests[0].url == f"{BASE_URL}/$batch"
+    assert [response.json()["url"] for response in responses] == ["/me", "/me/messages", "/users"]
+    assert responses[2].json()["method"] == "POST"
+    assert responses[2].json()["body"] == {"displayName": "Adele"}
+
+
+@pytest.mark.asyncio
+async def test_batch_item_failures_are_raised_per_caller(batching_adapter):
+    results = await asyncio.gather(
+        batching_adapter.send_no_response_content_async(_request_info("/me"), {}),
+        batching_adapter.send_no_response_content_async(_request_info("/missing"), {}),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], APIError)
+    assert results[1].response_status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_single_request_is_sent_without_envelope(
+    batching_adapter, batch_transport, mock_otel_span
+):
+    response = await batching_adapter.get_http_response_message(
+        _request_info("/me"), mock_otel_span
+    )
+
+    assert response.json() == {"single": "/v1.0/me"}
+    assert batch_transport.requests[0].url == f"{BASE_URL}/me"
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_by_max_batch_size(
+    batching_adapter, batch_transport, mock_otel_span
+):
+    batching_adapter.enable_request_batching(max_batch_size=2)
+    await asyncio.gather(
+        *(
+            batching_adapter.
+            get_http_response_message(_request_info(f"/users/{i}"), mock_otel_span)
+            for i in range(5)
+        )
+    )
+
+    assert len(batch_transport.requests) == 3
+
+
+def test_dependent_requests_are_kept_in_the_same_chunk():
+    dependencies = [[], [0], [], [2], [3], []]
+    chunks = RequestBatcher._get_chunks(dependencies, 3)
+
+    assert sorted(chunks) == [[0, 1, 5], [2, 3, 4]]
+
+
+def test_dependency_groups_larger_than_a_batch_are_rejected():
+    with pytest.raises(ValueError):
+        RequestBatcher._get_chunks([[], [0], [1]], 2)
+
+
+@pytest.mark.asyncio
+async def test_send_batch_async_chunks_requests(batching_adapter, batch_transport):
+    request_infos = [_request_info(f"/users/{i}") for i in range(45)]
+
+    responses = await batching_adapter.send_batch_async(request_infos, max_concurrency=3)
+
+    assert len(batch_transport.requests) == 3
+    assert [response.json()["url"] for response in responses] == [f"/users/{i}" for i in range(45)]
+
+
+@pytest.mark.asyncio
+async def test_send_batch_async_sends_dependencies(batching_adapter, batch_transport):
+    first = BatchRequestItem(_request_info("/me"))
+    second = BatchRequestItem(_request_info("/me/messages"), depends_on=[first])
+
+    await batching_adapter.send_batch_async([first, second])
+
+    batch = json.loads(batch_transport.requests[0].content)
+    assert batch["requests"][1]["dependsOn"] == ["0"]
+
+
+@pytest.mark.asyncio
+async def test_send_batch_async_retries_only_throttled_items(auth_provider):
+    batches = []
+
+    def handler(request):
+        if not request.url.path.endswith("/$batch"):
+            batches.append([request.url.path])
+            return httpx.Response(200)
+        batch = json.loads(request.content)
+        batches.append([item["url"] for item in batch["requests"]])
+        responses = []
+        for item in batch["requests"]:
+            throttled = item["url"] == "/throttled" and len(batches) == 1
+            responses.append(
+                {
+                    "id": item["id"],
+                    "status": 429 if throttled else 200,
+                    "headers": {
+                        "Retry-After": "0"
+                    } if throttled else {},
+                }
+            )
+        return httpx.Response(200, json={"responses": responses})
+
+    adapter = HttpxRequestAdapter(
+        auth_provider,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        base_url=BASE_URL,
+    )
+    responses = await adapter.send_batch_async(
+        [_request_info("/me"),
+         _request_info("/throttled"),
+         _request_info("/dependent")]
+    )
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert batches == [["/me", "/throttled", "/dependent"], ["/v1.0/throttled"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_item_urls_are_relative_to_the_normalized_base_url(batch_transport):
+    base_url = "https://Graph.Microsoft.com:443/v1.0"
+    adapter = HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=batch_transport),
+        base_url=base_url,
+    )
+    request_infos = []
+    for path in ("/me", "/users/a%2fb?$select=id"):
+        request_info = RequestInformation(Method.GET, path_parameters={})
+        request_info.url = f"{base_url}{path}"
+        request_infos.append(request_info)
+
+    responses = await adapter.send_batch_async(request_infos)
+
+    assert [response.json()["url"] for response in responses] == ["/me", "/users/a%2fb?$select=id"]
+
+
+@pytest.mark.asyncio
+async def test_only_the_batch_request_is_authenticated(batch_transport):
+    authenticated = []
+
+    class RecordingAuthenticationProvider(AnonymousAuthenticationProvider):
+
+        async def authenticate_request(self, request, additional_authentication_context=None):
+            authenticated.append(request.url)
+            request.headers.try_add("Authorization", "Bearer token")
+
+    adapter = HttpxRequestAdapter(
+        RecordingAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=batch_transport),
+        base_url=BASE_URL,
+    )
+
+    await adapter.send_batch_async([_request_info("/me"), _request_info("/me/messages")])
+
+    assert authenticated == [f"{BASE_URL}/$batch"]
+    assert batch_transport.requests[0].headers["Authorization"] == "Bearer token"
+    batch = json.loads(batch_transport.requests[0].content)
+    assert all("authorization" not in item["headers"] for item in batch["requests"])
+
+
+@pytest.fixture
+def url_replacing_adapter(auth_provider, batch_transport):
+    http_client = KiotaClientFactory.create_with_default_middleware(
+        httpx.AsyncClient(transport=batch_transport), {
+            UrlReplaceHandlerOption.get_key():
+            UrlReplaceHandlerOption(replacement_pairs={"/users/me-token-to-replace": "/me"})
+        }
+    )
+    return HttpxRequestAdapter(auth_provider, http_client=http_client, base_url=BASE_URL)
+
+
+@pytest.mark.asyncio
+async def test_batch_item_urls_are_rewritten_like_the_middleware_would(url_replacing_adapter):
+    url_replacing_adapter.enable_request_batching(batch_window=0.01)
+    not_replaced = _request_info("/users/me-token-to-replace/events")
+    not_replaced.add_request_options([UrlReplaceHandlerOption(enabled=False)])
+    request_infos = [
+        _request_info("/users/me-token-to-replace/messages?%24select=subject"),
+        not_replaced,
+    ]
+
+    batched = await asyncio.gather(
+        *(
+            url_replacing_adapter.send_primitive_async(request_info, "bytes", {})
+            for request_info in request_infos
+        )
+    )
+    sent_in_batch = await url_replacing_adapter.send_batch_async(request_infos)
+
+    expected_urls = ["/me/messages?$select=subject", "/users/me-token-to-replace/events"]
+    assert [json.loads(response)["url"] for response in batched] == expected_urls
+    assert [response.json()["url"] for response in sent_in_batch] == expected_urls
@@ -0,0 +1,108 @@
+import io
+import mmap
+
+import httpx
+import pytest
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.request_content import BufferByteStream, FileByteStream, get_request_stream
+
+BASE_URL = "https://graph.microsoft.com/v1.0/me/drive/items/1/content"
+CONTENT = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def content_file(tmp_path):
+    path = tmp_path / "content.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+async def _read(stream):
+    return b"".join([bytes(chunk) async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_buffer_stream_can_be_iterated_again():
+    stream = BufferByteStream(bytearray(CONTENT))
+
+    assert stream.content_length == len(CONTENT)
+    assert await _read(stream) == CONTENT
+    assert await _read(stream) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_buffer_stream_yields_views_of_the_buffer():
+    buffer = bytearray(CONTENT)
+    chunks = [chunk async for chunk in BufferByteStream(memoryview(buffer))]
+
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    buffer[0] = 255
+    assert chunks[0][0] == 255
+
+
+@pytest.mark.asyncio
+async def test_file_stream_reads_path(content_file):
+    stream = FileByteStream(content_file)
+
+    assert stream.content_length == len(CONTENT)
+    assert await _read(stream) == CONTENT
+    assert await _read(stream) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_file_stream_reads_open_file_from_its_position(content_file):
+    with open(content_file, "rb") as file:
+        file.seek(1000)
+        stream = FileByteStream(file)
+
+        assert stream.content_length == len(CONTENT) - 1000
+        assert await _read(stream) == CONTENT[1000:]
+        assert await _read(stream) == CONTENT[1000:]
+
+
+def test_get_request_stream_leaves_native_content():
+    assert get_request_stream(b"content") is None
+    assert get_request_stream(None) is None
+
+
+def test_get_request_stream_sends_str_content_as_text(content_file):
+    # A str cannot be told apart from a text body, paths are streamed as os.PathLike only
+    assert get_request_stream(str(content_file)) is None
+    assert get_request_stream(content_file) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_request_stream_streams_bytes_io_from_its_position():
+    content = io.BytesIO(CONTENT)
+    content.seek(10)
+
+    stream, content_length = get_request_stream(content)
+
+    assert content_length == len(CONTENT) - 10
+    assert await _read(stream) == CONTENT[10:]
+
+
+@pytest.mark.asyncio
+async def test_request_adapter_streams_file_and_buffer_content(auth_provider, content_file):
+    received = []
+
+    def handler(request):
+        received.append((request.headers.get("Content-Length"), request.read()))
+        return httpx.Response(204)
+
+    adapter = HttpxRequestAdapter(
+        auth_provider, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    with open(content_file, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    for content in (content_file, memoryview(CONTENT), mapped):
+        request_info = RequestInformation(Method.PUT, path_parameters={})
+        request_info.url = BASE_URL
+        request_info.content = content
+        await adapter.send_no_response_content_async(request_info, {})
+    mapped.close()
+
+    assert received == [(str(len(CONTENT)), CONTENT)] * 3
@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.kiota_client_factory import KiotaClientFactory
+from kiota_http.middleware.options import RequestTimingsOption
+from kiota_http.request_timings import (
+    REQUEST_TIMINGS_EVENT,
+    RequestTimer,
+    RequestTimings,
+    add_timings_event,
+)
+
+
+@pytest.mark.asyncio
+async def test_request_timer_measures_connection_phases_from_trace_events():
+    timer = RequestTimer()
+    timer.start("connection_acquisition")
+    for event in (
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "connection.start_tls.started",
+        "connection.start_tls.complete",
+        "http11.send_request_headers.started",
+        "http11.send_request_headers.complete",
+        "http11.receive_response_headers.started",
+        "http11.receive_response_headers.complete",
+        "http11.receive_response_body.started",
+        "http11.receive_response_body.complete",
+    ):
+        await timer.trace(event, {})
+
+    timings = timer.get_timings()
+    for phase in (
+        "connection_acquisition", "connect", "tls", "time_to_first_byte", "body_download"
+    ):
+        assert getattr(timings, phase) is not None
+    assert timings.authentication is None
+    assert timings.total >= timings.connect + timings.tls + timings.time_to_first_byte
+
+
+@pytest.mark.asyncio
+async def test_request_timer_skips_connect_for_reused_connections():
+    timer = RequestTimer()
+    timer.start("connection_acquisition")
+    await timer.trace("http2.send_request_headers.started", {})
+    await timer.trace("http2.receive_response_headers.complete", {})
+
+    timings = timer.get_timings()
+    assert timings.connection_acquisition is not None
+    assert timings.time_to_first_byte is not None
+    assert timings.connect is None
+    assert timings.tls is None
+
+
+def test_add_timings_event_skips_unobserved_phases():
+    span = MagicMock()
+    add_timings_event(span, RequestTimings(authentication=0.5, total=1.0))
+    span.add_event.assert_called_once_with(
+        REQUEST_TIMINGS_EVENT, {
+            "com.microsoft.kiota.request_timings.authentication": 0.5,
+            "com.microsoft.kiota.request_timings.total": 1.0,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_adapter_reports_request_timings(auth_provider):
+    client = KiotaClientFactory.create_with_default_middleware(
+        httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+    )
+    adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    reported = []
+    timings_option = RequestTimingsOption(reported.append)
+    request_info = RequestInformation(Method.GET, "https://example.com/users", {})
+    request_info.add_request_options([timings_option])
+
+    await adapter.send_no_response_content_async(request_info, {})
+
+    timings = timings_option.timings
+    assert reported == [timings]
+    assert timings_option.timer is None
+    for phase in ("authentication", "request_building", "middleware", "deserialization"):
+        assert getattr(timings, phase) >= 0
+    assert timings.total >= timings.middleware
+    # The mock transport emits no trace events
+    assert timings.connect is None
+    assert timings.time_to_first_byte is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("download", ["send_stream_async", "send_to_file_async"])
+async def test_adapter_reports_download_timings(auth_provider, tmp_path, download):
+    client = KiotaClientFactory.create_with_default_middleware(
+        httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"body"))
+        )
+    )
+    adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    reported = []
+    timings_option = RequestTimingsOption(reported.append)
+    request_info = RequestInformation(Method.GET, "https://example.com/content", {})
+    request_info.add_request_options([timings_option])
+
+    if download == "send_stream_async":
+        assert [chunk async for chunk in adapter.send_stream_async(request_info, {})] == [b"body"]
+    else:
+        assert await adapter.send_to_file_async(request_info, tmp_path / "content", {}) == 4
+
+    assert reported == [timings_option.timings]
+    assert timings_option.timer is None
+    assert timings_option.timings.deserialization >= 0
+
+
+@pytest.mark.asyncio
+async def test_adapter_does_not_time_requests_without_option(auth_provider):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+
+    client = KiotaClientFactory.create_with_default_middleware(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    adapter = HttpxRequestAdapter(auth_provider, http_client=client)
+    request_info = RequestInformation(Method.GET, "https://example.com/users", {})
+
+    await adapter.send_no_response_content_async(request_info, {})
+
+    assert "trace" not in requests[0].extensions
@@ -0,0 +1,175 @@
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from kiota_http._exceptions import ResponseError
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+BASE_URL = "https://graph.microsoft.com/v1.0/me/drive/items/1/content"
+PAYLOAD = bytes(range(256)) * 1024
+
+
+class FailingStream(httpx.AsyncByteStream):
+    """Streams part of the payload then fails like a dropped connection."""
+
+    def __init__(self, content: bytes, fail_after: int) -> None:
+        self._content = content
+        self._fail_after = fail_after
+
+    async def __aiter__(self):
+        yield self._content[:self._fail_after]
+        raise httpx.ReadError("connection reset")
+
+
+def _adapter(auth_provider, handler):
+    return HttpxRequestAdapter(
+        auth_provider, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+
+def _request_info():
+    request_info = RequestInformation(Method.GET, path_parameters={})
+    request_info.url = BASE_URL
+    return request_info
+
+
+def _range_handler(failures, requests, etag='"v1"'):
+    """Serves the payload, dropping the connection midway for the first responses."""
+
+    def handler(request):
+        requests.append(request)
+        start = 0
+        status_code = 200
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        if range_header := request.headers.get("Range"):
+            start = int(range_header[len("bytes="):-1])
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}"
+        content = PAYLOAD[start:]
+        headers["Content-Length"] = str(len(content))
+        if len(requests) <= failures:
+            return httpx.Response(
+                status_code, headers=headers, stream=FailingStream(content, 100_000)
+            )
+        return httpx.Response(status_code, headers=headers, content=content)
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_send_stream_async_yields_chunks(auth_provider):
+    requests = []
+    adapter = _adapter(auth_provider, _range_handler(0, requests))
+    progress = []
+
+    chunks = [
+        chunk async for chunk in adapter.send_stream_async(
+            _request_info(), {},
+            chunk_size=65536,
+            progress_callback=lambda received, total: progress.append((received, total))
+        )
+    ]
+
+    assert b"".join(chunks) == PAYLOAD
+    assert max(len(chunk) for chunk in chunks) <= 65536
+    assert progress[-1] == (len(PAYLOAD), len(PAYLOAD))
+
+
+@pytest.mark.asyncio
+async def test_send_to_file_async_resumes_with_range_requests(auth_provider, tmp_path):
+    requests = []
+    adapter = _adapter(auth_provider, _range_handler(2, requests))
+    request_info = _request_info()
+
+    written = await adapter.send_to_file_async(request_info, tmp_path / "download.bin", {})
+
+    assert written == len(PAYLOAD)
+    assert (tmp_path / "download.bin").read_bytes() == PAYLOAD
+    # Only the complete chunks yielded before each failure are kept
+    ranges = [request.headers.get("Range") for request in requests]
+    assert ranges == [None, "bytes=65536-", "bytes=131072-"]
+    assert requests[1].headers.get("If-Range") == '"v1"'
+    assert not request_info.headers.contains("Range")
+
+
+@pytest.mark.asyncio
+async def test_send_to_file_async_writes_to_async_writer(auth_provider):
+
+    class AsyncWriter():
+
+        def __init__(self):
+            self.chunks = []
+
+        async def write(self, chunk):
+            self.chunks.append(chunk)
+
+    writer = AsyncWriter()
+    adapter = _adapter(auth_provider, _range_handler(0, []))
+
+    await adapter.send_to_file_async(_request_info(), writer, {})
+
+    assert b"".join(writer.chunks) == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_send_stream_async_stops_after_max_resume_attempts(auth_provider):
+    adapter = _adapter(auth_provider, _range_handler(10, []))
+
+    with pytest.raises(httpx.ReadError):
+        async for _ in adapter.send_stream_async(_request_info(), {}, max_resume_attempts=1):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_send_stream_async_resumes_after_a_failed_resume_request(auth_provider):
+    requests = []
+    serve = _range_handler(1, requests)
+
+    def handler(request):
+        if len(requests) == 1:
+            requests.append(request)
+            raise httpx.ConnectError("connection refused")
+        return serve(request)
+
+    adapter = _adapter(auth_provider, handler)
+
+    chunks = [
+        chunk async for chunk in
+        adapter.send_stream_async(_request_info(), {}, chunk_size=400, max_resume_attempts=3)
+    ]
+
+    assert b"".join(chunks) == PAYLOAD
+    ranges = [request.headers.get("Range") for request in requests]
+    assert ranges == [None, "bytes=100000-", "bytes=100000-"]
+
+
+@pytest.mark.asyncio
+async def test_send_stream_async_rejects_changed_content(auth_provider):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(
+                200, headers={"ETag": '"v1"'}, stream=FailingStream(PAYLOAD, 1000)
+            )
+        # The server ignores the range because the content changed
+        return httpx.Response(200, headers={"ETag": '"v2"'}, content=PAYLOAD)
+
+    adapter = _adapter(auth_provider, handler)
+
+    with pytest.raises(ResponseError):
+        async for _ in adapter.send_stream_async(_request_info(), {}, chunk_size=100):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_send_stream_async_raises_failed_responses(auth_provider):
+    adapter = _adapter(auth_provider, lambda request: httpx.Response(404, content=b"Not found"))
+
+    with pytest.raises(APIError) as exc_info:
+        async for _ in adapter.send_stream_async(_request_info(), {}):
+            pass
+    assert exc_info.value.response_status_code == 404
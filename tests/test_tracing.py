@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from kiota_http.middleware import HeadersInspectionHandler
+from kiota_http.middleware.headers_inspection_handler import HEADERS_INSPECTION_KEY
+from kiota_http.observability_options import ObservabilityOptions
+from kiota_http.tracing import CollapsedSpan, start_child_span
+
+
+@pytest.fixture
+def span_exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def sdk_tracer(span_exporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    return provider.get_tracer("test")
+
+
+def test_start_child_span_skips_unsampled_parents():
+    tracer = MagicMock()
+    parent_span = trace.NonRecordingSpan(trace.INVALID_SPAN_CONTEXT)
+    assert start_child_span(tracer, "child", parent_span, False) is trace.INVALID_SPAN
+    assert start_child_span(tracer, "child", None, True) is trace.INVALID_SPAN
+    tracer.start_span.assert_not_called()
+
+
+def test_start_child_span_starts_span_in_parent_context(sdk_tracer, span_exporter):
+    parent_span = sdk_tracer.start_span("parent")
+    child_span = start_child_span(sdk_tracer, "child", parent_span, False)
+    child_span.end()
+    parent_span.end()
+
+    child, parent = span_exporter.get_finished_spans()
+    assert child.name == "child"
+    assert child.parent.span_id == parent.context.span_id
+
+
+def test_collapsed_span_records_on_parent(sdk_tracer, span_exporter):
+    parent_span = sdk_tracer.start_span("parent")
+    child_span = start_child_span(sdk_tracer, "child", parent_span, True)
+    assert isinstance(child_span, CollapsedSpan)
+    child_span.set_attribute("handler.enable", True)
+    child_span.add_event("attempt")
+    child_span.end()
+    assert parent_span.is_recording()
+    # Children of collapsed spans are collapsed into the request span as well
+    assert start_child_span(sdk_tracer, "grandchild", child_span, True).parent_span is parent_span
+    parent_span.end()
+
+    (parent, ) = span_exporter.get_finished_spans()
+    assert parent.attributes["handler.enable"] is True
+    assert [event.name for event in parent.events] == ["attempt"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_collapses_handler_spans(sdk_tracer, span_exporter):
+    parent_span = sdk_tracer.start_span("parent")
+    request = httpx.Request('GET', 'https://localhost')
+    request.options = {
+        ObservabilityOptions.get_key(): ObservabilityOptions(collapse_spans=True),
+        "parent_span": parent_span,
+    }
+    handler = HeadersInspectionHandler()
+
+    await handler.send(request, httpx.MockTransport(lambda request: httpx.Response(200)))
+    parent_span.end()
+
+    (parent, ) = span_exporter.get_finished_spans()
+    assert parent.attributes[HEADERS_INSPECTION_KEY] is True
+
+
+@pytest.mark.asyncio
+async def test_middleware_without_parent_span_leaves_current_span_running(sdk_tracer):
+    current_span = sdk_tracer.start_span("current")
+    handler = HeadersInspectionHandler()
+    with trace.use_span(current_span, end_on_exit=True):
+        await handler.send(
+            httpx.Request('GET', 'https://localhost'),
+            httpx.MockTransport(lambda request: httpx.Response(200)),
+        )
+        assert current_span.is_recording()
@@ -0,0 +1,160 @@
+from enum import Enum
+
+import pytest
+
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from stduritemplate import StdUriTemplate
+
+from kiota_http.uri_template import (
+    CompiledUriTemplate,
+    _expansions,
+    expand_uri_template,
+    get_request_url,
+)
+
+URL_TEMPLATE = "{+baseurl}/users/{user%2Did}/messages{?%24top,%24select,%24filter}"
+
+
+class Importance(Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+def _request_info(**query_parameters):
+    request_info = RequestInformation(Method.GET, URL_TEMPLATE, {"user%2Did": "1"})
+    request_info.path_parameters["baseurl"] = "https://graph.microsoft.com/v1.0"
+    request_info.query_parameters.update(query_parameters)
+    return request_info
+
+
+def test_get_request_url_matches_request_information_url():
+    for query_parameters in (
+        {},
+        {
+            "%24top": 5,
+            "%24select": ["id", "subject"]
+        },
+        {
+            "%24filter": "importance eq 'high'",
+            "%24top": True
+        },
+        {
+            "%24select": [Importance.LOW, Importance.HIGH]
+        },
+    ):
+        request_info = _request_info(**query_parameters)
+        assert get_request_url(request_info) == request_info.url
+
+
+def test_get_request_url_reuses_expansions():
+    _expansions.clear()
+    first = get_request_url(_request_info(**{"%24top": 5}))
+    assert len(_expansions) == 1
+    assert get_request_url(_request_info(**{"%24top": 5})) is first
+    assert len(_expansions) == 1
+
+
+def test_get_request_url_keys_expansions_by_value_type():
+    assert get_request_url(_request_info(**{"%24top": 1})).endswith("%24top=1")
+    assert get_request_url(_request_info(**{"%24top": True})).endswith("%24top=true")
+
+
+def test_get_request_url_returns_url_set_on_request_information():
+    request_info = _request_info()
+    request_info.url = "https://graph.microsoft.com/v1.0/me"
+    request_info.path_parameters["baseurl"] = "https://example.com"
+    assert get_request_url(request_info) == "https://graph.microsoft.com/v1.0/me"
+
+
+def test_get_request_url_expands_unhashable_parameters():
+    request_info = _request_info(**{"%24filter": {"importance": "high"}})
+    assert get_request_url(request_info) == request_info.url
+
+
+TEMPLATES = [
+    "{+baseurl}/users{?%24top,%24skip,%24search,%24filter,%24count,%24orderby,%24select,%24expand}",
+    "{+baseurl}/users/{user%2Did}/messages/{message%2Did}{?%24select,%24expand}",
+    "{+baseurl}/sites/{site%2Did}/drive/items/{driveItem%2Did}/content{?format}",
+    "{+baseurl}/me{;matrix,empty}{&amp}{#fragment}",
+    "https://example.com/caf\u00e9/{path}{/segments}{.ext}",
+    "{+baseurl}/search{?q}{&page,size}",
+]
+VALUES = [
+    {},
+    {
+        "baseurl": "https://graph.microsoft.com/v1.0"
+    },
+    {
+        "baseurl": "https://graph.microsoft.com/v1.0",
+        "user%2Did": "a b/c",
+        "message%2Did": "\u00e9%41"
+    },
+    {
+        "baseurl": "https://graph.microsoft.com/v1.0",
+        "%24top": 10,
+        "%24count": True,
+        "%24skip": 0
+    },
+    {
+        "%24select": ["id", "displayName"],
+        "%24expand": [],
+        "%24filter": "startswith(name,'a')"
+    },
+    {
+        "matrix": "",
+        "empty": [],
+        "amp": "a&b",
+        "fragment": "top"
+    },
+    {
+        "path": "p q",
+        "segments": ["a", "b/c"],
+        "ext": 1.5,
+        "q": "100%",
+        "page": False
+    },
+    {
+        "baseurl": "https://example.com/%7Euser",
+        "size": ["1", 2, 3.0, True]
+    },
+    {
+        "baseurl": "http://host/a b",
+        "q": {
+            "key": "value"
+        }
+    },
+    {
+        "baseurl": "https://\u00e9.com",
+        "matrix": ["x", ""]
+    },
+]
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_expand_uri_template_matches_std_uri_template(template):
+    for values in VALUES:
+        assert expand_uri_template(template, values) == StdUriTemplate.expand(template, values)
+
+
+def test_expand_uri_template_raises_like_std_uri_template():
+    for template, values in (
+        ("{+baseurl}{?time}", {
+            "time": object()
+        }),
+        ("{+baseurl", {}),
+        ("{+baseurl}/{}", {}),
+        ("{+baseurl}/users}", {}),
+    ):
+        with pytest.raises(ValueError):
+            StdUriTemplate.expand(template, values)
+        with pytest.raises(ValueError):
+            expand_uri_template(template, values)
+
+
+@pytest.mark.parametrize(
+    "template", ["{var:3}", "{list*}", "{?a,b*}", "a,b{c}", "{!var}", "{var}}", "{.a..b}"]
+)
+def test_compile_leaves_unsupported_templates_to_std_uri_template(template):
+    assert CompiledUriTemplate.compile(template) is None
@@ -0,0 +1,73 @@
+import pytest
+
+from kiota_http.url_rewrite_engine import UrlRewriteEngine, compile_literals
+
+URL = "https://graph.microsoft.com/v1.0/users/user-id/messages?$filter=tenant-a"
+
+
+def test_compile_literals_prefers_longest_literal():
+    pattern = compile_literals(["/users", "/users/user-id", "/me"])
+    assert pattern.findall(URL) == ["/users/user-id", "/me"]
+    assert compile_literals(["", ""]) is None
+
+
+def test_empty_engine_keeps_url():
+    engine = UrlRewriteEngine({"": "/me"})
+    assert engine.is_empty
+    assert engine.rewrite(URL) is URL
+
+
+def test_replaces_first_occurrence_of_each_segment():
+    engine = UrlRewriteEngine({"tenant-a": "tenant-b", "/users/user-id": "/me"})
+    assert engine.rewrite(URL + "&tenant-a") == (
+        "https://graph.microsoft.com/v1.0/me/messages?$filter=tenant-b&tenant-a"
+    )
+
+
+def test_segment_replacements_do_not_chain_whatever_their_order():
+    for pairs in (
+        {
+            "/users": "/groups",
+            "/groups": "/sites"
+        }, {
+            "/groups": "/sites",
+            "/users": "/groups"
+        }
+    ):
+        assert UrlRewriteEngine(pairs).rewrite(URL) == (
+            "https://graph.microsoft.com/v1.0/groups/user-id/messages?$filter=tenant-a"
+        )
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (URL, "https://graph.microsoft.us/v1.0/users/user-id/messages?$filter=tenant-a"),
+        ("https://GRAPH.microsoft.com:443/me", "https://graph.microsoft.us:443/me"),
+        ("https://user@graph.microsoft.com/me", "https://user@graph.microsoft.us/me"),
+        ("https://graph.microsoft.com.evil/me", "https://graph.microsoft.com.evil/me"),
+    ],
+)
+def test_replaces_hosts(url, expected):
+    engine = UrlRewriteEngine(host_replacements={"graph.microsoft.com": "graph.microsoft.us"})
+    assert engine.rewrite(url) == expected
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (URL, "https://graph.microsoft.com/beta/people/user-id/messages?$filter=tenant-a"),
+        ("https://graph.microsoft.com/v1.0?$top=1", "https://graph.microsoft.com/beta?$top=1"),
+        ("https://graph.microsoft.com:8443/v1.0/me", "https://graph.microsoft.com:8443/beta/me"),
+        ("https://graph.microsoft.com/v1.00/me", "https://graph.microsoft.com/v1.00/me"),
+        ("https://graph.microsoft.com/me/v1.0", "https://graph.microsoft.com/me/v1.0"),
+    ],
+)
+def test_replaces_longest_path_prefix_on_segment_boundary(url, expected):
+    engine = UrlRewriteEngine(
+        path_prefix_replacements={
+            "/v1.0/": "/beta/",
+            "/v1.0/users": "/beta/people"
+        }
+    )
+    assert engine.rewrite(url) == expected